@@ -1,3 +1,5 @@
 """SUTRA v0.7 — Structured Universal Transaction & Reasoning Architecture"""
 
+from .parser import Template, dump_program, load_program, parse_stream
+
 __version__ = "0.7.0"
@@ -6,17 +6,23 @@ Each SUTRA-compliant agent maintains this state:
   - offer_ledger  (Samvida)   — open offers
   - commit_ledger (Dharma)    — binding obligations (cryptographically signed)
   - action_queue  (Kriya)     — pending actions
-  - message_log               — audit trail
+  - message_log               — audit trail (v0.7: bounded, see audit.py)
   - keypair       (optional)  — Ed25519 signing key
 """
 
 from __future__ import annotations
 
+import base64
+import binascii
+import heapq
 import json
 import time
-from dataclasses import dataclass, field
-from typing import Any
+from bisect import bisect_left, bisect_right
+from dataclasses import dataclass, field, replace
+from itertools import islice
+from typing import Any, Callable, Iterable, Iterator
 
+from .audit import LogEntry, MessageLog, render_pred, render_str
 from .crypto import verify as _verify_sig, SutraSignature, offer_content, commitment_content
 
 
@@ -25,6 +31,10 @@ class Fact:
     predicate: str
     args: dict[str, Any]
     timestamp: float = field(default_factory=time.time)
+    # v0.7: per-agent insertion number (QUERY ordering ties, AFTER cursors)
+    seq: int = field(default=0, compare=False)
+    # v0.7: when the fact expires (see Agent.set_fact_ttl), None = never
+    expires_at: float | None = field(default=None, compare=False)
 
     def __str__(self):
         args_str = ", ".join(f'{k}={v!r}' for k, v in self.args.items())
@@ -110,11 +120,271 @@ class Action:
         return f"ACT {self.predicate}({args_str})"
 
 
+def _seq_of(fact: Fact) -> int:
+    return fact.seq
+
+
+def _insert_by_seq(facts: list[Fact], fact: Fact):
+    """Insert keeping ``facts`` in insertion (seq) order — an append unless
+    an upserted fact is being put back."""
+    if not facts or facts[-1].seq < fact.seq:
+        facts.append(fact)
+    else:
+        facts.insert(bisect_left(facts, fact.seq, key=_seq_of), fact)
+
+
+def _remove_by_seq(facts: list[Fact], fact: Fact):
+    i = bisect_left(facts, fact.seq, key=_seq_of)
+    if i < len(facts) and facts[i] is fact:
+        del facts[i]
+
+
 @dataclass
-class LogEntry:
-    event: str
-    detail: str
-    timestamp: float = field(default_factory=time.time)
+class ArgIndex:
+    """Hash index over one argument of one predicate: value → facts.
+
+    Facts that lack the argument, or hold an unhashable value (a map or a
+    list), go to ``unindexed`` — they can match any queried value, so the
+    index is only used for lookups while that list is empty.
+    """
+    arg: str
+    postings: dict[Any, list[Fact]] = field(default_factory=dict)
+    unindexed: list[Fact] = field(default_factory=list)
+
+    def _bucket(self, fact: Fact, create: bool) -> list[Fact] | None:
+        try:
+            value = fact.args[self.arg]
+            bucket = self.postings.get(value)
+        except (KeyError, TypeError):
+            return self.unindexed
+        if bucket is None and create:
+            bucket = self.postings[value] = []
+        return bucket
+
+    def add(self, fact: Fact):
+        _insert_by_seq(self._bucket(fact, create=True), fact)
+
+    def remove(self, fact: Fact):
+        """Drop ``fact`` (call before its args change)."""
+        bucket = self._bucket(fact, create=False)
+        if bucket is not None:
+            _remove_by_seq(bucket, fact)
+
+    def lookup(self, value: Any) -> list[Fact] | None:
+        """Facts whose argument equals ``value``, or None if the index can't answer."""
+        if self.unindexed:
+            return None
+        try:
+            return self.postings.get(value, [])
+        except TypeError:
+            return None
+
+
+_NUMBER_TYPES = (int, float)  # bool is deliberately not a number here
+# Pending RangeIndex inserts placed one by one; more than this → one merge sort
+_INSORT_LIMIT = 64
+
+
+def condition_matches(fact_args: dict[str, Any], name: str, op: str, value: Any) -> bool:
+    """Evaluate one QUERY comparison (``price<50000``) against a fact's args.
+
+    The fact must have the argument. Ordering operators compare numbers
+    with numbers and strings with strings; any other pairing never
+    matches. ``!=`` is plain inequality.
+    """
+    if name not in fact_args:
+        return False
+    actual = fact_args[name]
+    if op == "!=":
+        return actual != value
+    if type(actual) in _NUMBER_TYPES:
+        if type(value) not in _NUMBER_TYPES:
+            return False
+    elif not (type(actual) is str and type(value) is str):
+        return False
+    if op == "<":
+        return actual < value
+    if op == "<=":
+        return actual <= value
+    if op == ">":
+        return actual > value
+    if op == ">=":
+        return actual >= value
+    raise ValueError(f"Unknown comparison operator {op!r}")
+
+
+@dataclass
+class RangeIndex:
+    """Sorted index over one numeric argument of one predicate.
+
+    ``keys``/``seqs``/``facts`` are parallel lists sorted by value, so a
+    range is two bisects. Facts without a numeric value (or with NaN) are
+    left out — no ordering comparison with a number can match them. New
+    facts wait in ``pending`` (by Fact.seq, so removing one is O(1)) and
+    are merged in on the next lookup, which keeps bulk loads O(n log n)
+    overall.
+    """
+    arg: str
+    keys: list[float] = field(default_factory=list)
+    seqs: list[int] = field(default_factory=list)  # Fact.seq, for result order
+    facts: list[Fact] = field(default_factory=list)
+    pending: dict[int, tuple[float, int, Fact]] = field(default_factory=dict)
+
+    def add(self, fact: Fact):
+        value = fact.args.get(self.arg)
+        if type(value) in _NUMBER_TYPES and value == value:
+            self.pending[fact.seq] = (value, fact.seq, fact)
+
+    def remove(self, fact: Fact):
+        """Drop ``fact`` (call before its args change)."""
+        value = fact.args.get(self.arg)
+        if not (type(value) in _NUMBER_TYPES and value == value):
+            return
+        entry = self.pending.get(fact.seq)
+        if entry is not None and entry[2] is fact:
+            del self.pending[fact.seq]
+            return
+        keys, facts = self.keys, self.facts
+        for i in range(bisect_left(keys, value), bisect_right(keys, value)):
+            if facts[i] is fact:
+                del keys[i], self.seqs[i], facts[i]
+                return
+
+    def _settle(self):
+        pending = self.pending
+        if len(pending) <= _INSORT_LIMIT:
+            keys, seqs, facts = self.keys, self.seqs, self.facts
+            for key, seq, fact in pending.values():
+                i = bisect_right(keys, key)
+                keys.insert(i, key)
+                seqs.insert(i, seq)
+                facts.insert(i, fact)
+        else:
+            merged = sorted([*zip(self.keys, self.seqs, self.facts), *pending.values()],
+                            key=lambda e: (e[0], e[1]))
+            self.keys = [e[0] for e in merged]
+            self.seqs = [e[1] for e in merged]
+            self.facts = [e[2] for e in merged]
+        pending.clear()
+
+    def select(self, conditions: list[tuple[str, Any]], settle: bool = True) -> list[Fact] | None:
+        """Facts satisfying every (op, value) ordering condition, in insertion
+        order — or None if a value is not a number and the index can't answer.
+
+        Merging ``pending`` changes the index: with ``settle=False`` (a
+        reader without the agent to itself) it answers None instead.
+        """
+        if any(type(value) not in _NUMBER_TYPES for _, value in conditions):
+            return None
+        if any(value != value for _, value in conditions):
+            return []  # NaN: every comparison is false
+        if self.pending:
+            if not settle:
+                return None
+            self._settle()
+        keys = self.keys
+        lo, hi = 0, len(keys)
+        for op, value in conditions:
+            if op == ">":
+                lo = max(lo, bisect_right(keys, value))
+            elif op == ">=":
+                lo = max(lo, bisect_left(keys, value))
+            elif op == "<":
+                hi = min(hi, bisect_left(keys, value))
+            elif op == "<=":
+                hi = min(hi, bisect_right(keys, value))
+        if lo >= hi:
+            return []
+        seqs, facts = self.seqs, self.facts
+        return [facts[i] for i in sorted(range(lo, hi), key=seqs.__getitem__)]
+
+
+def fact_order_key(arg: str, descending: bool = False) -> Callable[[Fact], tuple]:
+    """Sort key for ORDER BY ``arg``: numbers, then strings, then facts
+    without a number/string value; ties broken by insertion order.
+
+    The descending key is meant for heapq.nlargest / reverse sorting: it
+    flips the group rank and the tiebreak so numbers still come first and
+    equal values keep insertion order.
+    """
+    def key(fact: Fact) -> tuple:
+        value = fact.args.get(arg)
+        if type(value) in _NUMBER_TYPES and value == value:
+            rank = 0
+        elif type(value) is str:
+            rank = 1
+        else:
+            rank, value = 2, 0
+        if descending:
+            return 2 - rank, value, -fact.seq
+        return rank, value, fact.seq
+    return key
+
+
+def _encode_cursor(position, order_by: str | None = None, descending: bool = False) -> str:
+    raw = json.dumps([order_by, descending, position], separators=(",", ":")).encode("utf-8")
+    return base64.urlsafe_b64encode(raw).decode("ascii").rstrip("=")
+
+
+def _decode_cursor(cursor: str, order_by: str | None, descending: bool = False):
+    """Inverse of _encode_cursor; ValueError if it doesn't fit this query."""
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4))
+        cursor_order, cursor_desc, position = json.loads(raw)
+    except (ValueError, TypeError, binascii.Error):
+        raise ValueError(f"Malformed cursor {cursor!r}") from None
+    if cursor_order != order_by or cursor_desc is not descending:
+        raise ValueError("Cursor belongs to a query with a different ORDER BY")
+    if order_by is None:
+        if type(position) is not int:
+            raise ValueError(f"Malformed cursor {cursor!r}")
+        return position
+    # [rank, value, seq] — value type must fit the rank so keys stay comparable
+    if (type(position) is not list or len(position) != 3 or type(position[2]) is not int
+            or position[0] not in (0, 1, 2)):
+        raise ValueError(f"Malformed cursor {cursor!r}")
+    rank, value, seq = position
+    expected = {0: _NUMBER_TYPES, 1: (str,), 2: (int,)}
+    group = 2 - rank if descending else rank  # descending keys flip the rank
+    if type(value) not in expected[group]:
+        raise ValueError(f"Malformed cursor {cursor!r}")
+    return rank, value, seq
+
+
+def _freeze(value: Any) -> Any:
+    """Hashable stand-in for an arg value; equal values freeze equal."""
+    if isinstance(value, dict):
+        return ("{", frozenset((k, _freeze(v)) for k, v in value.items()))
+    if isinstance(value, list):
+        return ("[", tuple(_freeze(v) for v in value))
+    return value
+
+
+def _args_hash(predicate: str, args: dict[str, Any]) -> int | None:
+    try:
+        return hash((predicate, frozenset((k, _freeze(v)) for k, v in args.items())))
+    except TypeError:
+        return None
+
+
+def _fact_key(args: dict[str, Any], names: tuple[str, ...]) -> tuple | None:
+    """Key values of a fact, or None if it lacks a key arg or one is unhashable."""
+    try:
+        key = tuple(args[name] for name in names)
+        hash(key)
+    except (KeyError, TypeError):
+        return None
+    return key
+
+
+_KEEP = object()  # _set_offer_status: leave conditions as they are
+
+# Agent containers versioned by share_state(); message_log has its own
+# positions (MessageLog.mark) and the lookup indexes are derived state
+_VERSIONED_STATE = ("belief_base", "goal_set", "offer_ledger", "commit_ledger", "action_queue")
+
+# Predicates named in an add_facts() summary log entry
+_SUMMARY_PREDICATES = 8
 
 
 class Agent:
@@ -127,34 +397,661 @@ class Agent:
         self.offer_ledger: dict[str, Offer] = {}
         self.commit_ledger: list[Commitment] = []
         self.action_queue: list[Action] = []
-        self.message_log: list[LogEntry] = []
+        self.message_log = MessageLog()
         self.keypair = keypair  # v0.3: SutraKeyPair or None
         self.trusted_keys: dict[str, str] = {}  # agent_id → public_key_hex
         # v0.7: Predicate index for O(1) belief lookups
         self._fact_index: dict[str, list[Fact]] = {}
+        # v0.7: Opt-in argument-value indexes, predicate → arg → ArgIndex
+        self._arg_index: dict[str, dict[str, ArgIndex]] = {}
+        # v0.7: Opt-in sorted numeric indexes, predicate → arg → RangeIndex
+        self._range_index: dict[str, dict[str, RangeIndex]] = {}
+        # v0.7: Last Fact.seq handed out
+        self._fact_seq = 0
+        # v0.7: Upsert keys (predicate → key args) and key values → fact
+        self._fact_keys: dict[str, tuple[str, ...]] = {}
+        self._key_index: dict[str, dict[tuple, Fact]] = {}
+        # v0.7: Exact-duplicate suppression, hash(predicate, args) → facts
+        self._dedupe = False
+        self._fact_hashes: dict[int, list[Fact]] = {}
+        self.dedupe_stats = {"upserts": 0, "duplicates": 0}
+        # v0.7: Fact TTLs, predicate → seconds, and a min-heap of
+        # (expires_at, push number, fact) so expiry never scans belief_base
+        self._fact_ttl: dict[str, float] = {}
+        self._expiry_heap: list[tuple[float, int, Fact]] = []
+        self._expiry_pushes = 0
+        # v0.7: Copy-on-write state shared with snapshots (see share_state)
+        self._shares = 0
+        self._shared: set[str] = set()
+        self._shared_seq = 0  # facts with seq <= this belong to a snapshot too
+        self._fresh_offers: set[int] = set()  # id()s of offers made since
+        # Shared facts copied or dropped since, for restore_state to re-index
+        self._touched: list[Fact] = []
+        # v0.7: Undo journal of (inverse op, arg) pairs while a transaction
+        # uses the "undo" strategy (see begin_journal)
+        self._journal: list[tuple[Callable, Any]] | None = None
+        self._journal_users = 0
+        # v0.7: Versions of state keys — ("fact", predicate), ("offer", id),
+        # "goal_set", "commit_ledger", "action_queue" — for optimistic
+        # transactions (see sutra.optimistic)
+        self.state_versions: dict[Any, int] = {}
 
     def _log(self, event: str, detail: str):
-        self.message_log.append(LogEntry(event=event, detail=detail))
+        self.message_log.append(LogEntry(event, detail))
+
+    def _log_pred(self, event: str, keyword: str, name: str, args: dict[str, Any]):
+        # v0.7: formatted only if the entry is read (args dicts are never mutated)
+        self.message_log.append(LogEntry(event, None, None, render_pred, keyword, name, args))
+
+    def configure_log(self, capacity: int | None, audit_dir: str | None = None, **options):
+        """Bound message_log to ``capacity`` in-memory entries, spilling older
+        ones to audit segments in ``audit_dir`` (see audit.MessageLog for
+        ``options``). Entries already logged are carried over."""
+        log = MessageLog(capacity, audit_dir, name=self.agent_id, **options)
+        log.extend(self.message_log)
+        self.message_log = log
 
     # ── State mutations ─────────────────────────────────
 
-    def add_fact(self, predicate: str, args: dict[str, Any]):
-        fact = Fact(predicate=predicate, args=args)
+    # `detail` (v0.7): precomputed log text, e.g. from the VM — must equal str(record)
+
+    def add_fact(self, predicate: str, args: dict[str, Any], detail: str | None = None,
+                 ttl: float | None = None):
+        """Add a fact. ``ttl`` (v0.7) overrides the predicate's TTL in seconds."""
+        now = time.time()
+        if ttl is None:
+            ttl = self._fact_ttl.get(predicate)
+        if self._fact_keys or self._dedupe:
+            existing = self._absorb(predicate, args, now, self._fact_seq)
+            if existing is not None:
+                if ttl is not None:  # re-asserted: the TTL starts over
+                    existing = self._schedule_expiry(existing, now + ttl)
+                if existing.args is args:  # upserted
+                    self._log_pred("UPSERT", "FACT", predicate, args)
+                return
+        self._fact_seq += 1
+        fact = Fact(predicate=predicate, args=args, timestamp=now, seq=self._fact_seq)
+        if ttl is not None:
+            self._schedule_expiry(fact, now + ttl)
         self.belief_base.append(fact)
+        if self._journal is not None:
+            self._journal.append((self._undo_add_facts, (fact,)))
         # Maintain predicate index
         if predicate not in self._fact_index:
             self._fact_index[predicate] = []
         self._fact_index[predicate].append(fact)
-        self._log("FACT", str(fact))
+        if predicate in self._arg_index or predicate in self._range_index:
+            self._index_facts(predicate, (fact,))
+        if self._fact_keys or self._dedupe:
+            self._register(fact)
+        if detail is None:
+            self._log_pred("FACT", "FACT", predicate, args)
+        else:
+            self._log("FACT", detail)
+
+    def add_facts(self, facts: Iterable[tuple[str, dict[str, Any]]]) -> int:
+        """Add many (predicate, args) facts at once. Returns how many were added.
+
+        v0.7: bulk path for loading knowledge bases — one timestamp, one
+        index update per predicate and a single summary log entry
+        ("FACTS") for the whole batch instead of one entry per fact.
+        Upserts and suppressed duplicates (see declare_key, set_fact_dedupe)
+        are not counted as added. Predicate TTLs apply as in add_fact.
+        """
+        now = time.time()
+        start = self._fact_seq
+        ttls = self._fact_ttl
+        if self._fact_keys or self._dedupe:
+            before = dict(self.dedupe_stats)
+            added = []
+            for predicate, args in facts:
+                fact = self._absorb(predicate, args, now, start)
+                if fact is None:
+                    self._fact_seq += 1
+                    fact = Fact(predicate, args, now, self._fact_seq)
+                    self._register(fact)
+                    added.append(fact)
+                if predicate in ttls:
+                    self._schedule_expiry(fact, now + ttls[predicate])
+            absorbed = {k: v - before[k] for k, v in self.dedupe_stats.items()}
+        else:
+            added = [Fact(predicate, args, now, seq) for seq, (predicate, args) in enumerate(facts, start + 1)]
+            self._fact_seq = start + len(added)
+            absorbed = None
+            if ttls:
+                for fact in added:
+                    if fact.predicate in ttls:
+                        self._schedule_expiry(fact, now + ttls[fact.predicate])
+        if not added and not any((absorbed or {}).values()):
+            return 0
+        self.belief_base.extend(added)
+        if self._journal is not None and added:
+            self._journal.append((self._undo_add_facts, added))
+
+        groups: dict[str, list[Fact]] = {}
+        for fact in added:
+            group = groups.get(fact.predicate)
+            if group is None:
+                groups[fact.predicate] = group = []
+            group.append(fact)
+        index = self._fact_index
+        for predicate, group in groups.items():
+            bucket = index.get(predicate)
+            if bucket is None:
+                index[predicate] = group
+            else:
+                bucket.extend(group)
+            if predicate in self._arg_index or predicate in self._range_index:
+                self._index_facts(predicate, group)
+
+        counts = ", ".join(f"{p}×{len(g)}" for p, g in list(groups.items())[:_SUMMARY_PREDICATES])
+        more = f", +{len(groups) - _SUMMARY_PREDICATES} more" if len(groups) > _SUMMARY_PREDICATES else ""
+        if absorbed and any(absorbed.values()):
+            more += f" ({absorbed['upserts']} upserted, {absorbed['duplicates']} duplicates)"
+        self._log("FACTS", f"{len(added)} facts: {counts}{more}")
+        return len(added)
+
+    # ── Upserts and duplicate suppression (v0.7) ────────
+
+    def declare_key(self, predicate: str, *arg_names: str):
+        """Make ``arg_names`` the key of ``predicate``: a FACT whose key
+        values match an existing fact replaces that fact's args in place
+        (an upsert) instead of appending. A fact lacking a key arg, or
+        with an unhashable key value, is appended as usual."""
+        if not arg_names:
+            raise ValueError("declare_key needs at least one argument name")
+        self._fact_keys[predicate] = tuple(arg_names)
+        self._rebuild_dedupe()
+
+    def set_fact_dedupe(self, enabled: bool = True):
+        """Suppress FACTs that exactly repeat an existing fact (same
+        predicate and args) instead of appending a duplicate."""
+        self._dedupe = enabled
+        self._rebuild_dedupe()
+
+    @property
+    def fact_keys(self) -> dict[str, tuple[str, ...]]:
+        """Declared upsert keys, predicate → key arg names."""
+        return dict(self._fact_keys)
+
+    def _absorb(self, predicate: str, args: dict[str, Any], now: float,
+                indexed_through: int) -> Fact | None:
+        """Fold a new fact into an existing one if it is an upsert or an
+        exact duplicate; returns the existing fact (whose ``args`` is then
+        ``args`` after an upsert), or None if the fact is new. Facts with
+        seq <= ``indexed_through`` are already in the arg/range indexes."""
+        names = self._fact_keys.get(predicate)
+        if names is not None:
+            key = _fact_key(args, names)
+            if key is not None:
+                existing = self._key_index.get(predicate, {}).get(key)
+                if existing is not None:
+                    if existing.args == args:
+                        self.dedupe_stats["duplicates"] += 1
+                    else:
+                        existing = self._replace_args(existing, args, now, existing.seq <= indexed_through)
+                        self.dedupe_stats["upserts"] += 1
+                    return existing
+                return None
+        if self._dedupe:
+            digest = _args_hash(predicate, args)
+            if digest is not None:
+                for existing in self._fact_hashes.get(digest, ()):
+                    if existing.predicate == predicate and existing.args == args:
+                        self.dedupe_stats["duplicates"] += 1
+                        return existing
+        return None
+
+    def _register(self, fact: Fact):
+        names = self._fact_keys.get(fact.predicate)
+        if names is not None:
+            key = _fact_key(fact.args, names)
+            if key is not None:
+                self._key_index.setdefault(fact.predicate, {})[key] = fact
+        if self._dedupe:
+            self._register_hash(fact)
+
+    def _register_hash(self, fact: Fact):
+        digest = _args_hash(fact.predicate, fact.args)
+        if digest is not None:
+            self._fact_hashes.setdefault(digest, []).append(fact)
+
+    def _unregister_hash(self, fact: Fact):
+        digest = _args_hash(fact.predicate, fact.args)
+        bucket = self._fact_hashes.get(digest) if digest is not None else None
+        if bucket:
+            for i, other in enumerate(bucket):
+                if other is fact:
+                    del bucket[i]
+                    break
+            if not bucket:
+                del self._fact_hashes[digest]
+
+    def _replace_args(self, fact: Fact, args: dict[str, Any], now: float, indexed: bool) -> Fact:
+        """Upsert in place: the fact keeps its seq and its belief_base slot.
+        Returns the fact, which is a copy if a snapshot shares the original."""
+        fact = self._writable_fact(fact)
+        if self._journal is not None:
+            self._journal.append((self._undo_replace_args, (fact, fact.args, fact.timestamp)))
+        predicate = fact.predicate
+        secondary = [
+            *self._arg_index.get(predicate, {}).values(),
+            *self._range_index.get(predicate, {}).values(),
+        ] if indexed else []
+        for idx in secondary:
+            idx.remove(fact)
+        if self._dedupe:
+            self._unregister_hash(fact)
+        fact.args = args
+        fact.timestamp = now
+        for idx in secondary:
+            idx.add(fact)
+        if self._dedupe:
+            digest = _args_hash(predicate, args)
+            if digest is not None:
+                self._fact_hashes.setdefault(digest, []).append(fact)
+        return fact
+
+    def _rebuild_dedupe(self):
+        """Rebuild the key and duplicate indexes from belief_base."""
+        self._key_index.clear()
+        self._fact_hashes.clear()
+        if self._fact_keys or self._dedupe:
+            for fact in self.belief_base:
+                self._register(fact)
+
+    # ── Fact expiry (v0.7) ──────────────────────────────
+
+    def set_fact_ttl(self, predicate: str, seconds: float | None):
+        """Facts of ``predicate`` added (or re-asserted) from now on expire
+        ``seconds`` later. ``None`` removes the TTL; facts already scheduled
+        keep their expiry time."""
+        if seconds is None:
+            self._fact_ttl.pop(predicate, None)
+        elif seconds <= 0:
+            raise ValueError(f"TTL must be positive, got {seconds!r}")
+        else:
+            self._fact_ttl[predicate] = seconds
+
+    @property
+    def fact_ttls(self) -> dict[str, float]:
+        """Configured TTLs, predicate → seconds."""
+        return dict(self._fact_ttl)
 
-    def add_intent(self, predicate: str, args: dict[str, Any]):
+    def _schedule_expiry(self, fact: Fact, expires_at: float) -> Fact:
+        if fact.expires_at == expires_at:
+            return fact
+        # An earlier heap entry for the fact goes stale: expire_facts skips it
+        fact = self._writable_fact(fact)
+        if self._journal is not None:
+            self._journal.append((self._undo_expiry, (fact, fact.expires_at)))
+        fact.expires_at = expires_at
+        self._expiry_pushes += 1
+        heapq.heappush(self._expiry_heap, (expires_at, self._expiry_pushes, fact))
+        return fact
+
+    def expire_facts(self, now: float | None = None) -> int:
+        """Drop facts whose TTL has run out. Returns how many were dropped.
+
+        Pops due entries off the expiry heap, so the cost depends on how many
+        facts expire rather than on the size of belief_base. query_facts()
+        calls this itself whenever something is due.
+        """
+        heap = self._expiry_heap
+        if now is None:
+            now = time.time()
+        expired = []
+        while heap and heap[0][0] <= now:
+            at, _, fact = heapq.heappop(heap)
+            fact = self._current_fact(fact)
+            if fact is not None and fact.expires_at == at:  # not re-asserted since
+                if self._journal is not None:
+                    self._journal.append((self._undo_expiry, (fact, at)))
+                fact = self._writable_fact(fact)
+                fact.expires_at = None  # claimed: a second entry can't match
+                expired.append(fact)
+        if expired:
+            expired.sort(key=_seq_of)
+            self._drop_facts(expired)
+            if self._journal is not None:
+                self._journal.append((self._undo_drop_facts, expired))
+            counts: dict[str, int] = {}
+            for fact in expired:
+                counts[fact.predicate] = counts.get(fact.predicate, 0) + 1
+            self.bump_versions(("fact", p) for p in counts)
+            names = ", ".join(f"{p}×{n}" for p, n in list(counts.items())[:_SUMMARY_PREDICATES])
+            more = f", +{len(counts) - _SUMMARY_PREDICATES} more" if len(counts) > _SUMMARY_PREDICATES else ""
+            self._log("EXPIRED", f"{len(expired)} facts: {names}{more}")
+        return len(expired)
+
+    def indexes_pending(self, predicate: str) -> bool:
+        """Whether ``predicate`` has RangeIndex entries not yet merged."""
+        return any(idx.pending for idx in self._range_index.get(predicate, {}).values())
+
+    def settle_indexes(self, predicate: str):
+        """Merge pending entries into ``predicate``'s RangeIndexes, so that
+        read-only queries can use them."""
+        for idx in self._range_index.get(predicate, {}).values():
+            if idx.pending:
+                idx._settle()
+
+    def expiry_due(self, now: float | None = None) -> bool:
+        """Whether expire_facts() would drop anything."""
+        heap = self._expiry_heap
+        return bool(heap) and heap[0][0] <= (time.time() if now is None else now)
+
+    def _drop_facts(self, facts: list[Fact]):
+        """Remove ``facts`` (in seq order) from belief_base and every index."""
+        if self._shares:
+            self._touched.extend(f for f in facts if f.seq <= self._shared_seq)
+        self._own("belief_base")
+        if len(facts) <= _INSORT_LIMIT:
+            for fact in facts:
+                _remove_by_seq(self.belief_base, fact)
+        else:
+            # Many at once: one compacting pass beats a memmove per fact
+            dead = {id(fact) for fact in facts}
+            self.belief_base[:] = [f for f in self.belief_base if id(f) not in dead]
+        self._unindex_facts(facts)
+
+    def _unindex_facts(self, facts: list[Fact]):
+        """Remove ``facts`` (in seq order) from every index, not belief_base."""
+        groups: dict[str, list[Fact]] = {}
+        for fact in facts:
+            groups.setdefault(fact.predicate, []).append(fact)
+        for predicate, group in groups.items():
+            bucket = self._fact_index.get(predicate)
+            if bucket is not None:
+                if len(group) <= _INSORT_LIMIT:
+                    for fact in group:
+                        _remove_by_seq(bucket, fact)
+                else:
+                    dead = {id(fact) for fact in group}
+                    bucket[:] = [f for f in bucket if id(f) not in dead]
+                if not bucket:
+                    del self._fact_index[predicate]
+            secondary = [
+                *self._arg_index.get(predicate, {}).values(),
+                *self._range_index.get(predicate, {}).values(),
+            ]
+            names = self._fact_keys.get(predicate)
+            keyed = self._key_index.get(predicate)
+            for fact in group:
+                for idx in secondary:
+                    idx.remove(fact)
+                if keyed:
+                    key = _fact_key(fact.args, names)
+                    if key is not None and keyed.get(key) is fact:
+                        del keyed[key]
+                if self._dedupe:
+                    self._unregister_hash(fact)
+
+    # ── State versions (v0.7) ───────────────────────────
+
+    def bump_versions(self, keys: Iterable[Any]):
+        """Mark ``keys`` (see state_versions) as changed. Optimistic
+        transactions that read one of them since will fail validation."""
+        versions = self.state_versions
+        for key in keys:
+            versions[key] = versions.get(key, 0) + 1
+
+    def versions_changed(self, observed: dict[Any, int]) -> bool:
+        """Whether any key moved on from its ``observed`` version."""
+        versions = self.state_versions
+        return any(versions.get(key, 0) != v for key, v in observed.items())
+
+    # ── Copy-on-write state (v0.7) ──────────────────────
+
+    def share_state(self) -> tuple[tuple[Any, int], ...]:
+        """Version pointers for an O(1) snapshot: each of _VERSIONED_STATE
+        with its current length, then the last fact seq and the position in
+        ``_touched`` at the time.
+
+        Until release_state(), the agent only appends to those containers.
+        Any other change (an upsert or expiry in belief_base, an offer
+        status change) first copies the container and the records it
+        changes, so the shared version stays intact.
+        """
+        self._shares += 1
+        self._shared = set(_VERSIONED_STATE)
+        self._shared_seq = self._fact_seq
+        self._fresh_offers = set()
+        return (*((getattr(self, name), len(getattr(self, name))) for name in _VERSIONED_STATE),
+                (self._fact_seq, len(self._touched)))
+
+    def release_state(self):
+        """Drop one share_state() claim; with none left, changes are made in place again."""
+        self._shares = max(self._shares - 1, 0)
+        if not self._shares:
+            self._shared.clear()
+            self._shared_seq = 0
+            self._touched.clear()
+
+    def restore_state(self, version: tuple[tuple[Any, int], ...]):
+        """Point the agent back at a share_state() version. The containers
+        may still be shared with older versions, so they stay copy-on-write.
+
+        The lookup indexes are repaired, not rebuilt: facts added since the
+        version leave them, and facts copied or dropped since are indexed
+        as the version holds them again. The cost follows what changed.
+        """
+        *containers, (fact_seq, touched_at) = version
+        current = self.belief_base
+        stale = {f.seq: f for f in current[bisect_right(current, fact_seq, key=_seq_of):]}
+        touched = self._touched[touched_at:]
+        del self._touched[touched_at:]
+        for fact in touched:
+            live = self._current_fact(fact)
+            if live is not None:
+                stale[live.seq] = live
+        if stale:
+            self._unindex_facts(sorted(stale.values(), key=_seq_of))
+
+        for name, (container, length) in zip(_VERSIONED_STATE, containers):
+            if isinstance(container, dict):
+                while len(container) > length:
+                    container.popitem()  # LIFO: the entries added since
+            else:
+                del container[length:]
+            setattr(self, name, container)
+        self._shared = set(_VERSIONED_STATE)
+        self._fresh_offers = set()
+
+        restored = self.belief_base
+        originals: dict[int, Fact] = {}
+        for fact in touched:
+            i = bisect_left(restored, fact.seq, key=_seq_of)
+            if i < len(restored) and restored[i].seq == fact.seq:
+                originals[fact.seq] = restored[i]
+        if originals:
+            facts = sorted(originals.values(), key=_seq_of)
+            self._reindex_facts(facts)
+            for fact in facts:
+                if fact.expires_at is not None:  # its heap entry may have been popped
+                    self._expiry_pushes += 1
+                    heapq.heappush(self._expiry_heap, (fact.expires_at, self._expiry_pushes, fact))
+
+    def _own(self, name: str):
+        """Copy a shared container before changing it other than by appending."""
+        if name in self._shared:
+            setattr(self, name, getattr(self, name).copy())
+            self._shared.discard(name)
+
+    def _writable_fact(self, fact: Fact) -> Fact:
+        """``fact`` if only the agent holds it, else a copy swapped in for it."""
+        if fact.seq > self._shared_seq:
+            return fact
+        copy = Fact(fact.predicate, fact.args, fact.timestamp, fact.seq, fact.expires_at)
+        self._touched.append(fact)
+        self._own("belief_base")
+        for facts in (self.belief_base, self._fact_index.get(fact.predicate, ())):
+            i = bisect_left(facts, fact.seq, key=_seq_of)
+            if i < len(facts) and facts[i] is fact:
+                facts[i] = copy
+        predicate = fact.predicate
+        for idx in (*self._arg_index.get(predicate, {}).values(),
+                    *self._range_index.get(predicate, {}).values()):
+            idx.remove(fact)
+            idx.add(copy)
+        names = self._fact_keys.get(predicate)
+        if names is not None:
+            key = _fact_key(fact.args, names)
+            keyed = self._key_index.get(predicate, {})
+            if key is not None and keyed.get(key) is fact:
+                keyed[key] = copy
+        if self._dedupe:
+            self._unregister_hash(fact)
+            self._register_hash(copy)
+        return copy
+
+    def _current_fact(self, fact: Fact) -> Fact | None:
+        """The live fact with ``fact``'s seq (``fact`` itself or its copy), if any."""
+        facts = self._fact_index.get(fact.predicate, ())
+        i = bisect_left(facts, fact.seq, key=_seq_of)
+        if i < len(facts) and facts[i].seq == fact.seq:
+            return facts[i]
+        return None
+
+    def _set_offer_status(self, offer_id: str, status: str, conditions: Any = _KEEP):
+        offer = self._writable_offer(offer_id)
+        if self._journal is not None:
+            self._journal.append((self._undo_offer_status, (offer_id, offer.status, offer.conditions)))
+        offer.status = status
+        if conditions is not _KEEP:
+            offer.conditions = conditions
+
+    def _writable_offer(self, offer_id: str) -> Offer:
+        offer = self.offer_ledger[offer_id]
+        if not self._shares or id(offer) in self._fresh_offers:
+            return offer
+        self._own("offer_ledger")
+        offer = replace(offer)
+        self.offer_ledger[offer_id] = offer
+        self._fresh_offers.add(id(offer))
+        return offer
+
+    # ── Undo journal (v0.7) ─────────────────────────────
+
+    def begin_journal(self) -> int:
+        """Start (or join) recording inverse operations; returns the
+        journal position to pass to undo_journal() for a rollback.
+
+        The journal covers belief_base with every fact index, goal_set,
+        offer_ledger, commit_ledger and action_queue, like share_state().
+        message_log has its own positions (MessageLog.mark).
+        """
+        if self._journal is None:
+            self._journal = []
+        self._journal_users += 1
+        return len(self._journal)
+
+    def end_journal(self):
+        """Drop one begin_journal() claim; the last one discards the journal."""
+        self._journal_users = max(self._journal_users - 1, 0)
+        if not self._journal_users:
+            self._journal = None
+
+    def undo_journal(self, position: int):
+        """Undo every journaled change after ``position``, newest first.
+        Cost is proportional to what changed, not to the size of the state."""
+        journal = self._journal
+        if journal is None:
+            return
+        self._journal = None  # the inverse operations are not journaled
+        try:
+            while len(journal) > position:
+                undo, arg = journal.pop()
+                undo(arg)
+        finally:
+            self._journal = journal
+
+    @property
+    def journal_position(self) -> int | None:
+        return None if self._journal is None else len(self._journal)
+
+    def forget_journal(self, position: int):
+        """Drop journal entries after ``position`` without undoing them:
+        the changes were rolled back some other way (restore_state)."""
+        if self._journal is not None:
+            del self._journal[position:]
+
+    def _undo_add_facts(self, facts: list[Fact]):
+        live = [f for f in map(self._current_fact, facts) if f is not None]
+        if live:
+            self._drop_facts(live)
+
+    def _undo_drop_facts(self, facts: list[Fact]):
+        self._own("belief_base")
+        for fact in facts:
+            _insert_by_seq(self.belief_base, fact)
+        self._reindex_facts(facts)
+
+    def _reindex_facts(self, facts: list[Fact]):
+        """Put facts back into every index (the inverse of _unindex_facts)."""
+        groups: dict[str, list[Fact]] = {}
+        for fact in facts:
+            _insert_by_seq(self._fact_index.setdefault(fact.predicate, []), fact)
+            groups.setdefault(fact.predicate, []).append(fact)
+            self._register(fact)
+        for predicate, group in groups.items():
+            if predicate in self._arg_index or predicate in self._range_index:
+                self._index_facts(predicate, group)
+
+    def _undo_replace_args(self, change: tuple[Fact, dict[str, Any], float]):
+        fact, args, timestamp = change
+        fact = self._current_fact(fact)
+        if fact is not None:
+            self._replace_args(fact, args, timestamp, True)
+
+    def _undo_expiry(self, change: tuple[Fact, float | None]):
+        fact, expires_at = change
+        fact = self._current_fact(fact)
+        if fact is None:
+            return
+        if expires_at is None:
+            self._writable_fact(fact).expires_at = None
+        else:
+            self._schedule_expiry(fact, expires_at)
+
+    def _undo_put_offer(self, change: tuple[str, Offer | None]):
+        offer_id, previous = change
+        self._own("offer_ledger")
+        if previous is None:
+            del self.offer_ledger[offer_id]
+        else:
+            self.offer_ledger[offer_id] = previous
+
+    def _undo_offer_status(self, change: tuple[str, str, Any]):
+        offer_id, status, conditions = change
+        self._set_offer_status(offer_id, status, conditions)
+
+    def _undo_append(self, name: str):
+        self._own(name)
+        getattr(self, name).pop()
+
+    def _index_facts(self, predicate: str, facts: Iterable[Fact]):
+        """Add facts to the predicate's argument and range indexes."""
+        indexes = [
+            *self._arg_index.get(predicate, {}).values(),
+            *self._range_index.get(predicate, {}).values(),
+        ]
+        for fact in facts:
+            for idx in indexes:
+                idx.add(fact)
+
+    def add_intent(self, predicate: str, args: dict[str, Any], detail: str | None = None):
         intent = Intent(predicate=predicate, args=args)
         self.goal_set.append(intent)
-        self._log("INTENT", str(intent))
+        if self._journal is not None:
+            self._journal.append((self._undo_append, "goal_set"))
+        if detail is None:
+            self._log_pred("INTENT", "INTENT", predicate, args)
+        else:
+            self._log("INTENT", detail)
 
     def add_offer(self, offer_id: str, from_agent: str, to_agent: str, fields: dict[str, Any],
                   signature: dict | None = None, expires_at: float | None = None,
-                  counter_to: str | None = None):
+                  counter_to: str | None = None, detail: str | None = None):
         # Calculate negotiation round from counter chain
         neg_round = 0
         if counter_to and counter_to in self.offer_ledger:
@@ -169,14 +1066,20 @@ class Agent:
             counter_to=counter_to,
             negotiation_round=neg_round,
         )
+        previous = self.offer_ledger.get(offer_id)
+        if previous is not None:
+            self._own("offer_ledger")  # replacing, not appending
         self.offer_ledger[offer_id] = offer
+        if self._journal is not None:
+            self._journal.append((self._undo_put_offer, (offer_id, previous)))
+        self._fresh_offers.add(id(offer))
         # If this is a counter-offer, mark the original as "countered"
         if counter_to and counter_to in self.offer_ledger:
             original = self.offer_ledger[counter_to]
             if original.status == "open":
-                original.status = "countered"
+                self._set_offer_status(counter_to, "countered")
                 self._log("COUNTERED", f"Offer {counter_to!r} superseded by counter {offer_id!r}")
-        self._log("OFFER", str(offer))
+        self._log("OFFER", str(offer) if detail is None else detail)
 
     def accept_offer(self, offer_id: str, conditions: list[dict] | None = None) -> bool:
         offer = self.offer_ledger.get(offer_id)
@@ -186,18 +1089,17 @@ class Agent:
         if offer.status != "open":
             # Check if expired
             if offer.is_expired:
-                offer.status = "expired"
+                self._set_offer_status(offer_id, "expired")
                 self._log("ACCEPT_FAIL", f"Offer {offer_id!r} expired")
                 return False
             self._log("ACCEPT_FAIL", f"Offer {offer_id!r} not open (status={offer.status})")
             return False
         # Check expiry before accepting
         if offer.is_expired:
-            offer.status = "expired"
+            self._set_offer_status(offer_id, "expired")
             self._log("ACCEPT_FAIL", f"Offer {offer_id!r} expired before acceptance")
             return False
-        offer.status = "accepted"
-        offer.conditions = conditions
+        self._set_offer_status(offer_id, "accepted", conditions)
         self._log("ACCEPT", f"Offer {offer_id!r} accepted" +
                   (f" with {len(conditions)} conditions" if conditions else ""))
         return True
@@ -208,19 +1110,19 @@ class Agent:
             self._log("REJECT_FAIL", f"Offer {offer_id!r} not found or not open")
             return False
         if offer.is_expired:
-            offer.status = "expired"
+            self._set_offer_status(offer_id, "expired")
             self._log("REJECT_FAIL", f"Offer {offer_id!r} already expired")
             return False
-        offer.status = "rejected"
+        self._set_offer_status(offer_id, "rejected")
         self._log("REJECT", f"Offer {offer_id!r} rejected" + (f": {reason}" if reason else ""))
         return True
 
     def expire_offers(self) -> list[str]:
         """Check all open offers and mark expired ones. Returns list of expired offer IDs."""
         expired = []
-        for oid, offer in self.offer_ledger.items():
+        for oid, offer in list(self.offer_ledger.items()):
             if offer.status == "open" and offer.is_expired:
-                offer.status = "expired"
+                self._set_offer_status(oid, "expired")
                 expired.append(oid)
                 self._log("EXPIRED", f"Offer {oid!r} expired")
         return expired
@@ -244,46 +1146,193 @@ class Agent:
         return chain
 
     def add_commit(self, predicate: str, args: dict[str, Any], deadline: str | None = None,
-                   signature: dict | None = None):
+                   signature: dict | None = None, detail: str | None = None):
         commit = Commitment(predicate=predicate, args=args, deadline=deadline,
                             signature=signature)
         self.commit_ledger.append(commit)
-        self._log("COMMIT", str(commit))
+        if self._journal is not None:
+            self._journal.append((self._undo_append, "commit_ledger"))
+        if detail is None:
+            self.message_log.append(LogEntry("COMMIT", None, None, render_str, commit))
+        else:
+            self._log("COMMIT", detail)
 
-    def add_action(self, predicate: str, args: dict[str, Any]):
+    def add_action(self, predicate: str, args: dict[str, Any], detail: str | None = None):
         action = Action(predicate=predicate, args=args)
         self.action_queue.append(action)
-        self._log("ACT", str(action))
+        if self._journal is not None:
+            self._journal.append((self._undo_append, "action_queue"))
+        if detail is None:
+            self._log_pred("ACT", "ACT", predicate, args)
+        else:
+            self._log("ACT", detail)
 
-    def query_facts(self, predicate: str, args: dict[str, Any]) -> list[Fact]:
+    def query_facts(self, predicate: str, args: dict[str, Any],
+                    conditions: Iterable[tuple[str, str, Any]] = (),
+                    order_by: str | None = None, descending: bool = False,
+                    limit: int | None = None, after: str | None = None,
+                    read_only: bool = False) -> list[Fact]:
         """Query belief_base for matching facts (indexed by predicate, subset match).
 
         Uses _fact_index for O(1) predicate lookup instead of scanning all facts.
+        When queried args have an ArgIndex (see index_args), the scan starts
+        from the shortest posting list instead of every fact of the predicate.
+
+        v0.7: ``conditions`` are (arg, op, value) comparisons that must all
+        hold (see condition_matches); args with a RangeIndex (see
+        index_range) are answered by bisecting instead of scanning.
+
+        v0.7: Results come in insertion order, or sorted by the ``order_by``
+        arg (see fact_order_key). ``limit`` caps them — without ORDER BY the
+        scan stops early, with it a top-k heap keeps only ``limit`` facts.
+        ``after`` is a cursor from query_cursor() for the next page.
+        ``read_only=True`` skips the TTL sweep and leaves pending RangeIndex
+        entries unmerged (scanning instead), for readers that must not
+        change the agent (see sutra.optimistic).
         """
+        heap = self._expiry_heap
+        if not read_only and heap and heap[0][0] <= time.time():
+            self.expire_facts()
+        matches = self._matches(predicate, args, list(conditions), not read_only)
+        if order_by is None:
+            if after is not None:
+                last = _decode_cursor(after, None)
+                matches = (f for f in matches if f.seq > last)
+            return list(matches if limit is None else islice(matches, limit))
+
+        key = fact_order_key(order_by, descending)
+        if after is not None:
+            last = _decode_cursor(after, order_by, descending)
+            if descending:
+                matches = (f for f in matches if key(f) < last)
+            else:
+                matches = (f for f in matches if key(f) > last)
+        if limit is None:
+            return sorted(matches, key=key, reverse=descending)
+        if descending:
+            return heapq.nlargest(limit, matches, key=key)
+        return heapq.nsmallest(limit, matches, key=key)
+
+    def query_cursor(self, fact: Fact, order_by: str | None = None,
+                     descending: bool = False) -> str:
+        """Opaque AFTER cursor for the page ending at ``fact``."""
+        if order_by is None:
+            return _encode_cursor(fact.seq)
+        return _encode_cursor(list(fact_order_key(order_by, descending)(fact)), order_by, descending)
+
+    def _matches(self, predicate: str, args: dict[str, Any],
+                 conditions: list[tuple[str, str, Any]], settle: bool = True) -> Iterator[Fact]:
+        """Matching facts in insertion order, produced lazily."""
         candidates = self._fact_index.get(predicate)
         if not candidates:
-            return []
-        if not args:
-            return list(candidates)
-        results = []
-        for fact in candidates:
-            match = True
+            return
+        if not args and not conditions:
+            # Bounded by the current length: facts added meanwhile are not seen
+            yield from islice(candidates, len(candidates))
+            return
+        arg_indexes = self._arg_index.get(predicate)
+        if arg_indexes:
+            for k, v in args.items():
+                idx = arg_indexes.get(k)
+                posting = idx.lookup(v) if idx is not None else None
+                if posting is not None and len(posting) < len(candidates):
+                    if not posting:
+                        return
+                    candidates = posting
+        range_indexes = self._range_index.get(predicate)
+        if range_indexes and conditions:
+            bounds: dict[str, list[tuple[str, Any]]] = {}
+            for name, op, value in conditions:
+                if op != "!=" and name in range_indexes:
+                    bounds.setdefault(name, []).append((op, value))
+            for name, ops in bounds.items():
+                hits = range_indexes[name].select(ops, settle)
+                if hits is not None and len(hits) < len(candidates):
+                    if not hits:
+                        return
+                    candidates = hits
+        for fact in islice(candidates, len(candidates)):
             fact_args = fact.args
+            match = True
             for k, v in args.items():
                 if k in fact_args and fact_args[k] != v:
                     match = False
                     break
+            if match and conditions:
+                match = all(condition_matches(fact_args, name, op, value)
+                            for name, op, value in conditions)
             if match:
-                results.append(fact)
-        return results
+                yield fact
+
+    def index_args(self, predicate: str, *arg_names: str):
+        """Maintain hash indexes on ``arg_names`` of ``predicate`` facts.
+
+        Existing facts are indexed immediately; later add_fact/add_facts
+        calls and rebuild_index() keep the indexes current.
+        """
+        arg_indexes = self._arg_index.setdefault(predicate, {})
+        for name in arg_names:
+            if name in arg_indexes:
+                continue
+            idx = ArgIndex(arg=name)
+            for fact in self._fact_index.get(predicate, ()):
+                idx.add(fact)
+            arg_indexes[name] = idx
+
+    def index_range(self, predicate: str, *arg_names: str):
+        """Maintain sorted numeric indexes on ``arg_names`` of ``predicate``
+        facts, for QUERY comparisons such as ``price<50000``."""
+        range_indexes = self._range_index.setdefault(predicate, {})
+        for name in arg_names:
+            if name in range_indexes:
+                continue
+            idx = RangeIndex(arg=name)
+            for fact in self._fact_index.get(predicate, ()):
+                idx.add(fact)
+            range_indexes[name] = idx
+
+    def drop_arg_indexes(self, predicate: str):
+        """Stop maintaining argument and range indexes for ``predicate``."""
+        self._arg_index.pop(predicate, None)
+        self._range_index.pop(predicate, None)
+
+    @property
+    def indexed_args(self) -> dict[str, list[str]]:
+        """Configured argument indexes, predicate → arg names."""
+        return {p: list(idx) for p, idx in self._arg_index.items()}
+
+    @property
+    def range_indexed_args(self) -> dict[str, list[str]]:
+        """Configured range indexes, predicate → arg names."""
+        return {p: list(idx) for p, idx in self._range_index.items()}
 
     def rebuild_index(self):
-        """Rebuild the fact predicate index from belief_base (use after deserialization)."""
+        """Rebuild the fact predicate index from belief_base (use after deserialization).
+
+        Argument/range indexes, upsert/duplicate indexes and the expiry
+        heap keep their configuration and are rebuilt as well.
+        """
         self._fact_index.clear()
         for fact in self.belief_base:
+            if not fact.seq:  # deserialized facts
+                self._fact_seq += 1
+                fact.seq = self._fact_seq
             if fact.predicate not in self._fact_index:
                 self._fact_index[fact.predicate] = []
             self._fact_index[fact.predicate].append(fact)
+        for predicate, arg_indexes in self._arg_index.items():
+            for name in list(arg_indexes):
+                arg_indexes[name] = ArgIndex(arg=name)
+        for predicate, range_indexes in self._range_index.items():
+            for name in list(range_indexes):
+                range_indexes[name] = RangeIndex(arg=name)
+        for predicate in self._arg_index.keys() | self._range_index.keys():
+            self._index_facts(predicate, self._fact_index.get(predicate, ()))
+        self._rebuild_dedupe()
+        self._expiry_heap = [(f.expires_at, n, f) for n, f in enumerate(
+            f for f in self.belief_base if f.expires_at is not None)]
+        heapq.heapify(self._expiry_heap)
+        self._expiry_pushes = len(self._expiry_heap)
 
     # ── Signature verification ───────────────────────────
 
@@ -1,6 +1,9 @@
 """SUTRA v0.1 — AST Node Definitions
 
 Every SUTRA construct is represented as a typed AST node.
+
+v0.7: Nodes are slotted dataclasses — no per-instance __dict__, which
+roughly halves the memory of a large parsed program (`sutra bench ast-memory`).
 """
 
 from __future__ import annotations
@@ -10,47 +13,65 @@ from typing import Any
 
 # ── Values ──────────────────────────────────────────────
 
-@dataclass
+@dataclass(slots=True)
 class StringVal:
     value: str
 
-@dataclass
+@dataclass(slots=True)
 class NumberVal:
     value: float
 
-@dataclass
+@dataclass(slots=True)
 class BoolVal:
     value: bool
 
-@dataclass
+@dataclass(slots=True)
 class NullVal:
     pass
 
-@dataclass
+@dataclass(slots=True)
 class MapVal:
     entries: dict[str, Any]  # str → Value node
 
-@dataclass
+@dataclass(slots=True)
 class ListVal:
     items: list[Any]  # list of Value nodes
 
 
+@dataclass(slots=True)
+class Placeholder:
+    """Template slot (see parser.Template). ``key`` is a position or a name;
+    ``as_string`` marks slots that stand for a string literal (ids, agents)
+    rather than an arbitrary value."""
+    key: int | str
+    as_string: bool = False
+
+
 # ── Predicate ───────────────────────────────────────────
 
-@dataclass
+@dataclass(slots=True)
 class NamedArg:
     name: str
     value: Any  # Value node
 
-@dataclass
+@dataclass(slots=True)
+class Comparison:
+    """v0.7: ``name <op> value`` inside a QUERY predicate."""
+    name: str
+    op: str     # "<", "<=", ">", ">=" or "!="
+    value: Any  # Value node
+
+@dataclass(slots=True)
 class Predicate:
     name: str
     args: list[NamedArg] = field(default_factory=list)
+    # v0.7: {name: python value}, set when parsed with fold_constants=True
+    resolved: dict[str, Any] | None = field(default=None, compare=False, repr=False)
 
 
 # ── Headers ─────────────────────────────────────────────
 
-@dataclass
+@dataclass(slots=True)
 class Header:
     key: str
     value: str
@@ -58,36 +79,44 @@ class Header:
 
 # ── Statements ──────────────────────────────────────────
 
-@dataclass
+@dataclass(slots=True)
 class IntentStmt:
     """INTENT predicate;"""
     predicate: Predicate
 
-@dataclass
+@dataclass(slots=True)
 class FactStmt:
     """FACT predicate;"""
     predicate: Predicate
 
-@dataclass
+@dataclass(slots=True)
 class QueryStmt:
-    """QUERY predicate FROM agent;"""
+    """QUERY predicate FROM agent [ORDER BY arg [ASC|DESC]] [LIMIT n] [AFTER "cursor"];"""
     predicate: Predicate
     from_agent: str
-
-@dataclass
+    # v0.7: comparison args, e.g. price<50000 — equality args stay in predicate
+    conditions: list[Comparison] = field(default_factory=list)
+    # v0.7: ORDER BY arg [DESC] LIMIT n AFTER "cursor"
+    order_by: str | None = None
+    descending: bool = False
+    limit: int | None = None
+    after: str | None = None
+
+@dataclass(slots=True)
 class OfferField:
     key: str
     value: Any  # Value node
 
-@dataclass
+@dataclass(slots=True)
 class OfferStmt:
     """OFFER id="..." TO "..." { ... } EXPIRES "duration";"""
     offer_id: str
     to_agent: str
     fields: list[OfferField]
     expires: str | None = None  # v0.7: expiration duration/timestamp
+    resolved_fields: dict[str, Any] | None = field(default=None, compare=False, repr=False)
 
-@dataclass
+@dataclass(slots=True)
 class CounterStmt:
     """COUNTER "original_offer_id" id="new_id" TO "agent" { ... } EXPIRES "duration";"""
     original_offer_id: str
@@ -95,26 +124,27 @@ class CounterStmt:
     to_agent: str
     fields: list[OfferField]
     expires: str | None = None
+    resolved_fields: dict[str, Any] | None = field(default=None, compare=False, repr=False)
 
-@dataclass
+@dataclass(slots=True)
 class AcceptStmt:
     """ACCEPT "offer_id" IF predicate(...);  or  ACCEPT "offer_id";"""
     offer_id: str
     conditions: list[Predicate] | None = None  # v0.7: conditional acceptance
 
-@dataclass
+@dataclass(slots=True)
 class RejectStmt:
     """REJECT "offer_id" REASON "...";"""
     offer_id: str
     reason: str | None = None
 
-@dataclass
+@dataclass(slots=True)
 class CommitStmt:
     """COMMIT predicate BY "deadline";"""
     predicate: Predicate
     deadline: str | None = None
 
-@dataclass
+@dataclass(slots=True)
 class ActStmt:
     """ACT predicate;"""
     predicate: Predicate
@@ -122,7 +152,7 @@ class ActStmt:
 
 # ── Program ─────────────────────────────────────────────
 
-@dataclass
+@dataclass(slots=True)
 class Program:
     headers: list[Header] = field(default_factory=list)
     statements: list[Any] = field(default_factory=list)  # list of *Stmt nodes
@@ -0,0 +1,249 @@
+"""SUTRA v0.7 — Bounded Message Log with On-Disk Audit Segments
+
+Every agent mutation appends a LogEntry to ``Agent.message_log``. Left
+unbounded, the log ends up as the largest structure of a long-lived
+server, and it is copied by every transaction snapshot and written by every
+StateStore.save.
+
+MessageLog keeps the newest ``capacity`` entries in memory as a ring
+buffer. When full, it hands the oldest entries to an append-only audit
+segment on disk in chunks. If no audit directory is configured, they are
+dropped instead. Segments are JSON lines files that rotate at
+``segment_bytes``. The oldest ones can be pruned with ``max_segments``.
+iter_entries() walks the segments and then the buffer, in log order.
+
+Entries logged after an open transaction mark are kept in memory until
+the mark is released, even past ``capacity``. Only committed entries
+ever reach a segment, so a rollback cannot leave mutations in the audit
+trail that never happened.
+
+LogEntry text is rendered lazily: hot paths log the values a line is built
+from and ``detail`` formats them on first access. Most entries are never
+read, and a spilled entry is formatted once, as it is written.
+
+Usage:
+    agent.configure_log(capacity=10_000, audit_dir="audit/")
+    for entry in agent.message_log.iter_entries():
+        print(entry.event, entry.detail)
+"""
+
+from __future__ import annotations
+
+import json
+import os
+import time
+from collections import deque
+from typing import Any, Callable, Iterable, Iterator
+
+
+class LogEntry:
+    """One audit record; ``detail`` is rendered on first access."""
+
+    __slots__ = ("event", "timestamp", "_render", "_a", "_b", "_c", "_detail")
+
+    def __init__(self, event: str, detail: str | None = None, timestamp: float | None = None,
+                 render: Callable[[Any, Any, Any], str] | None = None,
+                 a: Any = None, b: Any = None, c: Any = None):
+        self.event = event
+        self.timestamp = time.time() if timestamp is None else timestamp
+        self._render = render
+        self._a = a
+        self._b = b
+        self._c = c
+        self._detail = detail
+
+    @property
+    def detail(self) -> str:
+        if self._detail is None:
+            self._detail = self._render(self._a, self._b, self._c)
+            self._render = self._a = self._b = self._c = None
+        return self._detail
+
+    def to_dict(self) -> dict:
+        return {"event": self.event, "detail": self.detail, "timestamp": self.timestamp}
+
+    def __repr__(self) -> str:
+        return f"LogEntry(event={self.event!r}, detail={self.detail!r}, timestamp={self.timestamp!r})"
+
+    def __eq__(self, other) -> bool:
+        if isinstance(other, LogEntry):
+            return (self.event, self.detail, self.timestamp) == (other.event, other.detail, other.timestamp)
+        return NotImplemented
+
+    __hash__ = None
+
+
+def render_pred(keyword: str, name: str, args: dict[str, Any]) -> str:
+    """``FACT price(item='TV')`` — the str() of Fact/Intent/Action."""
+    args_str = ", ".join(f'{k}={v!r}' for k, v in args.items())
+    return f"{keyword} {name}({args_str})"
+
+
+def render_str(record: Any, _b: Any = None, _c: Any = None) -> str:
+    """str() of a record that does not change after it is logged."""
+    return str(record)
+
+
+# Segment files: <name>.<number>.jsonl, numbered from 1
+_SEGMENT_SUFFIX = ".jsonl"
+
+
+class MessageLog:
+    """Ring buffer of LogEntry records with optional spill-to-disk.
+
+    ``capacity=None`` keeps every entry in memory (the pre-v0.7 list
+    behaviour). Otherwise, once ``capacity`` entries are held, the oldest
+    ``spill_chunk`` are written to the current audit segment, or dropped
+    if ``audit_dir`` is None. Entries after an open mark() are not evicted
+    until release(). Indexing and iteration cover the in-memory entries;
+    iter_entries() also reads the segments.
+    """
+
+    def __init__(self, capacity: int | None = None, audit_dir: str | None = None,
+                 name: str = "audit", segment_bytes: int = 16 * 1024 * 1024,
+                 max_segments: int | None = None, spill_chunk: int | None = None):
+        if capacity is not None and capacity < 1:
+            raise ValueError(f"capacity must be positive, got {capacity!r}")
+        self.capacity = capacity
+        self.audit_dir = audit_dir
+        self.name = name.replace("/", "_").replace("\\", "_")
+        self.segment_bytes = segment_bytes
+        self.max_segments = max_segments
+        self.spill_chunk = spill_chunk or (max(1, capacity // 8) if capacity else 1)
+        self._entries: deque[LogEntry] = deque()
+        self._marks: list[int] = []  # open transaction positions
+        self.appended = 0  # entries ever logged
+        self.spilled = 0   # written to audit segments
+        self.dropped = 0   # evicted with no audit_dir
+        self._segment = 0
+        if audit_dir is not None:
+            os.makedirs(audit_dir, exist_ok=True)
+            numbers = self._segment_numbers()
+            self._segment = numbers[-1] if numbers else 1
+
+    # ── List-like access to the in-memory entries ───────
+
+    def append(self, entry: LogEntry):
+        entries = self._entries
+        entries.append(entry)
+        self.appended += 1
+        if self.capacity is not None and len(entries) > self.capacity:
+            n = min(self._evictable(), self.spill_chunk)
+            if n:
+                self._evict(n)
+
+    def extend(self, entries: Iterable[LogEntry]):
+        for entry in entries:
+            self.append(entry)
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def __iter__(self) -> Iterator[LogEntry]:
+        return iter(self._entries)
+
+    def __getitem__(self, index: int) -> LogEntry:
+        return self._entries[index]
+
+    def __bool__(self) -> bool:
+        return bool(self._entries)
+
+    # ── Positions (transaction rollback) ────────────────
+
+    def mark(self) -> int:
+        """Position to truncate() back to. Entries from here on stay in
+        memory until release(position)."""
+        self._marks.append(self.appended)
+        return self.appended
+
+    def release(self, position: int):
+        """Close a mark() once its transaction has committed or rolled back,
+        and spill whatever the capacity no longer allows in memory."""
+        if position in self._marks:
+            self._marks.remove(position)
+        if self.capacity is not None:
+            n = min(self._evictable(), len(self._entries) - self.capacity)
+            if n > 0:
+                self._evict(n)
+
+    def truncate(self, position: int):
+        """Forget entries logged after ``position``. While its mark is open
+        they are all still in memory."""
+        drop = min(self.appended - position, len(self._entries))
+        for _ in range(max(drop, 0)):
+            self._entries.pop()
+        self.appended -= max(drop, 0)
+
+    # ── Audit segments ──────────────────────────────────
+
+    def _evictable(self) -> int:
+        # In-memory entries before the oldest open mark
+        if not self._marks:
+            return len(self._entries)
+        first = self.appended - len(self._entries)
+        return max(min(self._marks) - first, 0)
+
+    def _evict(self, n: int):
+        entries = self._entries
+        old = [entries.popleft() for _ in range(n)]
+        if self.audit_dir is None:
+            self.dropped += n
+            return
+        data = "".join(json.dumps(e.to_dict(), ensure_ascii=False) + "\n" for e in old)
+        path = self._segment_path(self._segment)
+        with open(path, "a", encoding="utf-8") as f:
+            f.write(data)
+            size = f.tell()
+        self.spilled += n
+        if size >= self.segment_bytes:
+            self._segment += 1
+            self._prune()
+
+    def _segment_path(self, number: int) -> str:
+        return os.path.join(self.audit_dir, f"{self.name}.{number:06d}{_SEGMENT_SUFFIX}")
+
+    def _segment_numbers(self) -> list[int]:
+        prefix = self.name + "."
+        numbers = []
+        for filename in os.listdir(self.audit_dir):
+            if filename.startswith(prefix) and filename.endswith(_SEGMENT_SUFFIX):
+                number = filename[len(prefix):-len(_SEGMENT_SUFFIX)]
+                if number.isdigit():
+                    numbers.append(int(number))
+        return sorted(numbers)
+
+    def _prune(self):
+        if self.max_segments is None:
+            return
+        closed = [n for n in self._segment_numbers() if n < self._segment]
+        for number in closed[:max(len(closed) - self.max_segments, 0)]:
+            os.unlink(self._segment_path(number))
+
+    @property
+    def segments(self) -> list[str]:
+        """Audit segment paths, oldest first."""
+        if self.audit_dir is None:
+            return []
+        return [self._segment_path(n) for n in self._segment_numbers()]
+
+    def iter_entries(self, include_spilled: bool = True) -> Iterator[LogEntry]:
+        """Every retained entry in log order: audit segments, then memory."""
+        if include_spilled:
+            for path in self.segments:
+                with open(path, encoding="utf-8") as f:
+                    for line in f:
+                        d = json.loads(line)
+                        yield LogEntry(d["event"], d["detail"], d.get("timestamp", 0))
+        yield from list(self._entries)
+
+    def stats(self) -> dict[str, int]:
+        return {
+            "entries": len(self._entries),
+            "appended": self.appended,
+            "spilled": self.spilled,
+            "dropped": self.dropped,
+            "segments": len(self.segments),
+        }
+
+    def __repr__(self) -> str:
+        return f"MessageLog({len(self._entries)} entries, capacity={self.capacity})"
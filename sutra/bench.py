@@ -0,0 +1,315 @@
+"""SUTRA v0.7 — Benchmarks
+
+Small, dependency-free benchmarks for the hot paths of the toolchain.
+Each benchmark prints a short report and returns its numbers as a dict.
+
+Usage:
+    sutra bench ast-memory --n 100000
+    sutra bench kb-memory --n 100000
+    sutra bench compiled-load --n 50000
+    sutra bench vm --n 50000
+    sutra bench fact-load --n 200000
+    sutra bench range-query --n 200000
+    sutra bench send --n 100000
+"""
+
+from __future__ import annotations
+
+import copy
+import gc
+import time
+import tracemalloc
+from dataclasses import MISSING, dataclass, field, fields, is_dataclass
+from typing import Any, Callable
+
+from . import ast_nodes
+from .agent import Agent
+from .interpreter import Interpreter
+from .lexer import Lexer
+from .parser import Parser, ProgramStream, dump_program, load_program
+from .runtime import SutraRuntime
+from .vm import VM, compile_bytecode
+
+
+def offer_program_source(n: int) -> str:
+    """A program of ``n`` OFFERs with nested give/want maps."""
+    return "".join(
+        f'OFFER id="offer-{i}" TO "seller@store" '
+        f'{{ give: {{money: {i * 10}}}, want: {{item: "Item {i}", qty: 1}} }};\n'
+        for i in range(n)
+    )
+
+
+def fact_program_source(n: int) -> str:
+    """A program of ``n`` catalog FACTs with mixed value types."""
+    return "".join(
+        f'FACT product(sku={i}, name="Item {i}", price={i * 10 + 0.5}, in_stock=true);\n'
+        for i in range(n)
+    )
+
+
+def _report(title: str, rows: list[tuple[str, str]]):
+    print(f"\n── {title} ──")
+    width = max(len(label) for label, _ in rows)
+    for label, value in rows:
+        print(f"  {label.ljust(width)}  {value}")
+
+
+# ── AST memory ──────────────────────────────────────────
+
+def _dict_backed(cls: type) -> type:
+    """Plain-@dataclass twin of a slotted node class (the pre-v0.7 layout)."""
+    ns: dict[str, Any] = {"__annotations__": dict(cls.__annotations__)}
+    for f in fields(cls):
+        if f.default is not MISSING:
+            ns[f.name] = f.default
+        elif f.default_factory is not MISSING:
+            ns[f.name] = field(default_factory=f.default_factory)
+    return dataclass(type(cls.__name__, (), ns))
+
+
+def _rebuild(node: Any, classes: dict[type, type]) -> Any:
+    """Copy an AST into ``classes`` layouts; strings and numbers are shared."""
+    if isinstance(node, list):
+        return [_rebuild(n, classes) for n in node]
+    if isinstance(node, dict):
+        return {k: _rebuild(v, classes) for k, v in node.items()}
+    if is_dataclass(node):
+        cls = classes[type(node)]
+        return cls(**{f.name: _rebuild(getattr(node, f.name), classes) for f in fields(node)})
+    return node
+
+
+def _best_of(fn: Callable[[], Any], repeat: int = 3) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def _traced_bytes(build: Callable[[], Any]) -> tuple[Any, int]:
+    gc.collect()
+    start = tracemalloc.get_traced_memory()[0]
+    result = build()
+    gc.collect()
+    return result, tracemalloc.get_traced_memory()[0] - start
+
+
+def bench_ast_memory(n: int = 100_000) -> dict[str, float]:
+    """Bytes per FACT statement for slotted vs dict-backed AST nodes."""
+    node_types = [
+        obj for obj in vars(ast_nodes).values()
+        if isinstance(obj, type) and is_dataclass(obj) and obj.__module__ == ast_nodes.__name__
+    ]
+    slotted = {cls: cls for cls in node_types}
+    dict_backed = {cls: _dict_backed(cls) for cls in node_types}
+
+    source = fact_program_source(n)
+    tracemalloc.start()
+    try:
+        program, parsed = _traced_bytes(
+            lambda: Parser(Lexer(source).iter_tokens(skip_newlines=True)).parse()
+        )
+        # Node structure only: both copies share the parsed strings/floats
+        after, after_bytes = _traced_bytes(lambda: _rebuild(program.statements, slotted))
+        del after
+        before, before_bytes = _traced_bytes(lambda: _rebuild(program.statements, dict_backed))
+        del before
+    finally:
+        tracemalloc.stop()
+
+    result = {
+        "statements": n,
+        "parsed_bytes_per_stmt": parsed / n,
+        "dict_nodes_bytes_per_stmt": before_bytes / n,
+        "slotted_nodes_bytes_per_stmt": after_bytes / n,
+    }
+    _report(f"AST memory — {n:,} FACT statements", [
+        ("parsed program (slotted, incl. strings)", f"{result['parsed_bytes_per_stmt']:.0f} B/stmt"),
+        ("node structure, dict-backed (before)", f"{result['dict_nodes_bytes_per_stmt']:.0f} B/stmt"),
+        ("node structure, slotted (after)", f"{result['slotted_nodes_bytes_per_stmt']:.0f} B/stmt"),
+        ("saving", f"{1 - after_bytes / before_bytes:.0%}"),
+    ])
+    return result
+
+
+# ── Knowledge-base memory ───────────────────────────────
+
+def _load_agent(source: str, intern_identifiers: bool) -> Agent:
+    agent = Agent("bench")
+    lexer = Lexer(source, intern_identifiers=intern_identifiers)
+    stream = ProgramStream(Parser(lexer.iter_tokens(skip_newlines=True)))
+    for _ in Interpreter(agent).iter_execute(stream):
+        pass
+    return agent
+
+
+def bench_kb_memory(n: int = 100_000) -> dict[str, float]:
+    """Bytes per fact of an agent's state with and without interned identifiers."""
+    source = fact_program_source(n)
+    tracemalloc.start()
+    try:
+        agent, plain = _traced_bytes(lambda: _load_agent(source, intern_identifiers=False))
+        del agent
+        agent, interned = _traced_bytes(lambda: _load_agent(source, intern_identifiers=True))
+        shared = len({id(k) for fact in agent.belief_base for k in fact.args})
+        del agent
+    finally:
+        tracemalloc.stop()
+
+    result = {
+        "facts": n,
+        "plain_bytes_per_fact": plain / n,
+        "interned_bytes_per_fact": interned / n,
+        "distinct_key_objects": shared,
+    }
+    _report(f"Knowledge-base memory — {n:,} facts (belief_base, index, log)", [
+        ("identifiers not interned", f"{result['plain_bytes_per_fact']:.0f} B/fact"),
+        ("identifiers interned", f"{result['interned_bytes_per_fact']:.0f} B/fact"),
+        ("saving", f"{1 - interned / plain:.0%}"),
+        ("distinct arg-key objects", f"{shared}"),
+    ])
+    return result
+
+
+# ── Compiled programs ───────────────────────────────────
+
+def bench_compiled_load(n: int = 50_000) -> dict[str, float]:
+    """Parse text vs load the compiled binary form of the same program."""
+    source = fact_program_source(n)
+    program = Parser(Lexer(source).iter_tokens(skip_newlines=True)).parse()
+    data = dump_program(program)
+
+    parse_s = _best_of(lambda: Parser(Lexer(source).iter_tokens(skip_newlines=True)).parse())
+    load_s = _best_of(lambda: load_program(data))
+
+    result = {
+        "statements": n,
+        "text_bytes": len(source.encode("utf-8")),
+        "compiled_bytes": len(data),
+        "parse_s": parse_s,
+        "load_s": load_s,
+    }
+    _report(f"Compiled programs — {n:,} FACT statements", [
+        ("text size", f"{result['text_bytes']:,} B"),
+        ("compiled size", f"{result['compiled_bytes']:,} B"),
+        ("lex + parse", f"{parse_s * 1000:.1f} ms"),
+        ("load_program", f"{load_s * 1000:.1f} ms"),
+        ("speedup", f"{parse_s / load_s:.1f}x"),
+    ])
+    return result
+
+
+# ── Tree-walker vs VM ───────────────────────────────────
+
+def bench_vm(n: int = 50_000) -> dict[str, float]:
+    """Execute FACT-heavy and OFFER-heavy programs: Interpreter vs VM."""
+    result: dict[str, float] = {"statements": n}
+    rows = []
+    for label, source in (("FACT", fact_program_source(n)), ("OFFER", offer_program_source(n))):
+        program = Parser(Lexer(source).iter_tokens(skip_newlines=True)).parse()
+        code = compile_bytecode(program)
+        walk_s = _best_of(lambda: Interpreter(Agent("bench")).execute(program))
+        vm_s = _best_of(lambda: VM(Agent("bench")).execute(code))
+        result[f"{label.lower()}_interpreter_s"] = walk_s
+        result[f"{label.lower()}_vm_s"] = vm_s
+        rows += [
+            (f"{label}: Interpreter", f"{walk_s * 1000:.1f} ms ({n / walk_s:,.0f} stmt/s)"),
+            (f"{label}: VM", f"{vm_s * 1000:.1f} ms ({n / vm_s:,.0f} stmt/s)"),
+            (f"{label}: speedup", f"{walk_s / vm_s:.1f}x"),
+        ]
+    _report(f"Execution — {n:,} statements per workload (pre-parsed)", rows)
+    return result
+
+
+# ── Bulk FACT loading ──────────────────────────────────
+
+def bench_fact_load(n: int = 200_000) -> dict[str, float]:
+    """Load a FACT-only program one fact at a time vs in add_facts() batches."""
+    program = Parser(Lexer(fact_program_source(n)).iter_tokens(skip_newlines=True),
+                     fold_constants=True).parse()
+    single_s = _best_of(lambda: Interpreter(Agent("bench"), responses=False).execute(program))
+    batch_s = _best_of(
+        lambda: Interpreter(Agent("bench"), responses=False, batch_facts=True).execute(program)
+    )
+    result = {"facts": n, "single_s": single_s, "batched_s": batch_s}
+    _report(f"FACT loading — {n:,} facts (pre-parsed, responses off)", [
+        ("add_fact per statement", f"{single_s * 1000:.1f} ms ({n / single_s:,.0f} facts/s)"),
+        ("add_facts batches", f"{batch_s * 1000:.1f} ms ({n / batch_s:,.0f} facts/s)"),
+        ("speedup", f"{single_s / batch_s:.1f}x"),
+    ])
+    return result
+
+
+# ── Range queries ───────────────────────────────────────
+
+def bench_range_query(n: int = 200_000, queries: int = 200) -> dict[str, float]:
+    """QUERY with a price<X comparison: full scan vs RangeIndex bisect."""
+    def catalog(indexed: bool) -> Agent:
+        agent = Agent("bench")
+        if indexed:
+            agent.index_range("product", "price")
+        agent.add_facts(("product", {"sku": float(i), "price": float(i * 7 % n)}) for i in range(n))
+        return agent
+
+    conditions = [("price", "<", float(n // 1000))]  # ~0.1% of the catalog
+    scan, indexed = catalog(False), catalog(True)
+    indexed.query_facts("product", {}, conditions)  # settle pending inserts
+    scan_s = _best_of(lambda: scan.query_facts("product", {}, conditions), repeat=1)
+    index_s = _best_of(
+        lambda: [indexed.query_facts("product", {}, conditions) for _ in range(queries)]
+    ) / queries
+    result = {"facts": n, "scan_s": scan_s, "indexed_s": index_s}
+    _report(f"Range query — {n:,} facts, price<{conditions[0][2]:.0f}", [
+        ("scan", f"{scan_s * 1000:.2f} ms/query"),
+        ("RangeIndex", f"{index_s * 1000:.3f} ms/query"),
+        ("speedup", f"{scan_s / index_s:.0f}x"),
+    ])
+    return result
+
+
+# ── send() latency vs state size ────────────────────────
+
+def _deepcopy_snapshot(agent: Agent):
+    """What snapshot_agent cost before v0.7: a deep copy of every container."""
+    return [copy.deepcopy(c) for c in (agent.belief_base, agent.goal_set, agent.offer_ledger,
+                                       agent.commit_ledger, agent.action_queue, list(agent.message_log))]
+
+
+def bench_send(n: int = 100_000, messages: int = 200) -> dict[str, float]:
+    """SutraRuntime.send() latency as the target's belief base grows."""
+    body = 'FACT seen(item="TV", price=45000);'
+    sizes = sorted({max(n // 100, 1), max(n // 10, 1), n})
+    result: dict[str, float] = {"messages": messages}
+    rows = []
+    for size in sizes:
+        runtime = SutraRuntime()
+        runtime.spawn("buyer@home")
+        seller = runtime.spawn("seller@store")
+        seller.add_facts(("product", {"sku": i, "price": i * 10 + 0.5}) for i in range(size))
+        runtime.send("buyer@home", "seller@store", body)  # warm the program cache
+        send_s = _best_of(
+            lambda: [runtime.send("buyer@home", "seller@store", body) for _ in range(messages)]
+        ) / messages
+        copy_s = _best_of(lambda: _deepcopy_snapshot(seller), repeat=1)
+        result[f"send_s_{size}"] = send_s
+        result[f"deepcopy_snapshot_s_{size}"] = copy_s
+        rows += [
+            (f"{size:,} facts: send()", f"{send_s * 1e6:.0f} µs/message"),
+            (f"{size:,} facts: deep-copy snapshot (pre-v0.7)", f"{copy_s * 1e6:,.0f} µs/message"),
+        ]
+    _report(f"send() latency — {messages} FACT messages per belief-base size", rows)
+    return result
+
+
+BENCHMARKS: dict[str, Callable[..., dict]] = {
+    "ast-memory": bench_ast_memory,
+    "kb-memory": bench_kb_memory,
+    "compiled-load": bench_compiled_load,
+    "vm": bench_vm,
+    "fact-load": bench_fact_load,
+    "range-query": bench_range_query,
+    "send": bench_send,
+}
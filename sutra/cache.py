@@ -0,0 +1,117 @@
+"""SUTRA v0.7 — Parsed Program Cache
+
+Agents see the same SUTRA bodies over and over (polling QUERY templates,
+repeated catalog FACTs). This module keeps a bounded LRU of parsed
+Program ASTs keyed by a content hash of the source, so a repeated body
+skips lexing and parsing entirely.
+
+Sharing model:
+  Cached Programs are handed to every caller that sends the same body,
+  so they are treated as immutable values. Top-level containers are
+  frozen to tuples on insertion (an accidental append fails loudly), and
+  no consumer — Interpreter, SutraRuntime, SutraSandbox — mutates AST
+  nodes; code that needs a different statement list builds a new
+  Program, as SutraSandbox and _bilateral_sync already do.
+
+  Cached Programs are parsed with fold_constants=True, so re-executing
+  one (or syncing its OFFERs to a second agent) reuses the pre-resolved
+  args instead of walking the value nodes again. Only predicates and
+  offers whose values are all scalars are folded, and the Interpreter
+  copies their dict per execution; any with a list or map value is
+  resolved afresh on each execution, so no agent shares a mutable value
+  with the cache.
+
+Usage:
+    from sutra.cache import PROGRAM_CACHE
+    program = PROGRAM_CACHE.parse(body)
+    print(PROGRAM_CACHE.stats())   # hits, misses, evictions, entries, bytes
+"""
+
+from __future__ import annotations
+
+import hashlib
+import threading
+from collections import OrderedDict
+
+from .ast_nodes import Program
+from .lexer import Lexer
+from .parser import Parser
+
+
+class ProgramCache:
+    """Thread-safe bounded LRU cache of parsed Programs.
+
+    Bounded both by entry count and by the total UTF-8 size of the cached
+    sources. Sources bigger than ``max_bytes`` are parsed but never cached.
+    Lexer/parse errors propagate and are not cached.
+    """
+
+    def __init__(self, max_entries: int = 1024, max_bytes: int = 16 * 1024 * 1024):
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self._entries: OrderedDict[bytes, tuple[Program, int]] = OrderedDict()
+        self._bytes = 0
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    @staticmethod
+    def _key(data: bytes) -> bytes:
+        return hashlib.blake2b(data, digest_size=16).digest()
+
+    def parse(self, source: str) -> Program:
+        """Return the Program for ``source``, parsing it only on a miss."""
+        data = source.encode("utf-8")
+        key = self._key(data)
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return entry[0]
+            self.misses += 1
+
+        parsed = Parser(Lexer(source).iter_tokens(skip_newlines=True), fold_constants=True).parse()
+        program = Program(headers=tuple(parsed.headers), statements=tuple(parsed.statements))
+
+        size = len(data)
+        if size > self.max_bytes:
+            return program
+        with self._lock:
+            if key not in self._entries:
+                self._entries[key] = (program, size)
+                self._bytes += size
+                self._evict()
+        return program
+
+    def _evict(self):
+        # Caller holds the lock
+        entries = self._entries
+        while len(entries) > self.max_entries or self._bytes > self.max_bytes:
+            _, (_, size) = entries.popitem(last=False)
+            self._bytes -= size
+            self.evictions += 1
+
+    def clear(self):
+        """Drop all cached Programs (counters are kept)."""
+        with self._lock:
+            self._entries.clear()
+            self._bytes = 0
+
+    def stats(self) -> dict[str, int]:
+        with self._lock:
+            return {
+                "entries": len(self._entries),
+                "bytes": self._bytes,
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+            }
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+
+# Process-wide cache shared by the server, runtime, sandbox and safe_execute
+PROGRAM_CACHE = ProgramCache()
@@ -6,6 +6,7 @@ Usage:
     python -m sutra run <file.sutra> --agent <id>    # Run with named agent
     python -m sutra run <file.sutra> --sign          # Run and sign COMMITs/OFFERs
     python -m sutra parse <file.sutra>               # Parse and dump AST
+    python -m sutra compile <file.sutra>             # Pre-parse to <file.sutrac> (run accepts it)
     python -m sutra demo                             # Run built-in buyer/seller demo
     python -m sutra serve --agent <id> --port 8000   # Start HTTP agent server
     python -m sutra send <url> <file.sutra>          # Send a .sutra message via HTTP
@@ -17,6 +18,7 @@ Usage:
     python -m sutra runtime-demo                     # Run multi-agent runtime demo
     python -m sutra sandbox-demo                     # Run sandboxed interpreter demo
     python -m sutra playground                       # Open browser playground
+    python -m sutra bench [name]                     # Run performance benchmarks
 """
 
 import argparse
@@ -25,31 +27,42 @@ import os
 import time
 import logging
 
-from .lexer import Lexer, LexerError
-from .parser import Parser, ParseError
+from .lexer import Lexer, LexerError, map_source
+from .parser import (
+    Parser, ParseError, parse_stream, parse_recovering,
+    CompiledFormatError, dump_program, is_compiled, load_program,
+)
 from .interpreter import Interpreter
 from .interpreter import RuntimeError as SutraRuntimeError
 from .agent import Agent
 
 
+def _open_program(buf):
+    """Compiled (.sutrac) buffers are decoded; text is parsed incrementally."""
+    if is_compiled(buf):
+        return load_program(buf)
+    return parse_stream(buf)
+
+
 def run_file(filepath: str, agent_id: str = "default-agent") -> list[str]:
-    """Parse and execute a .sutra file."""
-    with open(filepath, "r", encoding="utf-8") as f:
-        source = f.read()
-    return run_source(source, agent_id)
+    """Execute a .sutra (or compiled .sutrac) file, statement by statement.
+
+    Statements run as soon as they are parsed, on a private agent. A syntax
+    error raises after the statements before it have run; no responses are
+    returned, and the partly updated agent is discarded.
+    """
+    with map_source(filepath) as buf:
+        return Interpreter(Agent(agent_id)).execute(_open_program(buf))
 
 
 def run_source(source: str, agent_id: str = "default-agent", agent: Agent | None = None) -> list[str]:
     """Parse and execute SUTRA source code."""
-    lexer = Lexer(source)
-    tokens = lexer.tokenize()
-    parser = Parser(tokens)
+    parser = Parser(Lexer(source).iter_tokens(skip_newlines=True))
     program = parser.parse()
     if agent is None:
         agent = Agent(agent_id)
     interp = Interpreter(agent)
-    responses = interp.execute(program)
-    return responses
+    return interp.execute(program)
 
 
 def cmd_run(args):
@@ -64,17 +77,17 @@ def cmd_run(args):
             from .keystore import KeyStore
             store = KeyStore()
             agent.keypair = store.get_or_create(args.agent)
-        responses = []
-        with open(args.file, "r", encoding="utf-8") as f:
-            source = f.read()
-        responses = run_source(source, args.agent, agent)
         print(f"\n{'─' * 50}")
         print(f"  SUTRA Execution Results")
         print(f"  Agent: {args.agent}")
         print(f"  File:  {args.file}")
         print(f"{'─' * 50}\n")
-        for r in responses:
-            print(f"  {r}")
+        # Each response is printed as its statement runs, before the rest of
+        # the file has been parsed: a syntax error stops the run there, after
+        # the statements before it have run and been printed
+        with map_source(args.file) as buf:
+            for r in Interpreter(agent).iter_execute(_open_program(buf)):
+                print(f"  {r}")
         print(f"\n{'─' * 50}")
         print(f"\n{agent.state_summary()}")
     except LexerError as e:
@@ -83,6 +96,9 @@ def cmd_run(args):
     except ParseError as e:
         print(f"Parse Error: {e}", file=sys.stderr)
         sys.exit(1)
+    except CompiledFormatError as e:
+        print(f"Compiled Program Error: {e}", file=sys.stderr)
+        sys.exit(1)
     except SutraRuntimeError as e:
         print(f"Runtime Error: {e}", file=sys.stderr)
         sys.exit(1)
@@ -93,25 +109,47 @@ def cmd_parse(args):
         print(f"Error: File not found: {args.file}", file=sys.stderr)
         sys.exit(1)
 
+    # Recovering parse: report every error in one pass, plus the
+    # statements that did parse
+    with map_source(args.file) as buf:
+        program, errors = parse_recovering(buf)
+
+    print("\n=== SUTRA AST ===\n")
+    print(f"Headers: {len(program.headers)}")
+    for h in program.headers:
+        print(f"  #{h.key} {h.value!r}")
+    print(f"\nStatements: {len(program.statements)}")
+    for i, stmt in enumerate(program.statements):
+        print(f"  [{i+1}] {type(stmt).__name__}: {stmt}")
+
+    if errors:
+        print(f"\nErrors: {len(errors)}", file=sys.stderr)
+        for e in errors:
+            print(f"  Error: {e}", file=sys.stderr)
+        sys.exit(1)
+
+
+def cmd_compile(args):
+    """Parse a .sutra file once and write the compiled binary program."""
+    if not os.path.exists(args.file):
+        print(f"Error: File not found: {args.file}", file=sys.stderr)
+        sys.exit(1)
+
+    out = args.output or os.path.splitext(args.file)[0] + ".sutrac"
     try:
-        with open(args.file, "r", encoding="utf-8") as f:
-            source = f.read()
-        lexer = Lexer(source)
-        tokens = lexer.tokenize()
-        parser = Parser(tokens)
-        program = parser.parse()
-
-        print("\n=== SUTRA AST ===\n")
-        print(f"Headers: {len(program.headers)}")
-        for h in program.headers:
-            print(f"  #{h.key} {h.value!r}")
-        print(f"\nStatements: {len(program.statements)}")
-        for i, stmt in enumerate(program.statements):
-            print(f"  [{i+1}] {type(stmt).__name__}: {stmt}")
-    except (LexerError, ParseError) as e:
+        with map_source(args.file) as buf:
+            size_in = len(buf)
+            program = Parser(Lexer(buf).iter_tokens(skip_newlines=True)).parse()
+        data = dump_program(program)
+    except (LexerError, ParseError, CompiledFormatError) as e:
         print(f"Error: {e}", file=sys.stderr)
         sys.exit(1)
 
+    with open(out, "wb") as f:
+        f.write(data)
+    print(f"  Compiled {len(program.statements)} statements: "
+          f"{args.file} ({size_in:,} B) → {out} ({len(data):,} B)")
+
 
 def cmd_demo(_args):
     """Run a full buyer-seller negotiation demo."""
@@ -256,15 +294,38 @@ def cmd_serve(args):
         agent.keypair = keystore.get_or_create(args.agent)
         print(f"  🔏 Signing enabled (key: {agent.keypair.fingerprint})")
 
+    # v0.7: argument-value and range indexes, e.g. --index available:item
+    # and upsert keys, e.g. --fact-key available:item
+    for flag, specs, make in (("--index", args.index, agent.index_args),
+                              ("--range-index", args.range_index, agent.index_range),
+                              ("--fact-key", args.fact_key, agent.declare_key)):
+        for spec in specs or ():
+            predicate, _, names = spec.partition(":")
+            if not predicate or not names:
+                print(f"Error: {flag} expects PREDICATE:ARG[,ARG...], got {spec!r}", file=sys.stderr)
+                sys.exit(1)
+            make(predicate, *names.split(","))
+    if args.dedupe:
+        agent.set_fact_dedupe()
+    if args.log_capacity is not None or args.audit_dir:
+        agent.configure_log(args.log_capacity or 10_000, args.audit_dir)
+    for spec in args.fact_ttl or ():
+        predicate, _, seconds = spec.partition(":")
+        try:
+            agent.set_fact_ttl(predicate, float(seconds))
+        except ValueError:
+            print(f"Error: --fact-ttl expects PREDICATE:SECONDS, got {spec!r}", file=sys.stderr)
+            sys.exit(1)
+
     # Pre-load facts from a file if provided
     if args.facts:
         if not os.path.exists(args.facts):
             print(f"Error: Facts file not found: {args.facts}", file=sys.stderr)
             sys.exit(1)
-        with open(args.facts, "r", encoding="utf-8") as f:
-            source = f.read()
-        responses = run_source(source, args.agent, agent)
-        print(f"  Pre-loaded {len(responses)} facts from {args.facts}")
+        with map_source(args.facts) as buf:
+            Interpreter(agent, responses=False, batch_facts=True).execute(_open_program(buf))
+        loaded = len(agent.belief_base)
+        print(f"  Pre-loaded {loaded} facts from {args.facts}")
 
     server = SutraServer(
         agent=agent,
@@ -273,6 +334,7 @@ def cmd_serve(args):
         registry=registry,
         keystore=keystore,
         auto_sign=getattr(args, 'sign', False),
+        threaded=args.threaded,
     )
     server.start(blocking=True)
 
@@ -1213,6 +1275,17 @@ def cmd_playground(_args):
             print("\n  Playground stopped.")
 
 
+def cmd_bench(args):
+    """Run one benchmark (or all of them)."""
+    from .bench import BENCHMARKS
+
+    names = list(BENCHMARKS) if args.name == "all" else [args.name]
+    for name in names:
+        kwargs = {"n": args.n} if args.n else {}
+        BENCHMARKS[name](**kwargs)
+    print()
+
+
 def main():
     parser = argparse.ArgumentParser(
         prog="sutra",
@@ -1230,6 +1303,11 @@ def main():
     parse_p = sub.add_parser("parse", help="Parse a .sutra file and dump AST")
     parse_p.add_argument("file", help="Path to .sutra file")
 
+    # compile command (v0.7)
+    compile_p = sub.add_parser("compile", help="Pre-parse a .sutra file into a compiled .sutrac program")
+    compile_p.add_argument("file", help="Path to .sutra file")
+    compile_p.add_argument("-o", "--output", default=None, help="Output path (default: <file>.sutrac)")
+
     # demo command
     sub.add_parser("demo", help="Run buyer/seller negotiation demo (local)")
 
@@ -1240,6 +1318,22 @@ def main():
     serve_p.add_argument("--port", type=int, default=8000, help="Port (default: 8000)")
     serve_p.add_argument("--facts", default=None, help="Pre-load facts from a .sutra file")
     serve_p.add_argument("--sign", action="store_true", help="Enable cryptographic signing")
+    serve_p.add_argument("--index", action="append", metavar="PREDICATE:ARG[,ARG...]",
+                         help="Index fact arguments for QUERY lookups (repeatable)")
+    serve_p.add_argument("--range-index", action="append", metavar="PREDICATE:ARG[,ARG...]",
+                         help="Sorted numeric index for QUERY comparisons like price<100 (repeatable)")
+    serve_p.add_argument("--fact-key", action="append", metavar="PREDICATE:ARG[,ARG...]",
+                         help="Key arguments: a FACT with a known key replaces that fact (repeatable)")
+    serve_p.add_argument("--dedupe", action="store_true",
+                         help="Drop FACTs that exactly repeat an existing fact")
+    serve_p.add_argument("--fact-ttl", action="append", metavar="PREDICATE:SECONDS",
+                         help="Expire facts of PREDICATE this long after they are asserted (repeatable)")
+    serve_p.add_argument("--log-capacity", type=int, default=None, metavar="N",
+                         help="Keep only the newest N log entries in memory (default with --audit-dir: 10000)")
+    serve_p.add_argument("--audit-dir", default=None,
+                         help="Append log entries evicted from memory to audit segment files here")
+    serve_p.add_argument("--threaded", action="store_true",
+                         help="Handle requests concurrently, with optimistic transactions per message")
 
     # send command (v0.2)
     send_p = sub.add_parser("send", help="Send a .sutra message to a remote agent")
@@ -1280,12 +1374,20 @@ def main():
     play_p = sub.add_parser("playground", help="Open SUTRA browser playground")
     play_p.add_argument("--port", type=int, default=8080, help="Port (default: 8080)")
 
+    # bench command (v0.7)
+    bench_p = sub.add_parser("bench", help="Run performance benchmarks")
+    bench_p.add_argument("name", nargs="?", default="all",
+                         help="Benchmark name (ast-memory, kb-memory, compiled-load, vm, fact-load, range-query, send) or 'all'")
+    bench_p.add_argument("--n", type=int, default=None, help="Workload size (statements)")
+
     args = parser.parse_args()
 
     if args.command == "run":
         cmd_run(args)
     elif args.command == "parse":
         cmd_parse(args)
+    elif args.command == "compile":
+        cmd_compile(args)
     elif args.command == "demo":
         cmd_demo(args)
     elif args.command == "serve":
@@ -1310,6 +1412,8 @@ def main():
         cmd_hardened_demo(args)
     elif args.command == "playground":
         cmd_playground(args)
+    elif args.command == "bench":
+        cmd_bench(args)
     else:
         parser.print_help()
 
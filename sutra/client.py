@@ -44,6 +44,8 @@ class SutraResponse:
     agent: str
     responses: list[str]
     raw: dict = field(default_factory=dict)
+    # v0.7: tokens for the next page of each QUERY that hit its LIMIT
+    continuations: list[str] = field(default_factory=list)
 
     @classmethod
     def from_dict(cls, data: dict) -> "SutraResponse":
@@ -52,6 +54,7 @@ class SutraResponse:
             agent=data.get("agent", "unknown"),
             responses=data.get("responses", []),
             raw=data,
+            continuations=data.get("continuations", []),
         )
 
     def __str__(self):
@@ -87,12 +90,16 @@ class SutraClient:
         Returns:
             SutraResponse with execution results
         """
-        endpoint = f"{to_url.rstrip('/')}/sutra"
+        return self._post_sutra(to_url, {"from": from_agent, "body": body})
 
-        payload = json.dumps({
-            "from": from_agent,
-            "body": body,
-        }).encode("utf-8")
+    def next_page(self, to_url: str, from_agent: str, token: str) -> SutraResponse:
+        """Fetch the next page of a QUERY, given a token from
+        ``SutraResponse.continuations`` (v0.7)."""
+        return self._post_sutra(to_url, {"from": from_agent, "continue": token})
+
+    def _post_sutra(self, to_url: str, message: dict) -> SutraResponse:
+        endpoint = f"{to_url.rstrip('/')}/sutra"
+        payload = json.dumps(message).encode("utf-8")
 
         req = urllib.request.Request(
             endpoint,
@@ -7,6 +7,8 @@ v0.3: Auto-signs COMMIT and OFFER when agent has a keypair.
 
 from __future__ import annotations
 
+from typing import Iterator
+
 from .ast_nodes import (
     Program, Header,
     IntentStmt, FactStmt, QueryStmt, OfferStmt, CounterStmt,
@@ -14,6 +16,7 @@ from .ast_nodes import (
     Predicate, NamedArg,
     StringVal, NumberVal, BoolVal, NullVal, MapVal, ListVal,
 )
+from .parser import ProgramStream
 from .agent import Agent
 from .crypto import (
     sign, verify, commitment_content, offer_content, SutraSignature,
@@ -26,21 +29,114 @@ import time as _time
 _MAX_PREDICATE_LEN = 128
 # Maximum number of arguments per predicate
 _MAX_PREDICATE_ARGS = 64
+# Longest run of consecutive FACTs ingested as one batch (batch_facts=True)
+_FACT_BATCH_SIZE = 10_000
 
 
 class RuntimeError(Exception):
     pass
 
 
+_UNSET = object()
+
+
+class Response:
+    """One interpreter output line, rendered to text only when needed.
+
+    Holds the statement kind plus the values the line is built from, as
+    they were when the statement ran; str() formats (and caches) the
+    familiar "[FACT] price(item='TV')" text. A Response compares equal to
+    its text but is not a str: string methods, ``in`` and ``+`` need str(r).
+    Interpreter.execute() returns text; Responses are handed out only on
+    request, by execute(lazy=True) and iter_execute().
+    """
+
+    # Up to three render operands stored inline (no per-record tuple)
+    __slots__ = ("kind", "_render", "_a", "_b", "_c", "_text")
+
+    def __init__(self, kind: str, render, a=_UNSET, b=_UNSET, c=_UNSET):
+        self.kind = kind
+        self._render = render
+        self._a = a
+        self._b = b
+        self._c = c
+        self._text: str | None = None
+
+    @property
+    def data(self) -> tuple:
+        """The values the line is rendered from."""
+        return tuple(x for x in (self._a, self._b, self._c) if x is not _UNSET)
+
+    def __str__(self) -> str:
+        if self._text is None:
+            self._text = self._render(self.kind, *self.data)
+        return self._text
+
+    def __repr__(self) -> str:
+        return f"Response({str(self)!r})"
+
+    def __eq__(self, other) -> bool:
+        if isinstance(other, (Response, str)):
+            return str(self) == str(other)
+        return NotImplemented
+
+    def __hash__(self) -> int:
+        return hash(str(self))
+
+
+def render_responses(responses) -> list[str]:
+    """Response text lines, for callers that expect plain strings."""
+    return [str(r) for r in responses]
+
+
+# Values a Response can hold by reference: nothing can change them later
+_IMMUTABLE = frozenset((str, int, float, bool, type(None)))
+
+
+def _capture(args: dict) -> tuple | str:
+    """``args`` as a Response needs them to render later: their items if
+    every value is immutable, else the rendered text (a list or map could
+    be mutated in place before the Response is read)."""
+    immutable = _IMMUTABLE
+    for v in args.values():
+        if type(v) not in immutable:
+            return _fmt_args(args)
+    return tuple(args.items())
+
+
+def _args_text(args: tuple | str) -> str:
+    if type(args) is str:
+        return args
+    return ", ".join(f"{k}={v!r}" for k, v in args)
+
+
+def _render_pred(kind: str, name: str, args: tuple | str, suffix: str = "") -> str:
+    return f"[{kind}] {name}({_args_text(args)}){suffix}"
+
+
+def _render_text(kind: str, text: str) -> str:
+    return f"[{kind}] {text}"
+
+
 class Interpreter:
-    """Executes SUTRA programs against an Agent state."""
+    """Executes SUTRA programs against an Agent state.
+
+    v0.7: ``responses`` holds Response records rendered on demand, which
+    execute() turns into text unless called with ``lazy=True``; pass
+    ``responses=False`` to skip recording them (bulk loads, state syncs).
+    With ``batch_facts=True``, runs of consecutive FACTs go through
+    Agent.add_facts() — one summary log entry per run instead of one
+    entry per fact.
+    """
 
     # Class-level dispatch table — avoids per-statement isinstance chains
     _DISPATCH = None  # initialized after class definition
 
-    def __init__(self, agent: Agent):
+    def __init__(self, agent: Agent, responses: bool = True, batch_facts: bool = False):
         self.agent = agent
-        self.responses: list[str] = []
+        self.record_responses = responses
+        self.batch_facts = batch_facts
+        self.responses: list[Response] = []
 
     # ── Value resolution ────────────────────────────────
 
@@ -64,27 +160,71 @@ class Interpreter:
             raise RuntimeError(
                 f"Too many predicate arguments: {len(pred.args)} (max {_MAX_PREDICATE_ARGS})"
             )
+        resolved = pred.resolved
+        if resolved is not None:
+            return dict(resolved)
         resolve = Interpreter._resolve_value
         return {arg.name: resolve(arg.value) for arg in pred.args}
 
+    @staticmethod
+    def _offer_fields(stmt: OfferStmt | CounterStmt) -> dict[str, object]:
+        resolved = stmt.resolved_fields
+        if resolved is not None:
+            return dict(resolved)
+        resolve = Interpreter._resolve_value
+        return {f.key: resolve(f.value) for f in stmt.fields}
+
     # ── Execution ───────────────────────────────────────
 
-    def execute(self, program: Program) -> list[str]:
-        """Execute a SUTRA program. Returns list of response lines."""
+    def execute(self, program: Program | ProgramStream, lazy: bool = False) -> list:
+        """Execute a SUTRA program. Returns list of response lines.
+
+        Accepts a ProgramStream too, in which case each statement runs as
+        soon as it has been parsed. With ``lazy=True`` the lines are the
+        Response records themselves, rendered only when str() is called.
+        """
         self.responses = []
 
         # Extract metadata
         meta = {h.key: h.value for h in program.headers}
 
         dispatch = Interpreter._DISPATCH
-        for stmt in program.statements:
+        for stmt in self._statements(program):
             handler = dispatch.get(type(stmt))
             if handler is not None:
                 handler(self, stmt, meta)
             else:
                 raise RuntimeError(f"Unknown statement type: {type(stmt).__name__}")
 
-        return self.responses
+        if lazy:
+            return self.responses
+        return [str(r) for r in self.responses]
+
+    def iter_execute(self, program: Program | ProgramStream) -> Iterator[Response]:
+        """Execute statement by statement, yielding Responses as produced.
+
+        Responses are handed out and dropped rather than accumulated, so a
+        streamed multi-GB program runs in flat memory.
+        """
+        self.responses = []
+        responses = self.responses
+        meta = {h.key: h.value for h in program.headers}
+
+        dispatch = Interpreter._DISPATCH
+        for stmt in self._statements(program):
+            handler = dispatch.get(type(stmt))
+            if handler is None:
+                raise RuntimeError(f"Unknown statement type: {type(stmt).__name__}")
+            handler(self, stmt, meta)
+            if responses:
+                yield from responses
+                responses.clear()
+
+    def _statements(self, program: Program | ProgramStream):
+        """The program's statements, with FACT runs grouped if batching."""
+        if not self.batch_facts:
+            return program.statements
+        return _fact_runs(program.statements)
 
     def _exec_statement(self, stmt, meta: dict):
         handler = Interpreter._DISPATCH.get(type(stmt))
@@ -96,25 +236,72 @@ class Interpreter:
     def _exec_intent(self, stmt: IntentStmt, meta: dict):
         args = self._pred_args(stmt.predicate)
         self.agent.add_intent(stmt.predicate.name, args)
-        self.responses.append(f"[INTENT] {stmt.predicate.name}({_fmt_args(args)})")
+        if self.record_responses:
+            self.responses.append(Response("INTENT", _render_pred, stmt.predicate.name, _capture(args)))
 
     def _exec_fact(self, stmt: FactStmt, meta: dict):
         args = self._pred_args(stmt.predicate)
         self.agent.add_fact(stmt.predicate.name, args)
-        self.responses.append(f"[FACT] {stmt.predicate.name}({_fmt_args(args)})")
+        if self.record_responses:
+            self.responses.append(Response("FACT", _render_pred, stmt.predicate.name, _capture(args)))
+
+    def _exec_fact_run(self, run: FactRun, meta: dict):
+        pred_args = self._pred_args
+        facts = []
+        try:
+            for stmt in run.statements:
+                facts.append((stmt.predicate.name, pred_args(stmt.predicate)))
+        finally:
+            # Facts before a failing statement are kept, as when run one by one
+            self.agent.add_facts(facts)
+        if self.record_responses:
+            self.responses.extend(
+                Response("FACT", _render_pred, name, _capture(args)) for name, args in facts
+            )
+
+    @staticmethod
+    def _query_conditions(stmt: QueryStmt) -> list[tuple[str, str, object]]:
+        resolve = Interpreter._resolve_value
+        return [(c.name, c.op, resolve(c.value)) for c in stmt.conditions]
+
+    @staticmethod
+    def _run_query(agent: Agent, stmt: QueryStmt, args: dict,
+                   conditions: list) -> tuple[list, str | None]:
+        """Run a QUERY; returns (facts, cursor for the next page or None)."""
+        limit = stmt.limit
+        try:
+            # One extra row tells whether another page exists
+            results = agent.query_facts(
+                stmt.predicate.name, args, conditions, stmt.order_by, stmt.descending,
+                None if limit is None else limit + 1, stmt.after,
+            )
+        except ValueError as e:
+            raise RuntimeError(f"Invalid QUERY cursor: {e}") from None
+        if limit is None or len(results) <= limit:
+            return results, None
+        del results[limit:]
+        return results, agent.query_cursor(results[-1], stmt.order_by, stmt.descending)
 
     def _exec_query(self, stmt: QueryStmt, meta: dict):
         args = self._pred_args(stmt.predicate)
-        results = self.agent.query_facts(stmt.predicate.name, args)
+        conditions = self._query_conditions(stmt)
+        results, cursor = self._run_query(self.agent, stmt, args, conditions)
+        if not self.record_responses:
+            return
         if results:
             for r in results:
-                self.responses.append(f"[QUERY RESULT] {r}")
+                self.responses.append(Response("QUERY RESULT", _render_result, r.predicate, _capture(r.args)))
+            if cursor is not None:
+                self.responses.append(Response("QUERY MORE", _render_more, stmt, cursor))
         else:
-            self.responses.append(f"[QUERY] No matching facts for {stmt.predicate.name}({_fmt_args(args)})")
+            self.responses.append(Response(
+                "QUERY", _render_no_match, stmt.predicate.name, _capture(args),
+                tuple(conditions) if all(type(c[2]) in _IMMUTABLE for c in conditions)
+                else _fmt_conditions(conditions),
+            ))
 
     def _exec_offer(self, stmt: OfferStmt, meta: dict):
-        resolve = self._resolve_value
-        fields = {f.key: resolve(f.value) for f in stmt.fields}
+        fields = self._offer_fields(stmt)
         from_agent = meta.get("from", self.agent.agent_id)
         # v0.7: Calculate expiry timestamp
         expires_at = _parse_expires(stmt.expires) if stmt.expires else None
@@ -134,12 +321,12 @@ class Interpreter:
             signature=sig_dict,
             expires_at=expires_at,
         )
-        exp_info = f" expires={stmt.expires}" if stmt.expires else ""
-        self.responses.append(f"[OFFER] id={stmt.offer_id!r} → {stmt.to_agent}{exp_info}{sig_info}")
+        if self.record_responses:
+            exp_info = f" expires={stmt.expires}" if stmt.expires else ""
+            self.responses.append(Response("OFFER", _render_offer, stmt.offer_id, stmt.to_agent, exp_info + sig_info))
 
     def _exec_counter(self, stmt: CounterStmt, meta: dict):
-        resolve = self._resolve_value
-        fields = {f.key: resolve(f.value) for f in stmt.fields}
+        fields = self._offer_fields(stmt)
         from_agent = meta.get("from", self.agent.agent_id)
         expires_at = _parse_expires(stmt.expires) if stmt.expires else None
         # Auto-sign counter-offer
@@ -159,11 +346,10 @@ class Interpreter:
             expires_at=expires_at,
             counter_to=stmt.original_offer_id,
         )
-        neg_round = self.agent.offer_ledger[stmt.offer_id].negotiation_round
-        self.responses.append(
-            f"[COUNTER] {stmt.original_offer_id!r} → id={stmt.offer_id!r} "
-            f"(round {neg_round}) → {stmt.to_agent}{sig_info}"
-        )
+        if self.record_responses:
+            neg_round = self.agent.offer_ledger[stmt.offer_id].negotiation_round
+            ids = (stmt.original_offer_id, stmt.offer_id, neg_round)
+            self.responses.append(Response("COUNTER", _render_counter, ids, stmt.to_agent, sig_info))
 
     def _exec_accept(self, stmt: AcceptStmt, meta: dict):
         # v0.7: Resolve conditions if present
@@ -174,23 +360,31 @@ class Interpreter:
                 for c in stmt.conditions
             ]
         ok = self.agent.accept_offer(stmt.offer_id, conditions=conditions)
+        if not self.record_responses:
+            return
         if ok:
             cond_info = f" with {len(conditions)} conditions" if conditions else ""
-            self.responses.append(f"[ACCEPT] Offer {stmt.offer_id!r} accepted{cond_info}")
+            self.responses.append(Response("ACCEPT", _render_text, f"Offer {stmt.offer_id!r} accepted{cond_info}"))
         else:
             offer = self.agent.offer_ledger.get(stmt.offer_id)
             if offer and offer.is_expired:
-                self.responses.append(f"[ACCEPT FAILED] Offer {stmt.offer_id!r} expired")
+                self.responses.append(Response("ACCEPT FAILED", _render_text, f"Offer {stmt.offer_id!r} expired"))
             else:
-                self.responses.append(f"[ACCEPT FAILED] Offer {stmt.offer_id!r} not found or not open")
+                self.responses.append(Response(
+                    "ACCEPT FAILED", _render_text, f"Offer {stmt.offer_id!r} not found or not open",
+                ))
 
     def _exec_reject(self, stmt: RejectStmt, meta: dict):
         ok = self.agent.reject_offer(stmt.offer_id, stmt.reason)
+        if not self.record_responses:
+            return
         if ok:
             reason_part = f" — {stmt.reason}" if stmt.reason else ""
-            self.responses.append(f"[REJECT] Offer {stmt.offer_id!r} rejected{reason_part}")
+            self.responses.append(Response("REJECT", _render_text, f"Offer {stmt.offer_id!r} rejected{reason_part}"))
         else:
-            self.responses.append(f"[REJECT FAILED] Offer {stmt.offer_id!r} not found or not open")
+            self.responses.append(Response(
+                "REJECT FAILED", _render_text, f"Offer {stmt.offer_id!r} not found or not open",
+            ))
 
     def _exec_commit(self, stmt: CommitStmt, meta: dict):
         args = self._pred_args(stmt.predicate)
@@ -205,19 +399,85 @@ class Interpreter:
             sig_dict = sig.to_dict()
             sig_info = f" 🔏 {sig.algorithm}:{sig.signature_hex[:12]}..."
         self.agent.add_commit(stmt.predicate.name, args, stmt.deadline, sig_dict)
-        dl = f" BY {stmt.deadline}" if stmt.deadline else ""
-        self.responses.append(f"[COMMIT] {stmt.predicate.name}({_fmt_args(args)}){dl}{sig_info}")
+        if self.record_responses:
+            dl = f" BY {stmt.deadline}" if stmt.deadline else ""
+            self.responses.append(Response("COMMIT", _render_pred, stmt.predicate.name, _capture(args), dl + sig_info))
 
     def _exec_act(self, stmt: ActStmt, meta: dict):
         args = self._pred_args(stmt.predicate)
         self.agent.add_action(stmt.predicate.name, args)
-        self.responses.append(f"[ACT] {stmt.predicate.name}({_fmt_args(args)})")
+        if self.record_responses:
+            self.responses.append(Response("ACT", _render_pred, stmt.predicate.name, _capture(args)))
+
+
+# ── FACT batching ───────────────────────────────────────
+
+class FactRun:
+    """Consecutive FactStmts executed as one Agent.add_facts() batch."""
+
+    __slots__ = ("statements",)
+
+    def __init__(self, statements: list[FactStmt]):
+        self.statements = statements
+
+
+def _fact_runs(statements) -> Iterator:
+    """Yield statements, grouping consecutive FACTs into FactRuns.
+
+    Runs are capped at _FACT_BATCH_SIZE so a streamed program is still
+    executed in bounded memory.
+    """
+    run: list[FactStmt] = []
+    for stmt in statements:
+        if type(stmt) is FactStmt:
+            run.append(stmt)
+            if len(run) >= _FACT_BATCH_SIZE:
+                yield FactRun(run)
+                run = []
+            continue
+        if run:
+            yield FactRun(run) if len(run) > 1 else run[0]
+            run = []
+        yield stmt
+    if run:
+        yield FactRun(run) if len(run) > 1 else run[0]
 
 
 def _fmt_args(args: dict) -> str:
     return ", ".join(f"{k}={v!r}" for k, v in args.items())
 
 
+def _fmt_conditions(conditions) -> str:
+    return ", ".join(f"{k}{op}{v!r}" for k, op, v in conditions)
+
+
+def _render_no_match(kind: str, name: str, args: tuple | str, conditions: tuple | str) -> str:
+    if type(conditions) is not str:
+        conditions = _fmt_conditions(conditions)
+    parts = ", ".join(p for p in (_args_text(args), conditions) if p)
+    return f"[{kind}] No matching facts for {name}({parts})"
+
+
+def _render_result(kind: str, name: str, args: tuple | str) -> str:
+    return f"[{kind}] FACT {name}({_args_text(args)})"
+
+
+def _render_more(kind: str, stmt: QueryStmt, cursor: str) -> str:
+    return f'[{kind}] AFTER "{cursor}"'
+
+
+def _render_offer(kind: str, offer_id: str, to_agent: str, suffix: str) -> str:
+    return f"[{kind}] id={offer_id!r} → {to_agent}{suffix}"
+
+
+def _render_counter(kind: str, ids: tuple, to_agent: str, sig_info: str) -> str:
+    original_id, offer_id, neg_round = ids
+    return (
+        f"[{kind}] {original_id!r} → id={offer_id!r} "
+        f"(round {neg_round}) → {to_agent}{sig_info}"
+    )
+
+
 def _parse_expires(expires_str: str) -> float | None:
     """Parse an expiry string into a Unix timestamp.
 
@@ -247,6 +507,7 @@ def _parse_expires(expires_str: str) -> float | None:
 Interpreter._DISPATCH = {
     IntentStmt: Interpreter._exec_intent,
     FactStmt: Interpreter._exec_fact,
+    FactRun: Interpreter._exec_fact_run,
     QueryStmt: Interpreter._exec_query,
     OfferStmt: Interpreter._exec_offer,
     CounterStmt: Interpreter._exec_counter,
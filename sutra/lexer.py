@@ -1,8 +1,20 @@
 """SUTRA v0.1 — Lexer (Tokenizer)
 
 Converts raw SUTRA source text into a stream of tokens.
+The source may be a string, a text file object, or a UTF-8 bytes buffer
+(bytes, memoryview, mmap); the latter two are scanned in chunks. Buffers
+get the universal-newline translation of a text-mode open().
 """
 
+import codecs
+import io
+import mmap
+import os
+import re
+import sys
+from contextlib import contextmanager
+from typing import Iterator, TextIO
+
 from .tokens import Token, TokenType, KEYWORDS
 
 
@@ -13,6 +25,52 @@ class LexerError(Exception):
         self.col = col
 
 
+_BUFFER_TYPES = (bytes, bytearray, memoryview, mmap.mmap)
+
+
+class _Utf8ChunkReader:
+    """read(n)-style adapter that decodes a UTF-8 buffer a slice at a time.
+
+    Only the slice being decoded is copied out of the buffer, so an mmap'd
+    file is paged in on demand instead of being read into one big string.
+    "\r\n" and "\r" come out as "\n", as from a file opened in text mode
+    (a "\r" ending one slice is held back until the next is decoded).
+    """
+
+    def __init__(self, buf):
+        self._buf = buf
+        self._len = len(buf)
+        self._offset = 0
+        self._decoder = io.IncrementalNewlineDecoder(
+            codecs.getincrementaldecoder("utf-8")(), translate=True,
+        )
+
+    def read(self, size: int) -> str:
+        while self._offset < self._len:
+            end = self._offset + size
+            text = self._decoder.decode(self._buf[self._offset:end])
+            self._offset = min(end, self._len)
+            if text:
+                return text
+        return self._decoder.decode(b"", final=True)
+
+
+@contextmanager
+def map_source(path: str) -> Iterator[mmap.mmap | bytes]:
+    """Memory-map a .sutra file read-only, for passing straight to Lexer.
+
+    Usage:
+        with map_source("knowledge.sutra") as buf:
+            program = parse_stream(buf)
+    """
+    with open(path, "rb") as f:
+        if os.fstat(f.fileno()).st_size == 0:
+            yield b""  # empty files cannot be mapped
+            return
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+            yield mm
+
+
 class Lexer:
     # Class-level lookup table — avoids per-iteration dict creation
     _SIMPLE_TOKENS = {
@@ -27,12 +85,62 @@ class Lexer:
         ";": TokenType.SEMICOLON,
         "=": TokenType.EQUALS,
         "#": TokenType.HASH,
+        "<": TokenType.LT,
+        ">": TokenType.GT,
+        # Two-character operators
+        "<=": TokenType.LE,
+        ">=": TokenType.GE,
+        "!=": TokenType.NE,
     }
     _ESCAPE_MAP = {"n": "\n", "t": "\t", "\\": "\\", '"': '"'}
     _WHITESPACE = frozenset((" ", "\t", "\r"))
 
-    def __init__(self, source: str):
+    # Master scanner — one compiled alternation, group number = token kind.
+    # Leading blanks are folded into each match so the Python loop runs once
+    # per token. Only ASCII-definable token shapes are matched directly;
+    # anything else (unicode identifiers, unterminated strings, stray
+    # characters) lands in the catch-all group and is handed to the
+    # character-level readers, so tokens and errors stay identical.
+    _MASTER_RE = re.compile(
+        r"""
+        [ \t\r]*
+        (?:
+            ([<>!]=|[(){}\[\],:;=\#<>])              # 1: punctuation / operator
+           |([A-Za-z_]\w*)                            # 2: identifier / keyword
+           |("(?:[^"\\]|\\.)*")                       # 3: string
+           |((?>-?[0-9]+(?:\.[0-9]*)?))(?![^\x00-\x7f]) # 4: number
+           |(\n)                                     # 5: newline
+           |(//[^\n]*)                               # 6: comment
+           |(.)                                      # 7: anything else
+           |\Z
+        )
+        """,
+        re.VERBOSE | re.DOTALL,
+    )
+    _ESCAPE_RE = re.compile(r"\\(.)", re.DOTALL)
+    _STRING_NEWLINE_RE = re.compile(r"\\.|\n", re.DOTALL)
+
+    # Characters pulled per read() when scanning a file object
+    CHUNK_SIZE = 1 << 16
+
+    def __init__(self, source: str | TextIO | bytes | mmap.mmap, chunk_size: int = CHUNK_SIZE,
+                 intern_identifiers: bool = True):
+        # File-like sources are scanned through a sliding buffer: `source`
+        # holds only the unconsumed tail plus the most recent chunk.
+        if isinstance(source, str):
+            self._read = None
+        elif isinstance(source, _BUFFER_TYPES):
+            self._read = _Utf8ChunkReader(source).read
+            source = ""
+        else:
+            self._read = source.read
+            source = ""
         self.source = source
+        self.chunk_size = chunk_size
+        # v0.7: Identifiers (predicate/arg names, map keys) go through
+        # sys.intern, so the same name parsed from any message is one str
+        # shared by every Fact.args key and _fact_index entry.
+        self._intern = sys.intern if intern_identifiers else str
         self.pos = 0
         self.line = 1
         self.col = 1
@@ -102,6 +210,8 @@ class Lexer:
             if ch == "\\":
                 pos += 1
                 self.col += 1
+                if pos >= length:
+                    break
                 esc = src[pos]
                 pos += 1
                 self.col += 1
@@ -149,9 +259,159 @@ class Lexer:
         self.pos = pos
         word = src[start:pos]
         token_type = KEYWORDS.get(word, TokenType.IDENTIFIER)
+        if token_type is TokenType.IDENTIFIER:
+            word = self._intern(word)
         return Token(token_type, word, line, col)
 
+    def _read_placeholder(self) -> Token:
+        """Read a template placeholder: ``?`` (positional) or ``?name``."""
+        line, col = self.line, self.col
+        self._advance()  # skip ?
+        name = ""
+        if self.pos < self._len and (self.source[self.pos].isalpha() or self.source[self.pos] == "_"):
+            name = self._read_identifier().value
+        return Token(TokenType.PLACEHOLDER, name, line, col)
+
+    def _read_slow_token(self) -> Token:
+        """Read one string/number/identifier/placeholder token at the current position."""
+        src = self.source
+        ch = src[self.pos]
+        if ch == '"':
+            return self._read_string()
+        if ch.isdigit() or (ch == "-" and self.pos + 1 < self._len and src[self.pos + 1].isdigit()):
+            return self._read_number()
+        if ch.isalpha() or ch == "_":
+            return self._read_identifier()
+        if ch == "?":
+            return self._read_placeholder()
+        raise LexerError(f"Unexpected character: {ch!r}", self.line, self.col)
+
     def tokenize(self) -> list[Token]:
+        """Tokenize the whole source into a list (ends with an EOF token)."""
+        tokens = list(self.iter_tokens())
+        self.tokens = tokens
+        return tokens
+
+    def iter_tokens(self, skip_newlines: bool = False,
+                    errors: list[LexerError] | None = None) -> Iterator[Token]:
+        """Lazily scan the source with the compiled master-regex scanner.
+
+        Tokens are produced on demand, so a consumer such as Parser holds
+        only its lookahead rather than the whole token list. With
+        ``skip_newlines`` NEWLINE tokens are dropped at the source (line
+        and column tracking is unaffected). Errors are raised when the
+        offending token is reached, not up front — unless an ``errors``
+        list is given, in which case each error is appended there, the
+        offending character becomes an ERROR token and scanning continues.
+        """
+        simple = self._SIMPLE_TOKENS
+        keywords = KEYWORDS
+        identifier = TokenType.IDENTIFIER
+        string = TokenType.STRING
+        number = TokenType.NUMBER
+        newline = TokenType.NEWLINE
+        finditer = self._MASTER_RE.finditer
+        unescape_sub = self._ESCAPE_RE.sub
+        escape_map = self._ESCAPE_MAP
+        intern = self._intern
+
+        def unescape(m):
+            esc = m.group(1)
+            return escape_map.get(esc, esc)
+
+        src = self.source
+        read = self._read
+        final = read is None  # True once the whole source is in `src`
+        line = 1
+        line_start = 0  # col = offset - line_start + 1 (offsets into `src`)
+        resume = 0
+
+        while resume is not None:
+            matches = finditer(src, resume)
+            resume = refill_at = None
+            for m in matches:
+                kind = m.lastindex
+                if not final and m.end() == len(src):
+                    refill_at = m.start()
+                    break
+                if kind == 1:
+                    start, end = m.span(1)
+                    ch = src[start:end]
+                    yield Token(simple[ch], ch, line, start - line_start + 1)
+                elif kind == 2:
+                    word = m.group(2)
+                    tt = keywords.get(word, identifier)
+                    if tt is identifier:
+                        word = intern(word)
+                    yield Token(tt, word, line, m.start(2) - line_start + 1)
+                elif kind == 3:
+                    start, end = m.span(3)
+                    raw = src[start + 1:end - 1]
+                    value = unescape_sub(unescape, raw) if "\\" in raw else raw
+                    yield Token(string, value, line, start - line_start + 1)
+                    if "\n" in raw:
+                        # Only unescaped newlines advance the line counter
+                        for nl in self._STRING_NEWLINE_RE.finditer(raw):
+                            if nl.group() == "\n":
+                                line += 1
+                                line_start = start + 1 + nl.end()
+                elif kind == 4:
+                    yield Token(number, m.group(4), line, m.start(4) - line_start + 1)
+                elif kind == 5:
+                    start = m.start(5)
+                    if not skip_newlines:
+                        yield Token(newline, "\\n", line, start - line_start + 1)
+                    line += 1
+                    line_start = start + 1
+                elif kind == 7:
+                    # Not an ASCII token shape — let the character-level
+                    # readers take exactly one token (or raise), then resync.
+                    start = m.start(7)
+                    self.pos, self.line, self.col = start, line, start - line_start + 1
+                    try:
+                        tok = self._read_slow_token()
+                    except LexerError as e:
+                        if not final:
+                            refill_at = m.start()
+                        elif errors is None:
+                            raise
+                        else:
+                            errors.append(e)
+                            resume = start + 1
+                            yield Token(TokenType.ERROR, src[start], line, start - line_start + 1)
+                        break
+                    if not final and self.pos == len(src):
+                        refill_at = m.start()
+                        break
+                    line = self.line
+                    line_start = self.pos - self.col + 1
+                    resume = self.pos
+                    yield tok
+                    break
+
+            if refill_at is not None:
+                # The token may run on into the next chunk: drop the consumed
+                # prefix, append a chunk and rescan from the token's start.
+                chunk = read(self.chunk_size)
+                final = not chunk
+                src = src[refill_at:] + chunk
+                line_start -= refill_at
+                self.source, self._len = src, len(src)
+                resume = 0
+
+        end = self._len
+        self.pos, self.line, self.col = end, line, end - line_start + 1
+        yield Token(TokenType.EOF, "", self.line, self.col)
+
+    def tokenize_reference(self) -> list[Token]:
+        """Character-at-a-time scanner.
+
+        Kept as the reference implementation: ``tokenize`` must produce the
+        same token stream and the same LexerError positions. Only works on
+        in-memory sources.
+        """
+        if self._read is not None:
+            raise TypeError("tokenize_reference() needs a str source")
         tokens: list[Token] = []
         tokens_append = tokens.append
         simple = self._SIMPLE_TOKENS
@@ -173,29 +433,21 @@ class Lexer:
                 tokens_append(Token(TokenType.NEWLINE, "\\n", line, col))
                 continue
 
-            # Single-char tokens
+            # Two-char operators, then single-char tokens
+            pair = src[self.pos:self.pos + 2]
+            if len(pair) == 2 and pair in simple:
+                self._advance()
+                self._advance()
+                tokens_append(Token(simple[pair], pair, line, col))
+                continue
             tt = simple.get(ch)
             if tt is not None:
                 self._advance()
                 tokens_append(Token(tt, ch, line, col))
                 continue
 
-            # Strings
-            if ch == '"':
-                tokens_append(self._read_string())
-                continue
-
-            # Numbers
-            if ch.isdigit() or (ch == "-" and self.pos + 1 < self._len and src[self.pos + 1].isdigit()):
-                tokens_append(self._read_number())
-                continue
-
-            # Identifiers and keywords
-            if ch.isalpha() or ch == "_":
-                tokens_append(self._read_identifier())
-                continue
-
-            raise LexerError(f"Unexpected character: {ch!r}", line, col)
+            # Strings, numbers, identifiers and keywords
+            tokens_append(self._read_slow_token())
 
         tokens_append(Token(TokenType.EOF, "", self.line, self.col))
         self.tokens = tokens
@@ -0,0 +1,241 @@
+"""SUTRA v0.7 — Optimistic Concurrency Control
+
+Agent has no locking of its own. A threaded server handling concurrent
+messages for one agent could wrap every message in one lock, but then
+parsing, query scans and response building all wait on each other.
+
+OptimisticExecutor runs a message in three phases:
+
+  1. Read phase, no lock: the program runs against a _Speculation that
+     reads the live agent and buffers every write. It records the
+     version (Agent.state_versions) of each key it reads. The reads
+     themselves change nothing: expiring facts and merging pending
+     range-index entries take the latch first (prepare_read).
+  2. Validation, under the agent's short commit latch: if any key read
+     has moved on since, another message committed a conflicting write.
+     The buffered writes are discarded and the message is retried.
+  3. Write phase, still under the latch: the buffered writes are applied
+     in one SutraTransaction, and the versions of the keys written are
+     bumped.
+
+A message that reads keys other messages only write, or that only writes
+(the common FACT/INTENT/ACT/COMMIT traffic), never conflicts. Offer
+negotiation (OFFER, COUNTER, ACCEPT, REJECT) depends on the ledger state
+it changes, and a QUERY that follows a write to the same predicate must
+see that write. Neither can be speculated, so those programs run whole
+under the latch. So does a message that keeps conflicting past
+``max_retries``.
+
+Every writer of the agent must go through the same executor while it is
+in use.
+
+Usage:
+    executor = OptimisticExecutor(agent)
+    responses = executor.execute(PROGRAM_CACHE.parse(body))   # any thread
+    executor.stats()   # {"optimistic": ..., "conflicts": ..., ...}
+"""
+
+from __future__ import annotations
+
+import threading
+import time
+from typing import Any, Callable
+
+from .agent import Agent
+from .ast_nodes import (
+    Program, FactStmt, QueryStmt, IntentStmt, ActStmt, CommitStmt,
+    OfferStmt, CounterStmt, AcceptStmt, RejectStmt,
+)
+from .interpreter import Interpreter, FactRun
+from .transaction import SutraTransaction
+
+# State keys for statements that write a whole container
+_CONTAINER_KEYS = {IntentStmt: "goal_set", ActStmt: "action_queue", CommitStmt: "commit_ledger"}
+
+
+def access_sets(program: Program) -> tuple[set, set, bool]:
+    """(read keys, write keys, speculable) of a program, from its statements.
+
+    Keys are those of Agent.state_versions. ``speculable`` is False when
+    the program must run under the latch (see module docstring).
+    """
+    reads: set = set()
+    writes: set = set()
+    speculable = True
+    for stmt in program.statements:
+        t = type(stmt)
+        if t is QueryStmt:
+            key = ("fact", stmt.predicate.name)
+            if key in writes:
+                speculable = False  # reads its own write
+            reads.add(key)
+        elif t is FactStmt:
+            writes.add(("fact", stmt.predicate.name))
+        elif t is FactRun:
+            writes.update(("fact", s.predicate.name) for s in stmt.statements)
+        elif t in _CONTAINER_KEYS:
+            writes.add(_CONTAINER_KEYS[t])
+        elif t is OfferStmt:
+            writes.add(("offer", stmt.offer_id))
+            speculable = False
+        elif t is CounterStmt:
+            writes.update((("offer", stmt.offer_id), ("offer", stmt.original_offer_id)))
+            speculable = False
+        elif t in (AcceptStmt, RejectStmt):
+            reads.add(("offer", stmt.offer_id))
+            writes.add(("offer", stmt.offer_id))
+            speculable = False
+        else:
+            speculable = False
+    return reads, writes, speculable
+
+
+def _buffered(method: str):
+    def write(self, *args, **kwargs):
+        self.writes.append((method, args, kwargs))
+    write.__name__ = method
+    return write
+
+
+class _Speculation:
+    """Stands in for the agent during the read phase: QUERYs read the live
+    agent, recording each key's version on first read; writes are buffered
+    as (method, args, kwargs) for the write phase."""
+
+    def __init__(self, executor: OptimisticExecutor):
+        agent = executor.agent
+        self._executor = executor
+        self._agent = agent
+        self.agent_id = agent.agent_id
+        self.keypair = agent.keypair
+        self.observed: dict[Any, int] = {}
+        self.writes: list[tuple[str, tuple, dict]] = []
+
+    def query_facts(self, predicate: str, *args, **kwargs):
+        # Expiry and index merges are writes: they happen under the latch,
+        # before the read, which itself changes nothing
+        self._executor.prepare_read(predicate)
+        key = ("fact", predicate)
+        if key not in self.observed:
+            self.observed[key] = self._agent.state_versions.get(key, 0)
+        return self._agent.query_facts(predicate, *args, read_only=True, **kwargs)
+
+    def query_cursor(self, *args, **kwargs) -> str:
+        return self._agent.query_cursor(*args, **kwargs)
+
+    add_fact = _buffered("add_fact")
+    add_facts = _buffered("add_facts")
+    add_intent = _buffered("add_intent")
+    add_action = _buffered("add_action")
+    add_commit = _buffered("add_commit")
+
+
+class OptimisticExecutor:
+    """Executes programs on one agent from many threads (see module docstring).
+
+    ``strategy`` is the SutraTransaction strategy of the write phase. After
+    a conflict, a message waits ``backoff_s`` times its attempt number
+    before retrying.
+    """
+
+    def __init__(self, agent: Agent, max_retries: int = 8, backoff_s: float = 0.0005,
+                 strategy: str = "undo"):
+        self.agent = agent
+        self.max_retries = max_retries
+        self.backoff_s = backoff_s
+        self.strategy = strategy
+        self._latch = threading.Lock()
+        self._stats = {
+            "optimistic": 0,   # committed after a read phase without the latch
+            "serialized": 0,   # ran whole under the latch
+            "conflicts": 0,    # failed validations
+            "retries": 0,      # read phases re-run after a conflict
+            "exhausted": 0,    # gave up after max_retries and serialized
+        }
+
+    def stats(self) -> dict[str, int]:
+        with self._latch:
+            return dict(self._stats)
+
+    def read(self, fn: Callable[[Agent], Any]) -> Any:
+        """Call ``fn(agent)`` under the latch, so that it can iterate the
+        agent's containers while other threads write to them."""
+        with self._latch:
+            return fn(self.agent)
+
+    def prepare_read(self, predicate: str):
+        """Do the writes a query of ``predicate`` would do (drop facts past
+        their TTL, merge pending range-index entries) under the latch."""
+        agent = self.agent
+        if agent.expiry_due() or agent.indexes_pending(predicate):
+            with self._latch:
+                agent.expire_facts()
+                agent.settle_indexes(predicate)
+
+    def execute(self, program: Program, responses: bool = True, lazy: bool = False) -> list:
+        """Run ``program`` atomically; returns its response lines, as
+        Interpreter.execute does (Response records with ``lazy=True``)."""
+        _, writes, speculable = access_sets(program)
+        if not speculable:
+            return self._serialized(program, writes, responses, lazy)
+
+        stats = self._stats
+        for attempt in range(self.max_retries + 1):
+            if attempt:
+                time.sleep(self.backoff_s * attempt)
+            spec = _Speculation(self)
+            try:
+                output = Interpreter(spec, responses=responses).execute(program, lazy)
+            except Exception:
+                # A read torn by a concurrent write can fail: retry if so
+                with self._latch:
+                    if not self.agent.versions_changed(spec.observed):
+                        raise
+                    self._conflict(attempt)
+                continue
+            with self._latch:
+                if self.agent.versions_changed(spec.observed):
+                    self._conflict(attempt)
+                    continue
+                self._apply(spec.writes, writes)
+                stats["optimistic"] += 1
+            return output
+
+        with self._latch:
+            stats["exhausted"] += 1
+        return self._serialized(program, writes, responses, lazy)
+
+    def _conflict(self, attempt: int):
+        self._stats["conflicts"] += 1
+        if attempt < self.max_retries:
+            self._stats["retries"] += 1
+
+    def _apply(self, buffered: list[tuple[str, tuple, dict]], writes: set):
+        agent = self.agent
+        agent.expire_facts()
+        tx = SutraTransaction(agent, strategy=self.strategy)
+        tx.begin()
+        try:
+            for method, args, kwargs in buffered:
+                getattr(agent, method)(*args, **kwargs)
+            tx.commit()
+        except Exception:
+            tx.rollback()
+            raise
+        finally:
+            agent.bump_versions(writes)
+
+    def _serialized(self, program: Program, writes: set, responses: bool, lazy: bool) -> list:
+        with self._latch:
+            self._stats["serialized"] += 1
+            tx = SutraTransaction(self.agent, strategy=self.strategy)
+            tx.begin()
+            try:
+                output = Interpreter(self.agent, responses=responses).execute(program, lazy)
+                tx.commit()
+                return output
+            except Exception:
+                tx.rollback()
+                raise
+            finally:
+                self.agent.bump_versions(writes)
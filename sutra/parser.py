@@ -1,20 +1,36 @@
 """SUTRA v0.1 — Recursive Descent Parser
 
-Converts a token stream into an AST (Program node).
+Converts a token stream (list or lazy iterator) into an AST (Program node).
 """
 
 from __future__ import annotations
 
+import math
+import mmap
+import struct
+import sys
+import zlib
+from array import array
+from dataclasses import fields, is_dataclass
+from decimal import Decimal
+from typing import Any, Iterable, Iterator, TextIO
+
 from .tokens import Token, TokenType
+from .lexer import Lexer, LexerError
 from .ast_nodes import (
     Program, Header,
     IntentStmt, FactStmt, QueryStmt, OfferStmt, OfferField,
     CounterStmt, AcceptStmt, RejectStmt, CommitStmt, ActStmt,
-    Predicate, NamedArg,
+    Predicate, NamedArg, Comparison,
     StringVal, NumberVal, BoolVal, NullVal, MapVal, ListVal,
+    Placeholder,
 )
 
 
+# v0.7: operators accepted in QUERY arguments besides '='
+_COMPARISONS = (TokenType.LT, TokenType.LE, TokenType.GT, TokenType.GE, TokenType.NE)
+
+
 class ParseError(Exception):
     def __init__(self, message: str, token: Token):
         super().__init__(f"[Line {token.line}, Col {token.col}] {message}")
@@ -22,56 +38,150 @@ class ParseError(Exception):
 
 
 class Parser:
-    def __init__(self, tokens: list[Token]):
-        # Filter out newlines — they are insignificant in SUTRA
-        self.tokens = [t for t in tokens if t.type != TokenType.NEWLINE]
-        self.pos = 0
+    def __init__(self, tokens: Iterable[Token], allow_placeholders: bool = False,
+                 fold_constants: bool = False, errors: list[ParseError] | None = None):
+        # Tokens are pulled on demand with a one-token lookahead, so a lazy
+        # stream (Lexer.iter_tokens) is never materialized. Newlines are
+        # insignificant in SUTRA and are dropped as they are pulled.
+        self._next_token = iter(tokens).__next__
+        self._tok: Token = self._pull()
+        self.headers: list[Header] | None = None
+        # Template compilation only: accept ? / ?name in value and string slots
+        self.allow_placeholders = allow_placeholders
+        self._positional = 0
+        # Pre-resolve literal args/fields so the interpreter skips value resolution
+        self.fold_constants = fold_constants
+        # Recovery mode: record each ParseError here, skip the bad statement
+        # and keep going (see _synchronize)
+        self.errors = errors
 
     # ── helpers ─────────────────────────────────────────
 
+    def _pull(self) -> Token:
+        # Never called on EOF: the parser stops at EOF without consuming it
+        tok = self._next_token()
+        while tok.type is TokenType.NEWLINE:
+            tok = self._next_token()
+        return tok
+
     def _current(self) -> Token:
-        return self.tokens[self.pos]
+        return self._tok
 
     def _peek_type(self) -> TokenType:
-        return self.tokens[self.pos].type
+        return self._tok.type
 
     def _at(self, *types: TokenType) -> bool:
-        return self._peek_type() in types
+        return self._tok.type in types
 
     def _expect(self, tt: TokenType, msg: str = "") -> Token:
-        tok = self._current()
-        if tok.type != tt:
+        tok = self._tok
+        if tok.type is not tt:
             raise ParseError(msg or f"Expected {tt.name}, got {tok.type.name}", tok)
-        self.pos += 1
+        self._tok = self._pull()
         return tok
 
     def _match(self, *types: TokenType) -> Token | None:
-        if self._peek_type() in types:
-            tok = self._current()
-            self.pos += 1
+        tok = self._tok
+        if tok.type in types:
+            self._tok = self._pull()
             return tok
         return None
 
+    def _expect_string(self, msg: str) -> str | Placeholder:
+        """Consume a STRING token and return its value (or a string slot)."""
+        tok = self._tok
+        if tok.type is TokenType.PLACEHOLDER and self.allow_placeholders:
+            self._tok = self._pull()
+            return self._placeholder(tok, as_string=True)
+        return self._expect(TokenType.STRING, msg).value
+
+    def _placeholder(self, tok: Token, as_string: bool = False) -> Placeholder:
+        if tok.value:
+            return Placeholder(key=tok.value, as_string=as_string)
+        key = self._positional
+        self._positional += 1
+        return Placeholder(key=key, as_string=as_string)
+
     # ── top level ───────────────────────────────────────
 
     def parse(self) -> Program:
-        headers = self._parse_headers()
-        statements = []
-        while not self._at(TokenType.EOF):
-            statements.append(self._parse_statement())
-        return Program(headers=headers, statements=statements)
+        headers = self.parse_headers()
+        return Program(headers=headers, statements=list(self.iter_statements()))
+
+    def iter_statements(self) -> Iterator[Any]:
+        """Yield statements one at a time as they are parsed.
+
+        Headers are parsed first (see ``parse_headers``). Combined with a
+        lazy token stream, only the statement being parsed is held in memory.
+        """
+        self.parse_headers()
+        parse_statement = self._parse_statement
+        if self.errors is None:
+            while self._tok.type is not TokenType.EOF:
+                yield parse_statement()
+            return
+        while self._tok.type is not TokenType.EOF:
+            start = self._tok
+            try:
+                stmt = parse_statement()
+            except ParseError as e:
+                self._record(e)
+                self._synchronize(start)
+                continue
+            yield stmt
+
+    def _record(self, error: ParseError):
+        # An ERROR token was already reported by the lexer
+        if error.token.type is not TokenType.ERROR:
+            self.errors.append(error)
+
+    def _synchronize(self, start: Token):
+        """Skip past the next ';' after an error in the statement at ``start``.
+
+        Also stops in front of a statement keyword, so a missing ';' costs
+        only the broken statement and not the one after it.
+        """
+        dispatch = Parser._STMT_DISPATCH
+        while True:
+            tok = self._tok
+            if tok.type is TokenType.EOF:
+                return
+            if tok.type is TokenType.SEMICOLON:
+                self._tok = self._pull()
+                return
+            if tok is not start and tok.type in dispatch:
+                return
+            self._tok = self._pull()
 
     # ── headers ─────────────────────────────────────────
 
+    def parse_headers(self) -> list[Header]:
+        """Parse the header block once; later calls return the same list."""
+        if self.headers is None:
+            self.headers = self._parse_headers()
+        return self.headers
+
     def _parse_headers(self) -> list[Header]:
         headers: list[Header] = []
         while self._at(TokenType.HASH):
-            self._expect(TokenType.HASH)
-            key_tok = self._expect(TokenType.IDENTIFIER, "Expected header key after #")
-            val_tok = self._expect(TokenType.STRING, "Expected string value for header")
-            headers.append(Header(key=key_tok.value, value=val_tok.value))
+            try:
+                headers.append(self._parse_header())
+            except ParseError as e:
+                if self.errors is None:
+                    raise
+                self._record(e)
+                # Skip the rest of the bad header
+                while not self._at(TokenType.HASH, TokenType.EOF) and \
+                        self._tok.type not in Parser._STMT_DISPATCH:
+                    self._tok = self._pull()
         return headers
 
+    def _parse_header(self) -> Header:
+        self._expect(TokenType.HASH)
+        key_tok = self._expect(TokenType.IDENTIFIER, "Expected header key after #")
+        val_tok = self._expect(TokenType.STRING, "Expected string value for header")
+        return Header(key=key_tok.value, value=val_tok.value)
+
     # ── statements ──────────────────────────────────────
 
     # Class-level dispatch for statement parsing
@@ -98,53 +208,69 @@ class Parser:
 
     def _parse_query(self) -> QueryStmt:
         self._expect(TokenType.QUERY)
-        pred = self._parse_predicate()
+        conditions: list[Comparison] = []
+        pred = self._parse_predicate(conditions)
         self._expect(TokenType.FROM, "Expected 'FROM' in QUERY")
-        agent = self._expect(TokenType.STRING, "Expected agent string after FROM")
+        agent = self._expect_string("Expected agent string after FROM")
+        # v0.7: optional paging clauses, in this order
+        order_by, descending, limit, after = None, False, None, None
+        if self._match(TokenType.ORDER):
+            self._expect(TokenType.BY, "Expected 'BY' after ORDER")
+            order_by = self._expect(TokenType.IDENTIFIER, "Expected argument name after ORDER BY").value
+            direction = self._match(TokenType.ASC, TokenType.DESC)
+            descending = direction is not None and direction.type is TokenType.DESC
+        if self._match(TokenType.LIMIT):
+            tok = self._expect(TokenType.NUMBER, "Expected a number after LIMIT")
+            if not tok.value.isdigit() or int(tok.value) == 0:
+                raise ParseError("LIMIT must be a positive integer", tok)
+            limit = int(tok.value)
+        if self._match(TokenType.AFTER):
+            after = self._expect_string("Expected cursor string after AFTER")
         self._expect(TokenType.SEMICOLON, "Expected ';' after QUERY")
-        return QueryStmt(predicate=pred, from_agent=agent.value)
+        return QueryStmt(predicate=pred, from_agent=agent, conditions=conditions,
+                         order_by=order_by, descending=descending, limit=limit, after=after)
 
     def _parse_offer(self) -> OfferStmt:
         self._expect(TokenType.OFFER)
         self._expect(TokenType.ID, "Expected 'id' in OFFER")
         self._expect(TokenType.EQUALS, "Expected '=' after 'id'")
-        offer_id = self._expect(TokenType.STRING, "Expected offer id string")
+        offer_id = self._expect_string("Expected offer id string")
         self._expect(TokenType.TO, "Expected 'TO' in OFFER")
-        to_agent = self._expect(TokenType.STRING, "Expected agent string after TO")
+        to_agent = self._expect_string("Expected agent string after TO")
         self._expect(TokenType.LBRACE, "Expected '{' to open OFFER body")
         fields = self._parse_offer_fields()
         self._expect(TokenType.RBRACE, "Expected '}' to close OFFER body")
         # v0.7: Optional EXPIRES clause
         expires = None
         if self._match(TokenType.EXPIRES):
-            expires_tok = self._expect(TokenType.STRING, "Expected expiry string after EXPIRES")
-            expires = expires_tok.value
+            expires = self._expect_string("Expected expiry string after EXPIRES")
         self._expect(TokenType.SEMICOLON, "Expected ';' after OFFER")
-        return OfferStmt(offer_id=offer_id.value, to_agent=to_agent.value, fields=fields, expires=expires)
+        return OfferStmt(offer_id=offer_id, to_agent=to_agent, fields=fields, expires=expires,
+                         resolved_fields=self._fold_fields(fields))
 
     def _parse_counter(self) -> CounterStmt:
         """COUNTER "original_id" id="new_id" TO "agent" { ... } EXPIRES "duration";"""
         self._expect(TokenType.COUNTER)
-        original_id = self._expect(TokenType.STRING, "Expected original offer id string")
+        original_id = self._expect_string("Expected original offer id string")
         self._expect(TokenType.ID, "Expected 'id' in COUNTER")
         self._expect(TokenType.EQUALS, "Expected '=' after 'id'")
-        new_id = self._expect(TokenType.STRING, "Expected counter-offer id string")
+        new_id = self._expect_string("Expected counter-offer id string")
         self._expect(TokenType.TO, "Expected 'TO' in COUNTER")
-        to_agent = self._expect(TokenType.STRING, "Expected agent string after TO")
+        to_agent = self._expect_string("Expected agent string after TO")
         self._expect(TokenType.LBRACE, "Expected '{' to open COUNTER body")
         fields = self._parse_offer_fields()
         self._expect(TokenType.RBRACE, "Expected '}' to close COUNTER body")
         expires = None
         if self._match(TokenType.EXPIRES):
-            expires_tok = self._expect(TokenType.STRING, "Expected expiry string after EXPIRES")
-            expires = expires_tok.value
+            expires = self._expect_string("Expected expiry string after EXPIRES")
         self._expect(TokenType.SEMICOLON, "Expected ';' after COUNTER")
         return CounterStmt(
-            original_offer_id=original_id.value,
-            offer_id=new_id.value,
-            to_agent=to_agent.value,
+            original_offer_id=original_id,
+            offer_id=new_id,
+            to_agent=to_agent,
             fields=fields,
             expires=expires,
+            resolved_fields=self._fold_fields(fields),
         )
 
     def _parse_offer_fields(self) -> list[OfferField]:
@@ -157,9 +283,14 @@ class Parser:
             self._match(TokenType.COMMA)  # optional trailing comma
         return fields
 
+    def _fold_fields(self, fields: list[OfferField]) -> dict[str, Any] | None:
+        if not self.fold_constants:
+            return None
+        return fold_literals({f.key: f.value for f in fields})
+
     def _parse_accept(self) -> AcceptStmt:
         self._expect(TokenType.ACCEPT)
-        offer_id = self._expect(TokenType.STRING, "Expected offer id string")
+        offer_id = self._expect_string("Expected offer id string")
         # v0.7: Optional IF conditions
         conditions = None
         if self._match(TokenType.IF):
@@ -168,25 +299,23 @@ class Parser:
             while self._match(TokenType.COMMA):
                 conditions.append(self._parse_predicate())
         self._expect(TokenType.SEMICOLON, "Expected ';' after ACCEPT")
-        return AcceptStmt(offer_id=offer_id.value, conditions=conditions)
+        return AcceptStmt(offer_id=offer_id, conditions=conditions)
 
     def _parse_reject(self) -> RejectStmt:
         self._expect(TokenType.REJECT)
-        offer_id = self._expect(TokenType.STRING, "Expected offer id string")
+        offer_id = self._expect_string("Expected offer id string")
         reason = None
         if self._match(TokenType.REASON):
-            reason_tok = self._expect(TokenType.STRING, "Expected reason string")
-            reason = reason_tok.value
+            reason = self._expect_string("Expected reason string")
         self._expect(TokenType.SEMICOLON, "Expected ';' after REJECT")
-        return RejectStmt(offer_id=offer_id.value, reason=reason)
+        return RejectStmt(offer_id=offer_id, reason=reason)
 
     def _parse_commit(self) -> CommitStmt:
         self._expect(TokenType.COMMIT)
         pred = self._parse_predicate()
         deadline = None
         if self._match(TokenType.BY):
-            dl_tok = self._expect(TokenType.STRING, "Expected deadline string after BY")
-            deadline = dl_tok.value
+            deadline = self._expect_string("Expected deadline string after BY")
         self._expect(TokenType.SEMICOLON, "Expected ';' after COMMIT")
         return CommitStmt(predicate=pred, deadline=deadline)
 
@@ -198,17 +327,28 @@ class Parser:
 
     # ── predicate ───────────────────────────────────────
 
-    def _parse_predicate(self) -> Predicate:
+    def _parse_predicate(self, conditions: list[Comparison] | None = None) -> Predicate:
+        """Parse ``name(arg=value, ...)``. If a ``conditions`` list is given,
+        ``arg<value``-style comparisons are accepted and collected there."""
         name = self._expect(TokenType.IDENTIFIER, "Expected predicate name")
         self._expect(TokenType.LPAREN, "Expected '(' after predicate name")
         args: list[NamedArg] = []
         while not self._at(TokenType.RPAREN):
             arg_name = self._expect(TokenType.IDENTIFIER, "Expected argument name")
+            if conditions is not None:
+                op = self._match(*_COMPARISONS)
+                if op is not None:
+                    conditions.append(Comparison(arg_name.value, op.value, self._parse_value()))
+                    self._match(TokenType.COMMA)  # optional
+                    continue
             self._expect(TokenType.EQUALS, "Expected '=' after argument name")
             arg_val = self._parse_value()
             args.append(NamedArg(name=arg_name.value, value=arg_val))
             self._match(TokenType.COMMA)  # optional
         self._expect(TokenType.RPAREN, "Expected ')' to close predicate")
+        if self.fold_constants:
+            resolved = fold_literals({a.name: a.value for a in args})
+            return Predicate(name=name.value, args=args, resolved=resolved)
         return Predicate(name=name.value, args=args)
 
     # ── values ──────────────────────────────────────────
@@ -217,23 +357,23 @@ class Parser:
         tok = self._current()
 
         if tok.type == TokenType.STRING:
-            self.pos += 1
+            self._tok = self._pull()
             return StringVal(tok.value)
 
         if tok.type == TokenType.NUMBER:
-            self.pos += 1
+            self._tok = self._pull()
             return NumberVal(float(tok.value))
 
         if tok.type == TokenType.TRUE:
-            self.pos += 1
+            self._tok = self._pull()
             return BoolVal(True)
 
         if tok.type == TokenType.FALSE:
-            self.pos += 1
+            self._tok = self._pull()
             return BoolVal(False)
 
         if tok.type == TokenType.NULL:
-            self.pos += 1
+            self._tok = self._pull()
             return NullVal()
 
         if tok.type == TokenType.LBRACE:
@@ -242,6 +382,10 @@ class Parser:
         if tok.type == TokenType.LBRACKET:
             return self._parse_list()
 
+        if tok.type == TokenType.PLACEHOLDER and self.allow_placeholders:
+            self._tok = self._pull()
+            return self._placeholder(tok)
+
         raise ParseError(f"Expected a value, got {tok.type.name}", tok)
 
     def _parse_map(self) -> MapVal:
@@ -278,3 +422,558 @@ Parser._STMT_DISPATCH = {
     TokenType.COMMIT: Parser._parse_commit,
     TokenType.ACT: Parser._parse_act,
 }
+
+
+# ── Error recovery ──────────────────────────────────────
+
+def parse_recovering(source: str | TextIO | bytes | mmap.mmap) -> tuple[Program, list[LexerError | ParseError]]:
+    """Parse every well-formed statement and collect all errors in one pass.
+
+    Lexer errors skip the offending character; parse errors skip to the
+    next ';'. Errors are returned in source order.
+
+    Usage:
+        program, errors = parse_recovering(source)
+        for e in errors:
+            print(e)          # "[Line 3, Col 14] Expected argument name"
+    """
+    errors: list = []
+    tokens = Lexer(source).iter_tokens(skip_newlines=True, errors=errors)
+    program = Parser(tokens, errors=errors).parse()
+    errors.sort(key=error_position)
+    return program, errors
+
+
+def error_position(error: LexerError | ParseError) -> tuple[int, int]:
+    """(line, col) of a lexer or parse error."""
+    if isinstance(error, ParseError):
+        return error.token.line, error.token.col
+    return error.line, error.col
+
+
+# ── Constant folding ────────────────────────────────────
+
+# Every SUTRA value is a literal, so it can be turned into its Python value
+# once at parse time (same results as Interpreter._VALUE_RESOLVERS)
+_LITERALS = {
+    StringVal: lambda n: n.value,
+    NumberVal: lambda n: n.value,
+    BoolVal: lambda n: n.value,
+    NullVal: lambda n: None,
+    MapVal: lambda n: {k: literal_value(v) for k, v in n.entries.items()},
+    ListVal: lambda n: [literal_value(i) for i in n.items],
+}
+
+
+def literal_value(node: Any) -> Any:
+    """Python value of a literal value node."""
+    return _LITERALS[type(node)](node)
+
+
+# Folded values are shared by every execution of a cached Program, and
+# executions copy them with dict(): only immutable values may be shared
+_SCALAR_LITERALS = (StringVal, NumberVal, BoolVal, NullVal)
+
+
+def fold_literals(nodes: dict[str, Any]) -> dict[str, Any] | None:
+    """Python values of ``nodes``, or None if any is a list or map.
+
+    A list or map is resolved afresh on each execution instead, so an
+    agent that mutates a stored value cannot change the cached Program.
+    """
+    if not all(type(n) in _SCALAR_LITERALS for n in nodes.values()):
+        return None
+    return {k: literal_value(n) for k, n in nodes.items()}
+
+
+# ── Incremental parsing ─────────────────────────────────
+
+class ProgramStream:
+    """A Program whose statements are parsed on demand.
+
+    ``headers`` is parsed up front; ``statements`` is a one-shot iterator,
+    so Interpreter.execute can start on the first statement before the
+    rest of the source has been read or parsed.
+    """
+
+    def __init__(self, parser: Parser):
+        self.headers = parser.parse_headers()
+        self.statements = parser.iter_statements()
+
+
+def parse_stream(source: str | TextIO | bytes | mmap.mmap) -> ProgramStream:
+    """Incrementally parse SUTRA from a string, text file or UTF-8 buffer.
+
+    Usage:
+        with open("knowledge.sutra", encoding="utf-8") as f:
+            Interpreter(agent).execute(parse_stream(f))
+    """
+    return ProgramStream(Parser(Lexer(source).iter_tokens(skip_newlines=True)))
+
+
+# ── Templates ───────────────────────────────────────────
+
+class TemplateError(Exception):
+    """Raised when a template is compiled or bound incorrectly."""
+    pass
+
+
+def value_node(value: Any):
+    """Convert a Python value into the AST value node the parser would build.
+
+    Numbers become floats, exactly as ``NumberVal(float(token))`` does.
+    Raises TemplateError for values SUTRA cannot express (sets, NaN, ...).
+    """
+    if value is None:
+        return NullVal()
+    if isinstance(value, bool):
+        return BoolVal(value)
+    if isinstance(value, (int, float)):
+        number = float(value)
+        if not math.isfinite(number):
+            raise TemplateError(f"Cannot bind non-finite number {value!r}")
+        return NumberVal(number)
+    if isinstance(value, str):
+        return StringVal(value)
+    if isinstance(value, dict):
+        return MapVal(entries={str(k): value_node(v) for k, v in value.items()})
+    if isinstance(value, (list, tuple)):
+        return ListVal(items=[value_node(v) for v in value])
+    raise TemplateError(f"Cannot bind value of type {type(value).__name__}")
+
+
+_SOURCE_ESCAPES = str.maketrans({"\\": "\\\\", '"': '\\"', "\n": "\\n", "\t": "\\t"})
+
+
+def value_source(node: Any) -> str:
+    """SUTRA source text that parses back to the value node ``node``."""
+    t = type(node)
+    if t is StringVal:
+        return f'"{node.value.translate(_SOURCE_ESCAPES)}"'
+    if t is NumberVal:
+        v = node.value
+        if v.is_integer():
+            return str(int(v))
+        text = repr(v)
+        # The lexer reads plain decimals only, never exponents
+        return format(Decimal(text), "f") if "e" in text else text
+    if t is BoolVal:
+        return "true" if node.value else "false"
+    if t is NullVal:
+        return "null"
+    if t is MapVal:
+        return "{" + ", ".join(f"{k}: {value_source(v)}" for k, v in node.entries.items()) + "}"
+    if t is ListVal:
+        return "[" + ", ".join(value_source(i) for i in node.items) + "]"
+    raise TemplateError(f"Not a value node: {node!r}")
+
+
+def _compile_binder(node: Any):
+    """Return ``fn(values) -> bound node`` for a node containing placeholders,
+    or None if the node has none and can be shared as-is."""
+    if isinstance(node, Placeholder):
+        key = node.key
+        if node.as_string:
+            def bind_string(values):
+                value = values[key]
+                if not isinstance(value, str):
+                    raise TemplateError(
+                        f"Placeholder {key!r} expects a string, got {type(value).__name__}"
+                    )
+                return value
+            return bind_string
+        return lambda values: value_node(values[key])
+
+    if isinstance(node, list):
+        binders = [_compile_binder(item) for item in node]
+        if not any(binders):
+            return None
+        return lambda values: [b(values) if b else item for item, b in zip(node, binders)]
+
+    if isinstance(node, dict):
+        binders = {k: _compile_binder(v) for k, v in node.items()}
+        if not any(binders.values()):
+            return None
+        return lambda values: {
+            k: binders[k](values) if binders[k] else v for k, v in node.items()
+        }
+
+    if is_dataclass(node):
+        cls = type(node)
+        static: dict[str, Any] = {}
+        dynamic: list[tuple[str, Any]] = []
+        for f in fields(node):
+            val = getattr(node, f.name)
+            binder = _compile_binder(val)
+            if binder is None:
+                static[f.name] = val
+            else:
+                dynamic.append((f.name, binder))
+        if not dynamic:
+            return None
+        return lambda values: cls(**static, **{name: b(values) for name, b in dynamic})
+
+    return None
+
+
+def _collect_keys(node: Any, keys: set):
+    if isinstance(node, Placeholder):
+        keys.add(node.key)
+    elif isinstance(node, list):
+        for item in node:
+            _collect_keys(item, keys)
+    elif isinstance(node, dict):
+        for item in node.values():
+            _collect_keys(item, keys)
+    elif is_dataclass(node):
+        for f in fields(node):
+            _collect_keys(getattr(node, f.name), keys)
+
+
+class Template:
+    """A SUTRA skeleton compiled once and bound to values many times.
+
+    Placeholders are ``?`` (positional, numbered left to right) or ``?name``.
+    They may stand for any value, or for the string literals of offer ids,
+    agents, EXPIRES/BY/REASON clauses. Binding builds a Program directly:
+    statements without placeholders are shared between bindings and only
+    the slots are rebuilt, with no lexing or parsing.
+
+    Usage:
+        offer = Template('OFFER id=? TO ? { give: {money: ?} };')
+        program = offer.bind("o-1", "seller", 50000)
+        Interpreter(agent).execute(program)
+    """
+
+    def __init__(self, source: str):
+        parser = Parser(Lexer(source).iter_tokens(skip_newlines=True), allow_placeholders=True)
+        program = parser.parse()
+        self.source = source
+        self.headers = tuple(program.headers)
+        self._statements = tuple(program.statements)
+        self._binders = tuple(_compile_binder(stmt) for stmt in self._statements)
+        keys: set = set()
+        _collect_keys(program.statements, keys)
+        self.positional = parser._positional
+        self.names = frozenset(k for k in keys if isinstance(k, str))
+
+    def bind(self, *args: Any, **kwargs: Any) -> Program:
+        """Return a Program with every placeholder replaced by its value."""
+        if len(args) != self.positional:
+            raise TemplateError(
+                f"Template takes {self.positional} positional value(s), got {len(args)}"
+            )
+        missing = self.names - kwargs.keys()
+        if missing:
+            raise TemplateError(f"Missing template value(s): {', '.join(sorted(missing))}")
+        values: dict[int | str, Any] = dict(enumerate(args))
+        values.update(kwargs)
+        statements = [
+            binder(values) if binder else stmt
+            for stmt, binder in zip(self._statements, self._binders)
+        ]
+        return Program(headers=self.headers, statements=statements)
+
+
+# ── Binary programs ─────────────────────────────────────
+#
+# A parsed Program can be stored pre-compiled ("sutra compile") and loaded
+# without lexing or parsing. Layout (all integers little-endian):
+#
+#   MAGIC, u8 version, then zlib-compressed:
+#   u32 n_strings, u32 text_bytes, u32 n_numbers, u32 n_code
+#   u32[n_strings]   string lengths (in characters)
+#   text_bytes       all strings, UTF-8, concatenated
+#   f64[n_numbers]   number table
+#   u32[n_code]      opcode stream; operands are table indexes or counts
+#
+# Strings and numbers are deduplicated into the tables, so repeated
+# predicate names, keys and values are stored once.
+
+COMPILED_MAGIC = b"SUTRA\x00"
+COMPILED_VERSION = 1
+
+_NONE = 0xFFFFFFFF  # absent optional string
+
+# Statement opcodes (_OP_END terminates the stream)
+_OP_END = 0
+_OP_INTENT, _OP_FACT, _OP_QUERY, _OP_OFFER, _OP_COUNTER = 1, 2, 3, 4, 5
+_OP_ACCEPT, _OP_REJECT, _OP_COMMIT, _OP_ACT = 6, 7, 8, 9
+_OP_QUERY_WHERE = 10  # QUERY with comparison args (v0.7)
+_OP_QUERY_PAGE = 11   # QUERY with ORDER BY / LIMIT / AFTER (v0.7)
+# Value opcodes
+_V_STR, _V_NUM, _V_TRUE, _V_FALSE, _V_NULL, _V_MAP, _V_LIST = 1, 2, 3, 4, 5, 6, 7
+
+_SIMPLE_PRED_OPS = {IntentStmt: _OP_INTENT, FactStmt: _OP_FACT, ActStmt: _OP_ACT}
+
+
+class CompiledFormatError(Exception):
+    """Raised for malformed or unsupported compiled SUTRA data."""
+    pass
+
+
+def is_compiled(data: bytes | mmap.mmap) -> bool:
+    """True if ``data`` starts with the compiled-program magic."""
+    return data[:len(COMPILED_MAGIC)] == COMPILED_MAGIC
+
+
+def _u32_array(values: list[int] | bytes) -> array:
+    arr = array("I")
+    if isinstance(values, list):
+        arr.extend(values)
+    else:
+        arr.frombytes(values)
+    if sys.byteorder == "big":
+        arr.byteswap()
+    return arr
+
+
+def dump_program(program: Program) -> bytes:
+    """Encode a Program in the compiled binary format."""
+    strings: dict[str, int] = {}
+    numbers: dict[float | str, int] = {}
+    code: list[int] = []
+    emit = code.append
+
+    def s(value: str | None) -> int:
+        if value is None:
+            return _NONE
+        if not isinstance(value, str):
+            raise CompiledFormatError(f"Cannot compile {type(value).__name__} where a string is expected")
+        idx = strings.get(value)
+        if idx is None:
+            idx = strings[value] = len(strings)
+        return idx
+
+    def value(node):
+        t = type(node)
+        if t is StringVal:
+            emit(_V_STR); emit(s(node.value))
+        elif t is NumberVal:
+            # str key keeps -0.0 apart from 0.0 (they compare equal)
+            key = node.value if node.value else str(node.value)
+            idx = numbers.get(key)
+            if idx is None:
+                idx = numbers[key] = len(numbers)
+            emit(_V_NUM); emit(idx)
+        elif t is BoolVal:
+            emit(_V_TRUE if node.value else _V_FALSE)
+        elif t is NullVal:
+            emit(_V_NULL)
+        elif t is MapVal:
+            emit(_V_MAP); emit(len(node.entries))
+            for k, v in node.entries.items():
+                emit(s(k)); value(v)
+        elif t is ListVal:
+            emit(_V_LIST); emit(len(node.items))
+            for v in node.items:
+                value(v)
+        else:
+            raise CompiledFormatError(f"Cannot compile value node {t.__name__}")
+
+    def pred(p: Predicate):
+        emit(s(p.name)); emit(len(p.args))
+        for a in p.args:
+            emit(s(a.name)); value(a.value)
+
+    def offer_fields(flds: list[OfferField]):
+        emit(len(flds))
+        for f in flds:
+            emit(s(f.key)); value(f.value)
+
+    emit(len(program.headers))
+    for h in program.headers:
+        emit(s(h.key)); emit(s(h.value))
+
+    for stmt in program.statements:
+        t = type(stmt)
+        op = _SIMPLE_PRED_OPS.get(t)
+        if op is not None:
+            emit(op); pred(stmt.predicate)
+        elif t is QueryStmt:
+            paged = (stmt.order_by is not None or stmt.limit is not None
+                     or stmt.after is not None)
+            if not stmt.conditions and not paged:
+                emit(_OP_QUERY); pred(stmt.predicate); emit(s(stmt.from_agent))
+                continue
+            emit(_OP_QUERY_PAGE if paged else _OP_QUERY_WHERE)
+            pred(stmt.predicate); emit(s(stmt.from_agent))
+            emit(len(stmt.conditions))
+            for c in stmt.conditions:
+                emit(s(c.name)); emit(s(c.op)); value(c.value)
+            if paged:
+                if stmt.limit is not None and not 0 < stmt.limit < _NONE:
+                    raise CompiledFormatError(f"Cannot compile LIMIT {stmt.limit}")
+                emit(s(stmt.order_by)); emit(int(stmt.descending))
+                emit(_NONE if stmt.limit is None else stmt.limit); emit(s(stmt.after))
+        elif t is OfferStmt:
+            emit(_OP_OFFER); emit(s(stmt.offer_id)); emit(s(stmt.to_agent)); emit(s(stmt.expires))
+            offer_fields(stmt.fields)
+        elif t is CounterStmt:
+            emit(_OP_COUNTER); emit(s(stmt.original_offer_id)); emit(s(stmt.offer_id))
+            emit(s(stmt.to_agent)); emit(s(stmt.expires))
+            offer_fields(stmt.fields)
+        elif t is AcceptStmt:
+            emit(_OP_ACCEPT); emit(s(stmt.offer_id))
+            if stmt.conditions is None:
+                emit(_NONE)
+            else:
+                emit(len(stmt.conditions))
+                for c in stmt.conditions:
+                    pred(c)
+        elif t is RejectStmt:
+            emit(_OP_REJECT); emit(s(stmt.offer_id)); emit(s(stmt.reason))
+        elif t is CommitStmt:
+            emit(_OP_COMMIT); pred(stmt.predicate); emit(s(stmt.deadline))
+        else:
+            raise CompiledFormatError(f"Cannot compile statement {t.__name__}")
+    emit(_OP_END)
+
+    table = list(strings)
+    text = "".join(table).encode("utf-8")
+    nums = array("d", [float(k) for k in numbers])
+    if sys.byteorder == "big":
+        nums.byteswap()
+    body = b"".join([
+        struct.pack("<IIII", len(table), len(text), len(nums), len(code)),
+        _u32_array([len(x) for x in table]).tobytes(),
+        text,
+        nums.tobytes(),
+        _u32_array(code).tobytes(),
+    ])
+    return COMPILED_MAGIC + bytes([COMPILED_VERSION]) + zlib.compress(body)
+
+
+def load_program(data: bytes | mmap.mmap) -> Program:
+    """Decode a Program written by ``dump_program`` — no lexing or parsing."""
+    if not is_compiled(data):
+        raise CompiledFormatError("Not a compiled SUTRA program")
+    pos = len(COMPILED_MAGIC)
+    version = data[pos:pos + 1]
+    if version != bytes([COMPILED_VERSION]):
+        raise CompiledFormatError(f"Unsupported compiled format version {version!r}")
+    try:
+        data = zlib.decompress(data[pos + 1:])
+        n_strings, text_len, n_numbers, n_code = struct.unpack_from("<IIII", data, 0)
+        pos = 16
+        lengths = _u32_array(data[pos:pos + 4 * n_strings]).tolist()
+        pos += 4 * n_strings
+        text = data[pos:pos + text_len].decode("utf-8")
+        pos += text_len
+        nums = array("d")
+        nums.frombytes(data[pos:pos + 8 * n_numbers])
+        if sys.byteorder == "big":
+            nums.byteswap()
+        N = nums.tolist()
+        pos += 8 * n_numbers
+        code = _u32_array(data[pos:pos + 4 * n_code]).tolist()
+    except (zlib.error, struct.error, ValueError, UnicodeDecodeError) as e:
+        raise CompiledFormatError(f"Corrupt compiled program: {e}") from None
+    if len(code) != n_code or len(N) != n_numbers or len(lengths) != n_strings:
+        raise CompiledFormatError("Corrupt compiled program: truncated")
+
+    intern = sys.intern
+    S: list[str] = []
+    offset = 0
+    for n in lengths:
+        S.append(intern(text[offset:offset + n]))
+        offset += n
+
+    nxt = iter(code).__next__
+
+    def opt():
+        idx = nxt()
+        return None if idx == _NONE else S[idx]
+
+    def value(op=None):
+        if op is None:
+            op = nxt()
+        if op == _V_STR:
+            return StringVal(S[nxt()])
+        if op == _V_NUM:
+            return NumberVal(N[nxt()])
+        if op == _V_TRUE:
+            return BoolVal(True)
+        if op == _V_FALSE:
+            return BoolVal(False)
+        if op == _V_NULL:
+            return NullVal()
+        if op == _V_MAP:
+            return MapVal(entries={S[nxt()]: value() for _ in range(nxt())})
+        if op == _V_LIST:
+            return ListVal(items=[value() for _ in range(nxt())])
+        raise CompiledFormatError(f"Unknown value opcode {op}")
+
+    def pred(V_STR=_V_STR, V_NUM=_V_NUM):
+        # Hot path: scalar args are decoded inline
+        name = S[nxt()]
+        args = []
+        append = args.append
+        for _ in range(nxt()):
+            key = S[nxt()]
+            op = nxt()
+            if op == V_STR:
+                append(NamedArg(key, StringVal(S[nxt()])))
+            elif op == V_NUM:
+                append(NamedArg(key, NumberVal(N[nxt()])))
+            else:
+                append(NamedArg(key, value(op)))
+        return Predicate(name, args)
+
+    def offer_fields():
+        return [OfferField(S[nxt()], value()) for _ in range(nxt())]
+
+    def counter():
+        original, offer_id, to_agent, expires = S[nxt()], S[nxt()], S[nxt()], opt()
+        return CounterStmt(original, offer_id, to_agent, offer_fields(), expires)
+
+    def accept():
+        offer_id = S[nxt()]
+        n = nxt()
+        return AcceptStmt(offer_id, None if n == _NONE else [pred() for _ in range(n)])
+
+    def offer():
+        offer_id, to_agent, expires = S[nxt()], S[nxt()], opt()
+        return OfferStmt(offer_id, to_agent, offer_fields(), expires)
+
+    def query_where():
+        predicate, from_agent = pred(), S[nxt()]
+        conditions = [Comparison(S[nxt()], S[nxt()], value()) for _ in range(nxt())]
+        return QueryStmt(predicate, from_agent, conditions)
+
+    def query_page():
+        stmt = query_where()
+        stmt.order_by, stmt.descending = opt(), bool(nxt())
+        limit = nxt()
+        stmt.limit = None if limit == _NONE else limit
+        stmt.after = opt()
+        return stmt
+
+    decoders = {
+        _OP_INTENT: lambda: IntentStmt(pred()),
+        _OP_FACT: lambda: FactStmt(pred()),
+        _OP_QUERY: lambda: QueryStmt(pred(), S[nxt()]),
+        _OP_OFFER: offer,
+        _OP_COUNTER: counter,
+        _OP_ACCEPT: accept,
+        _OP_REJECT: lambda: RejectStmt(S[nxt()], opt()),
+        _OP_COMMIT: lambda: CommitStmt(pred(), opt()),
+        _OP_ACT: lambda: ActStmt(pred()),
+        _OP_QUERY_WHERE: query_where,
+        _OP_QUERY_PAGE: query_page,
+    }
+
+    try:
+        headers = [Header(S[nxt()], S[nxt()]) for _ in range(nxt())]
+        statements = []
+        append = statements.append
+        while (op := nxt()) != _OP_END:
+            decode = decoders.get(op)
+            if decode is None:
+                raise CompiledFormatError(f"Unknown statement opcode {op}")
+            append(decode())
+    except StopIteration:
+        raise CompiledFormatError("Corrupt compiled program: truncated") from None
+    except IndexError:
+        raise CompiledFormatError("Corrupt compiled program: bad table index") from None
+    return Program(headers=headers, statements=statements)
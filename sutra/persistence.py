@@ -48,7 +48,8 @@ def _serialize_agent(agent: Agent) -> dict:
         "version": "0.6.0",
         "saved_at": time.time(),
         "belief_base": [
-            {"predicate": f.predicate, "args": f.args, "timestamp": f.timestamp}
+            {"predicate": f.predicate, "args": f.args, "timestamp": f.timestamp,
+             "expires_at": f.expires_at}
             for f in agent.belief_base
         ],
         "goal_set": [
@@ -86,8 +87,7 @@ def _serialize_agent(agent: Agent) -> dict:
             for a in agent.action_queue
         ],
         "message_log": [
-            {"event": le.event, "detail": le.detail, "timestamp": le.timestamp}
-            for le in agent.message_log
+            le.to_dict() for le in agent.message_log
         ],
     }
 
@@ -97,7 +97,8 @@ def _deserialize_agent(data: dict, keypair=None) -> Agent:
     agent = Agent(data["agent_id"], keypair=keypair)
 
     for f in data.get("belief_base", []):
-        fact = Fact(predicate=f["predicate"], args=f["args"], timestamp=f.get("timestamp", 0))
+        fact = Fact(predicate=f["predicate"], args=f["args"], timestamp=f.get("timestamp", 0),
+                    expires_at=f.get("expires_at"))
         agent.belief_base.append(fact)
 
     for i in data.get("goal_set", []):
@@ -188,6 +189,7 @@ class StateStore:
         path = self._path(agent.agent_id)
         backup = self._backup_path(agent.agent_id)
 
+        agent.expire_facts()  # don't persist facts past their TTL
         data = _serialize_agent(agent)
         content = json.dumps(data, indent=2, ensure_ascii=False)
 
@@ -16,6 +16,14 @@ v0.6 hardening:
   - Replay protection (nonces on every message)
   - Message ordering (per-pair sequence numbers)
   - Transaction-safe execution (rollback on failure)
+
+v0.7: send() and ask() run as one MultiAgentTransaction over the target
+and the sender — execution, bilateral sync and auto-reply commit or roll
+back together. Each agent has its own lock, so exchanges between
+disjoint pairs of agents do not wait on each other.
+
+v0.7: With ``group_commit`` options, concurrent send()s to the same agent
+are batched into one transaction per batch (see GroupCommit).
 """
 
 from __future__ import annotations
@@ -25,13 +33,20 @@ import threading
 from typing import Callable, Any
 
 from .agent import Agent
-from .message import SutraMessage, _format_sutra_value
-from .lexer import Lexer
-from .parser import Parser
+from .message import SutraMessage
+from .cache import PROGRAM_CACHE
 from .interpreter import Interpreter
-from .ast_nodes import Program, QueryStmt, OfferStmt, CounterStmt
+from .ast_nodes import (
+    Program, QueryStmt, OfferStmt, CounterStmt, FactStmt, Predicate, NamedArg, OfferField,
+    StringVal,
+)
+from .parser import Template, TemplateError, value_node, value_source
 from .security import ReplayGuard, SequenceTracker
-from .transaction import SutraTransaction
+from .transaction import GroupCommit, MultiAgentTransaction
+
+# v0.7: Fixed-shape auto-replies, compiled once and bound per reply
+_ACCEPT_TEMPLATE = Template('ACCEPT ?;')
+_REJECT_TEMPLATE = Template('REJECT ? REASON ?;')
 
 
 class AgentNotFound(Exception):
@@ -62,7 +77,8 @@ class SutraRuntime:
         rt.print_transcript()
     """
 
-    def __init__(self, hardened: bool = False, ask_timeout_s: float = 5.0):
+    def __init__(self, hardened: bool = False, ask_timeout_s: float = 5.0,
+                 tx_strategy: str = "snapshot", group_commit: dict | None = None):
         self.agents: dict[str, Agent] = {}
         self.transcript: list[SutraMessage] = []
         self._offer_evaluators: dict[str, Callable] = {}
@@ -73,6 +89,14 @@ class SutraRuntime:
         self._seq_tracker = SequenceTracker() if hardened else None
         self._waiting_on: dict[str, str] = {}  # agent → waiting_for_agent (deadlock detection)
         self._lock = threading.Lock()
+        # v0.7: SutraTransaction strategy for message execution ("snapshot" | "undo")
+        self.tx_strategy = tx_strategy
+        # v0.7: per-agent locks held by MultiAgentTransaction
+        self._agent_locks: dict[str, threading.RLock] = {}
+        # v0.7: GroupCommit options for send() (max_batch, max_delay_s,
+        # on_flush, ...), None to run each message on its own
+        self.group_commit = group_commit
+        self._groups: dict[str, GroupCommit] = {}
 
     # ── Agent lifecycle ─────────────────────────────────
 
@@ -90,6 +114,9 @@ class SutraRuntime:
             raise AgentNotFound(agent_id)
         del self.agents[agent_id]
         self._offer_evaluators.pop(agent_id, None)
+        with self._lock:
+            self._agent_locks.pop(agent_id, None)
+            self._groups.pop(agent_id, None)
 
     def get(self, agent_id: str) -> Agent:
         """Get an agent by ID."""
@@ -129,22 +156,23 @@ class SutraRuntime:
             seq = self._seq_tracker.next_seq(from_id, to_id)
 
         target = self.agents[to_id]
+        sender = self.agents.get(from_id)
         program = self._parse(body)
 
-        # v0.6: Transaction-safe execution
-        tx = SutraTransaction(target)
-        tx.begin()
-        try:
-            interp = Interpreter(target)
-            responses = interp.execute(program)
-            tx.commit()
-        except Exception:
-            tx.rollback()
-            raise
+        sync = sender is not None and from_id != to_id and bool(self._sync_statements(program))
+        if self.group_commit is not None and not sync:
+            # v0.7: target-only message: batched with concurrent sends
+            responses = self._group(target).submit(program)
+        else:
+            # v0.6: Transaction-safe execution
+            # v0.7: target and sender commit or roll back together
+            with self._transaction(target, sender):
+                interp = Interpreter(target)
+                responses = interp.execute(program)
 
-        # Bilateral: sync OFFERs to sender's ledger too
-        if from_id in self.agents and from_id != to_id:
-            self._bilateral_sync(program, self.agents[from_id])
+                # Bilateral: sync OFFERs to sender's ledger too
+                if sync:
+                    self._bilateral_sync(program, sender)
 
         msg = SutraMessage(
             from_agent=from_id,
@@ -199,27 +227,39 @@ class SutraRuntime:
             program = self._parse(body)
 
             # v0.6: Transaction-safe execution on target
-            tx = SutraTransaction(target)
-            tx.begin()
-            try:
+            # v0.7: the whole round trip is one transaction over target and
+            # sender; the transcript is only written once it has committed
+            with self._transaction(target, sender):
                 interp = Interpreter(target)
                 responses = interp.execute(program)
-                tx.commit()
-            except Exception:
-                tx.rollback()
-                raise
 
-            # Bilateral: sync OFFERs to sender's ledger
-            if sender and from_id != to_id:
-                self._bilateral_sync(program, sender)
+                # Bilateral: sync OFFERs to sender's ledger
+                if sender and from_id != to_id:
+                    self._bilateral_sync(program, sender)
 
-            # v0.6: Timeout check
-            if self.hardened:
-                elapsed = time.monotonic() - start_time
-                if elapsed > self.ask_timeout_s:
-                    raise TimeoutError(
-                        f"ask() timed out: {elapsed:.1f}s > {self.ask_timeout_s}s"
-                    )
+                # v0.6: Timeout check
+                if self.hardened:
+                    elapsed = time.monotonic() - start_time
+                    if elapsed > self.ask_timeout_s:
+                        raise TimeoutError(
+                            f"ask() timed out: {elapsed:.1f}s > {self.ask_timeout_s}s"
+                        )
+
+                # Generate auto-response (built as an AST, never re-parsed)
+                reply = self._auto_respond(program, target, from_id)
+                reply_responses = []
+
+                if reply:
+                    reply_body, reply_program = reply
+
+                    # Execute response on target (update target's state)
+                    target_ri = Interpreter(target, responses=False)
+                    target_ri.execute(reply_program)
+
+                    # Execute response on sender (sender sees the result)
+                    if sender:
+                        sender_ri = Interpreter(sender)
+                        reply_responses = sender_ri.execute(reply_program)
 
             msg = SutraMessage(
                 from_agent=from_id,
@@ -230,24 +270,9 @@ class SutraRuntime:
                 sequence=seq,
             )
             self.transcript.append(msg)
-
-            # Generate auto-response
-            reply_body = self._auto_respond(program, target, from_id)
             reply_msg = None
 
-            if reply_body:
-                reply_program = self._parse(reply_body)
-
-                # Execute response on target (update target's state)
-                target_ri = Interpreter(target)
-                target_ri.execute(reply_program)
-
-                # Execute response on sender (sender sees the result)
-                reply_responses = []
-                if sender:
-                    sender_ri = Interpreter(sender)
-                    reply_responses = sender_ri.execute(reply_program)
-
+            if reply:
                 reply_msg = SutraMessage(
                     from_agent=to_id,
                     to_agent=from_id,
@@ -303,13 +328,38 @@ class SutraRuntime:
 
     # ── Internal helpers ────────────────────────────────
 
+    def _agent_lock(self, agent_id: str) -> threading.RLock:
+        lock = self._agent_locks.get(agent_id)
+        if lock is None:
+            with self._lock:
+                lock = self._agent_locks.setdefault(agent_id, threading.RLock())
+        return lock
+
+    def _transaction(self, *agents: Agent | None) -> MultiAgentTransaction:
+        """Two-phase transaction over the given agents (None entries skipped)."""
+        return MultiAgentTransaction([a for a in agents if a is not None],
+                                     locks=self._agent_lock, strategy=self.tx_strategy)
+
+    def _group(self, agent: Agent) -> GroupCommit:
+        group = self._groups.get(agent.agent_id)
+        if group is None:
+            lock = self._agent_lock(agent.agent_id)
+            with self._lock:
+                group = self._groups.get(agent.agent_id)
+                if group is None:
+                    options = {"strategy": self.tx_strategy, **self.group_commit}
+                    group = GroupCommit(agent, lock=lock, **options)
+                    self._groups[agent.agent_id] = group
+        return group
+
     @staticmethod
     def _parse(body: str) -> Program:
-        """Parse SUTRA source into an AST."""
-        lexer = Lexer(body)
-        tokens = lexer.tokenize()
-        parser = Parser(tokens)
-        return parser.parse()
+        """Parse SUTRA source into an AST (shared, read-only; see sutra.cache)."""
+        return PROGRAM_CACHE.parse(body)
+
+    @staticmethod
+    def _sync_statements(program: Program) -> list:
+        return [s for s in program.statements if isinstance(s, (OfferStmt, CounterStmt))]
 
     def _bilateral_sync(self, program: Program, sender: Agent):
         """Execute OFFER/COUNTER statements on sender to keep bilateral state.
@@ -317,56 +367,82 @@ class SutraRuntime:
         When buyer sends an OFFER or COUNTER to seller, both should have the
         offer in their ledger. This syncs the sender's copy.
         """
-        sync_stmts = [s for s in program.statements if isinstance(s, (OfferStmt, CounterStmt))]
+        sync_stmts = self._sync_statements(program)
         if sync_stmts:
             mini = Program(headers=program.headers, statements=sync_stmts)
-            mini_interp = Interpreter(sender)
+            mini_interp = Interpreter(sender, responses=False)
             mini_interp.execute(mini)
 
-    def _auto_respond(self, program: Program, target: Agent, from_id: str) -> str | None:
+    def _auto_respond(self, program: Program, target: Agent, from_id: str) -> tuple[str, Program] | None:
         """Generate SUTRA auto-response based on incoming statements.
 
         - QUERY → matching FACTs from target's belief_base
         - OFFER/COUNTER → ACCEPT/REJECT/COUNTER via registered evaluator
+
+        Returns (reply_body, reply_program): the wire text for the transcript
+        and the equivalent Program, built directly so it is never re-parsed.
         """
         # First, expire any stale offers
         target.expire_offers()
 
         response_lines = []
+        statements = []
 
         for stmt in program.statements:
             if isinstance(stmt, QueryStmt):
                 resp = self._respond_to_query(target, stmt)
-                if resp:
-                    response_lines.append(resp)
             elif isinstance(stmt, (OfferStmt, CounterStmt)):
                 resp = self._respond_to_offer(target, stmt, from_id)
-                if resp:
-                    response_lines.append(resp)
+            else:
+                continue
+            if resp:
+                response_lines.append(resp[0])
+                statements.extend(resp[1])
 
-        return "\n".join(response_lines) if response_lines else None
+        if not response_lines:
+            return None
+        return "\n".join(response_lines), Program(headers=[], statements=statements)
 
     @staticmethod
-    def _respond_to_query(agent: Agent, stmt: QueryStmt) -> str | None:
+    def _respond_to_query(agent: Agent, stmt: QueryStmt) -> tuple[str, list] | None:
         """Auto-respond to QUERY with matching FACTs from belief_base."""
-        args = {
-            a.name: Interpreter._resolve_value(a.value)
-            for a in stmt.predicate.args
-        }
-        results = agent.query_facts(stmt.predicate.name, args)
+        args = stmt.predicate.resolved
+        if args is None:
+            args = {
+                a.name: Interpreter._resolve_value(a.value)
+                for a in stmt.predicate.args
+            }
+        results, cursor = Interpreter._run_query(
+            agent, stmt, args, Interpreter._query_conditions(stmt)
+        )
 
         if not results:
             return None
 
         lines = []
+        statements = []
         for fact in results:
-            args_str = ", ".join(
-                f"{k}={_format_sutra_value(v)}" for k, v in fact.args.items()
-            )
+            try:
+                args = [NamedArg(name=k, value=value_node(v)) for k, v in fact.args.items()]
+            except TemplateError:
+                continue  # set through the API with a value SUTRA cannot express
+            # The wire text is rendered from the same nodes the asker executes
+            args_str = ", ".join(f"{a.name}={value_source(a.value)}" for a in args)
             lines.append(f"FACT {fact.predicate}({args_str});")
-        return "\n".join(lines)
+            statements.append(FactStmt(predicate=Predicate(name=fact.predicate, args=args)))
+        if cursor is not None:
+            # Comment line: the asker re-sends the QUERY with this AFTER clause
+            lines.append(f'// more: AFTER "{cursor}"')
+        if not lines:
+            return None
+        return "\n".join(lines), statements
 
-    def _respond_to_offer(self, agent: Agent, stmt, from_id: str) -> str | None:
+    @staticmethod
+    def _reject(offer_id: str, reason: str) -> tuple[str, list]:
+        text = f'REJECT {value_source(StringVal(offer_id))} REASON {value_source(StringVal(reason))};'
+        return text, _REJECT_TEMPLATE.bind(offer_id, reason).statements
+
+    def _respond_to_offer(self, agent: Agent, stmt, from_id: str) -> tuple[str, list] | None:
         """Auto-respond to OFFER/COUNTER using registered evaluator.
 
         Evaluator return values:
@@ -378,39 +454,43 @@ class SutraRuntime:
         if evaluator is None:
             return None
 
-        fields = {}
-        for f in stmt.fields:
-            fields[f.key] = Interpreter._resolve_value(f.value)
+        fields = Interpreter._offer_fields(stmt)
 
         try:
             result = evaluator(agent, stmt.offer_id, from_id, fields)
         except Exception as e:
             # Safety: evaluator exceptions should not crash the runtime
-            return f'REJECT "{stmt.offer_id}" REASON "evaluator error: {str(e)[:100]}";'
+            return self._reject(stmt.offer_id, f"evaluator error: {str(e)[:100]}")
 
         if not result:
             return None
 
         if result == "accept":
-            return f'ACCEPT "{stmt.offer_id}";'
+            return (f'ACCEPT {value_source(StringVal(stmt.offer_id))};',
+                    _ACCEPT_TEMPLATE.bind(stmt.offer_id).statements)
         elif result.startswith("reject:"):
             reason = result.split(":", 1)[1]
-            return f'REJECT "{stmt.offer_id}" REASON "{reason}";'
+            return self._reject(stmt.offer_id, reason)
         elif result.startswith("counter:"):
             # Parse counter-offer fields from evaluator response
             import json as _json
             try:
                 counter_fields = _json.loads(result.split(":", 1)[1])
                 counter_id = f"counter-{stmt.offer_id}"
-                field_str = ", ".join(
-                    f'{k}: {_format_sutra_value(v)}' for k, v in counter_fields.items()
+                counter = CounterStmt(
+                    original_offer_id=stmt.offer_id,
+                    offer_id=counter_id,
+                    to_agent=from_id,
+                    fields=[OfferField(key=k, value=value_node(v)) for k, v in counter_fields.items()],
                 )
+                field_str = ", ".join(f"{f.key}: {value_source(f.value)}" for f in counter.fields)
                 return (
-                    f'COUNTER "{stmt.offer_id}" id="{counter_id}" '
-                    f'TO "{from_id}" {{{field_str}}};'
-                )
+                    f"COUNTER {value_source(StringVal(stmt.offer_id))} "
+                    f"id={value_source(StringVal(counter_id))} "
+                    f"TO {value_source(StringVal(from_id))} {{{field_str}}};"
+                ), [counter]
             except (_json.JSONDecodeError, Exception):
-                return f'REJECT "{stmt.offer_id}" REASON "invalid counter-offer";'
+                return self._reject(stmt.offer_id, "invalid counter-offer")
         return None
 
     # ── Display ─────────────────────────────────────────
@@ -32,8 +32,9 @@ from dataclasses import dataclass, field
 from typing import Any
 
 from .agent import Agent
-from .lexer import Lexer, LexerError
-from .parser import Parser, ParseError
+from .lexer import LexerError
+from .parser import ParseError
+from .cache import PROGRAM_CACHE
 from .ast_nodes import (
     Program, IntentStmt, FactStmt, QueryStmt, OfferStmt, CounterStmt,
     AcceptStmt, RejectStmt, CommitStmt, ActStmt,
@@ -193,10 +194,7 @@ class SutraSandbox:
 
         # ── Parse ───────────────────────────────────────
         try:
-            lexer = Lexer(source)
-            tokens = lexer.tokenize()
-            parser = Parser(tokens)
-            program = parser.parse()
+            program = PROGRAM_CACHE.parse(source)
         except (LexerError, ParseError) as e:
             self._log("error", f"Parse error: {e}")
             return SandboxResult(
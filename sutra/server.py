@@ -12,6 +12,9 @@ v0.6: Security hardening:
   - Per-pair message ordering (sequence numbers)
   - Message TTL / expiry enforcement
 
+v0.7: ``threaded=True`` serves requests concurrently (ThreadingHTTPServer)
+and runs messages through an OptimisticExecutor (see sutra.optimistic).
+
 Protocol:
     POST /sutra
     Content-Type: application/json
@@ -27,11 +30,15 @@ Protocol:
         "reply_format": "sutra"        // "sutra" | "json" (default: "json")
     }
 
+    v0.7: Instead of "body", a request may carry "continue": <token> to
+    fetch the next page of a QUERY that hit its LIMIT.
+
     Response:
     {
         "status": "ok",
         "agent": "seller@store",
         "responses": ["[QUERY RESULT] ..."],
+        "continuations": ["<token>", ...],   // v0.7 — one per QUERY with more pages
         "state_snapshot": { ... }
     }
 
@@ -44,17 +51,25 @@ All built on Python stdlib (http.server). Zero dependencies.
 
 from __future__ import annotations
 
+import base64
+import binascii
+import dataclasses
 import json
 import logging
 import threading
-from http.server import HTTPServer, BaseHTTPRequestHandler
+from http.server import HTTPServer, ThreadingHTTPServer, BaseHTTPRequestHandler
 from typing import Callable
 
 from .agent import Agent
-from .lexer import Lexer, LexerError
-from .parser import Parser, ParseError
-from .interpreter import Interpreter
+from .lexer import LexerError
+from .ast_nodes import Program, QueryStmt
+from .parser import (
+    CompiledFormatError, ParseError, dump_program, error_position, load_program, parse_recovering,
+)
+from .cache import PROGRAM_CACHE
+from .interpreter import Interpreter, render_responses
 from .interpreter import RuntimeError as SutraRuntimeError
+from .optimistic import OptimisticExecutor
 from .registry import AgentRegistry
 from .keystore import KeyStore
 from .security import RateLimiter, InputValidator
@@ -63,6 +78,68 @@ logger = logging.getLogger("sutra.server")
 
 # Maximum request body size (1MB) to prevent DoS
 _MAX_REQUEST_BODY = 1_048_576
+# Continuation tokens are compressed: cap them so decompression stays small
+_MAX_CONTINUATION_TOKEN = 8192
+
+
+def _agent_summary(agent: Agent) -> dict:
+    """The agent part of GET /status."""
+    signed_commits = sum(1 for c in agent.commit_ledger if c.is_signed)
+    signed_offers = sum(1 for o in agent.offer_ledger.values() if o.is_signed)
+    return {
+        "agent_id": agent.agent_id,
+        "beliefs": len(agent.belief_base),
+        "goals": len(agent.goal_set),
+        "offers": len(agent.offer_ledger),
+        "offers_signed": signed_offers,
+        "commitments": len(agent.commit_ledger),
+        "commitments_signed": signed_commits,
+        "actions": len(agent.action_queue),
+        "log_entries": len(agent.message_log),
+        "log": agent.message_log.stats(),
+        "fact_upserts": agent.dedupe_stats["upserts"],
+        "fact_duplicates": agent.dedupe_stats["duplicates"],
+        "has_keypair": agent.keypair is not None,
+    }
+
+
+def _syntax_errors(body: str) -> list[dict]:
+    """Every lexer/parse error in ``body``, so one 422 reports them all."""
+    _, errors = parse_recovering(body)
+    out = []
+    for e in errors:
+        line, col = error_position(e)
+        out.append({
+            "phase": "lexer" if isinstance(e, LexerError) else "parser",
+            "line": line,
+            "col": col,
+            "message": str(e),
+        })
+    return out
+
+
+def continuation_token(stmt: QueryStmt, cursor: str) -> str:
+    """Token for the next page of ``stmt``: the QUERY with AFTER ``cursor``,
+    as a compiled program in URL-safe base64."""
+    page = dataclasses.replace(stmt, after=cursor)
+    data = dump_program(Program(headers=[], statements=[page]))
+    return base64.urlsafe_b64encode(data).decode("ascii").rstrip("=")
+
+
+def continuation_program(token: str) -> Program:
+    """Decode a continuation token; CompiledFormatError unless it holds one paged QUERY."""
+    if not isinstance(token, str) or len(token) > _MAX_CONTINUATION_TOKEN:
+        raise CompiledFormatError("Continuation token must be a string of at most "
+                                  f"{_MAX_CONTINUATION_TOKEN} characters")
+    try:
+        data = base64.urlsafe_b64decode(token + "=" * (-len(token) % 4))
+    except (ValueError, binascii.Error):
+        raise CompiledFormatError("Continuation token is not base64") from None
+    program = load_program(data)
+    stmts = program.statements
+    if len(stmts) != 1 or type(stmts[0]) is not QueryStmt or stmts[0].after is None:
+        raise CompiledFormatError("Continuation token does not hold a paged QUERY")
+    return program
 
 
 class SutraRequestHandler(BaseHTTPRequestHandler):
@@ -121,21 +198,17 @@ class SutraRequestHandler(BaseHTTPRequestHandler):
 
     def _handle_status(self):
         agent: Agent = self.server.sutra_agent
-        signed_commits = sum(1 for c in agent.commit_ledger if c.is_signed)
-        signed_offers = sum(1 for o in agent.offer_ledger.values() if o.is_signed)
-        summary = {
-            "agent_id": agent.agent_id,
-            "beliefs": len(agent.belief_base),
-            "goals": len(agent.goal_set),
-            "offers": len(agent.offer_ledger),
-            "offers_signed": signed_offers,
-            "commitments": len(agent.commit_ledger),
-            "commitments_signed": signed_commits,
-            "actions": len(agent.action_queue),
-            "log_entries": len(agent.message_log),
-            "has_keypair": agent.keypair is not None,
+        executor: OptimisticExecutor | None = self.server.sutra_executor
+        # Threaded: the ledgers are iterated, so read under the write latch
+        summary = _agent_summary(agent) if executor is None else executor.read(_agent_summary)
+        status = {
+            "status": "ok",
+            "agent": summary,
+            "program_cache": PROGRAM_CACHE.stats(),
         }
-        self._send_json(200, {"status": "ok", "agent": summary})
+        if executor is not None:
+            status["concurrency"] = executor.stats()
+        self._send_json(200, status)
 
     def _handle_pubkey(self):
         """Expose the agent's public key (safe to share)."""
@@ -209,6 +282,7 @@ class SutraRequestHandler(BaseHTTPRequestHandler):
 
         sender = data.get("from", "unknown")
         body = data.get("body", "")
+        token = data.get("continue")  # v0.7: next QUERY page
 
         # ── v0.7: Input validation ───────────────────────
         validator: InputValidator | None = getattr(self.server, "sutra_input_validator", None)
@@ -217,12 +291,12 @@ class SutraRequestHandler(BaseHTTPRequestHandler):
             if not valid:
                 self._send_json(400, {"error": f"Invalid sender: {reason}"})
                 return
-            valid, reason = validator.validate_body(body)
+            valid, reason = (True, "ok") if token else validator.validate_body(body)
             if not valid:
                 self._send_json(400, {"error": f"Invalid body: {reason}"})
                 return
 
-        if not body.strip():
+        if not token and not body.strip():
             self._send_json(400, {"error": "Empty SUTRA body"})
             return
 
@@ -266,17 +340,25 @@ class SutraRequestHandler(BaseHTTPRequestHandler):
         # Execute SUTRA against this agent
         agent: Agent = self.server.sutra_agent
         try:
-            lexer = Lexer(body)
-            tokens = lexer.tokenize()
-            parser = Parser(tokens)
-            program = parser.parse()
-            interp = Interpreter(agent)
-            responses = interp.execute(program)
+            program = continuation_program(token) if token else PROGRAM_CACHE.parse(body)
+            executor: OptimisticExecutor | None = self.server.sutra_executor
+            if executor is not None:
+                responses = executor.execute(program, lazy=True)
+            else:
+                interp = Interpreter(agent)
+                responses = interp.execute(program, lazy=True)
+        except CompiledFormatError as e:
+            self._send_json(400, {"error": f"Invalid continuation token: {e}"})
+            return
         except LexerError as e:
-            self._send_json(422, {"error": f"Lexer error: {e}", "phase": "lexer"})
+            self._send_json(422, {
+                "error": f"Lexer error: {e}", "phase": "lexer", "errors": _syntax_errors(body),
+            })
             return
         except ParseError as e:
-            self._send_json(422, {"error": f"Parse error: {e}", "phase": "parser"})
+            self._send_json(422, {
+                "error": f"Parse error: {e}", "phase": "parser", "errors": _syntax_errors(body),
+            })
             return
         except SutraRuntimeError as e:
             self._send_json(422, {"error": f"Runtime error: {e}", "phase": "runtime"})
@@ -284,17 +366,23 @@ class SutraRequestHandler(BaseHTTPRequestHandler):
 
         logger.info(f"Processed message from {sender}: {len(responses)} responses")
 
+        lines = render_responses(responses)
+
         # Call message hook if registered
         hook: Callable | None = self.server.sutra_on_message
         if hook:
-            hook(sender, body, responses)
+            hook(sender, body, lines)
 
-        self._send_json(200, {
+        reply = {
             "status": "ok",
             "agent": agent.agent_id,
             "from_sender": sender,
-            "responses": responses,
-        })
+            "responses": lines,
+        }
+        more = [r.data for r in responses if r.kind == "QUERY MORE"]
+        if more:
+            reply["continuations"] = [continuation_token(stmt, cursor) for stmt, cursor in more]
+        self._send_json(200, reply)
 
 
 class SutraServer:
@@ -326,6 +414,7 @@ class SutraServer:
         seq_tracker=None,
         rate_limiter=None,
         input_validator=None,
+        threaded: bool = False,
     ):
         self.agent = agent
         self.host = host
@@ -340,6 +429,9 @@ class SutraServer:
         # v0.7 security
         self.rate_limiter = rate_limiter
         self.input_validator = input_validator or InputValidator()
+        # v0.7: concurrent requests, optimistic transactions per message
+        self.threaded = threaded
+        self.executor = OptimisticExecutor(agent) if threaded else None
 
         # v0.3: Auto-assign keypair to agent if requested
         if auto_sign and agent.keypair is None:
@@ -352,7 +444,8 @@ class SutraServer:
         self._thread: threading.Thread | None = None
 
     def _create_server(self) -> HTTPServer:
-        httpd = HTTPServer((self.host, self.port), SutraRequestHandler)
+        server_class = ThreadingHTTPServer if self.threaded else HTTPServer
+        httpd = server_class((self.host, self.port), SutraRequestHandler)
         # Attach SUTRA state to the server instance
         httpd.sutra_agent = self.agent
         httpd.sutra_registry = self.registry
@@ -364,6 +457,7 @@ class SutraServer:
         # v0.7 security
         httpd.sutra_rate_limiter = self.rate_limiter
         httpd.sutra_input_validator = self.input_validator
+        httpd.sutra_executor = self.executor
         return httpd
 
     def start(self, blocking: bool = False):
@@ -24,6 +24,12 @@ class TokenType(Enum):
     EXPIRES = auto()
     IF = auto()
     WITH = auto()
+    # v0.7: QUERY paging clauses
+    ORDER = auto()
+    ASC = auto()
+    DESC = auto()
+    LIMIT = auto()
+    AFTER = auto()
 
     # Literals
     STRING = auto()
@@ -35,6 +41,12 @@ class TokenType(Enum):
     # Identifiers
     IDENTIFIER = auto()
 
+    # Template placeholder: ? or ?name (only accepted by Template)
+    PLACEHOLDER = auto()
+
+    # Unlexable character, emitted only when collecting errors
+    ERROR = auto()
+
     # Punctuation
     LPAREN = auto()      # (
     RPAREN = auto()      # )
@@ -46,6 +58,12 @@ class TokenType(Enum):
     COLON = auto()       # :
     SEMICOLON = auto()   # ;
     EQUALS = auto()      # =
+    # v0.7: Comparison operators (QUERY arguments only)
+    LT = auto()          # <
+    LE = auto()          # <=
+    GT = auto()          # >
+    GE = auto()          # >=
+    NE = auto()          # !=
 
     # Header
     HASH = auto()        # #
@@ -72,6 +90,11 @@ KEYWORDS = {
     "EXPIRES": TokenType.EXPIRES,
     "IF": TokenType.IF,
     "WITH": TokenType.WITH,
+    "ORDER": TokenType.ORDER,
+    "ASC": TokenType.ASC,
+    "DESC": TokenType.DESC,
+    "LIMIT": TokenType.LIMIT,
+    "AFTER": TokenType.AFTER,
     "id": TokenType.ID,
     "true": TokenType.TRUE,
     "false": TokenType.FALSE,
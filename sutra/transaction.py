@@ -5,7 +5,10 @@ statement fails or a violation occurs, ALL state changes are
 rolled back to the pre-transaction snapshot.
 
 Features:
-  - Snapshot/restore of entire agent state
+  - O(1) copy-on-write snapshot/restore of agent state (v0.7)
+  - Undo-journal strategy: rollback cost follows the changes (v0.7)
+  - Two-phase commit across several agents (v0.7)
+  - Group commit: many messages per transaction and flush (v0.7)
   - Automatic rollback on error
   - Nested transaction support (savepoints)
   - Commit/rollback hooks for external systems
@@ -24,13 +27,13 @@ Usage:
 
 from __future__ import annotations
 
-import copy
 import time
 import threading
 from dataclasses import dataclass, field
+from itertools import islice
 from typing import Any, Callable
 
-from .agent import Agent, Fact, Intent, Offer, Commitment, Action, LogEntry
+from .agent import Agent
 
 
 # ════════════════════════════════════════════════════════
@@ -39,38 +42,99 @@ from .agent import Agent, Fact, Intent, Offer, Commitment, Action, LogEntry
 
 @dataclass
 class AgentSnapshot:
-    """A frozen copy of agent state at a point in time."""
+    """Agent state at a point in time.
+
+    v0.7: a snapshot no longer deep-copies the agent. It holds version
+    pointers from Agent.share_state(): the agent's own containers with
+    their lengths, which the agent only appends to while they are shared
+    (see Agent.share_state). Taking one is O(1) whatever the state size.
+    """
     agent_id: str
-    belief_base: list[Fact]
-    goal_set: list[Intent]
-    offer_ledger: dict[str, Offer]
-    commit_ledger: list[Commitment]
-    action_queue: list[Action]
-    message_log: list[LogEntry]
+    version: tuple[tuple[Any, int], ...]
+    # v0.7: message_log position — the log is truncated back, not copied
+    log_position: int
+    # v0.7: undo journal position, if an "undo" transaction is open around this one
+    journal_position: int | None = None
     timestamp: float = field(default_factory=time.time)
 
+    def _contents(self, i: int):
+        container, length = self.version[i]
+        if isinstance(container, dict):
+            return dict(islice(container.items(), length))
+        return container[:length]
+
+    # Read-only views of the snapshotted containers
+    belief_base = property(lambda self: self._contents(0))
+    goal_set = property(lambda self: self._contents(1))
+    offer_ledger = property(lambda self: self._contents(2))
+    commit_ledger = property(lambda self: self._contents(3))
+    action_queue = property(lambda self: self._contents(4))
+
 
 def snapshot_agent(agent: Agent) -> AgentSnapshot:
-    """Take a deep copy snapshot of agent state."""
+    """Take an O(1) copy-on-write snapshot of agent state.
+
+    The agent keeps the snapshot's version intact until
+    ``agent.release_state()``, and keeps the log entries logged since in
+    memory until ``agent.message_log.release(snap.log_position)``.
+    SutraTransaction calls both when a snapshot is committed or rolled back.
+    """
+    agent.expire_facts()  # don't keep facts past their TTL
     return AgentSnapshot(
         agent_id=agent.agent_id,
-        belief_base=copy.deepcopy(agent.belief_base),
-        goal_set=copy.deepcopy(agent.goal_set),
-        offer_ledger=copy.deepcopy(agent.offer_ledger),
-        commit_ledger=copy.deepcopy(agent.commit_ledger),
-        action_queue=copy.deepcopy(agent.action_queue),
-        message_log=copy.deepcopy(agent.message_log),
+        version=agent.share_state(),
+        log_position=agent.message_log.mark(),
+        journal_position=agent.journal_position,
     )
 
 
 def restore_agent(agent: Agent, snap: AgentSnapshot):
     """Restore agent state from a snapshot."""
-    agent.belief_base = snap.belief_base
-    agent.goal_set = snap.goal_set
-    agent.offer_ledger = snap.offer_ledger
-    agent.commit_ledger = snap.commit_ledger
-    agent.action_queue = snap.action_queue
-    agent.message_log = snap.message_log
+    agent.restore_state(snap.version)  # re-points and repairs the lookup indexes
+    agent.message_log.truncate(snap.log_position)
+    if snap.journal_position is not None:
+        # Already undone: an enclosing "undo" transaction must not replay them
+        agent.forget_journal(snap.journal_position)
+
+
+# ════════════════════════════════════════════════════════
+#  UNDO JOURNAL (v0.7)
+# ════════════════════════════════════════════════════════
+
+@dataclass
+class JournalMark:
+    """A savepoint of the "undo" strategy: positions in the agent's undo
+    journal (see Agent.begin_journal) and in its message_log."""
+    agent_id: str
+    position: int
+    log_position: int
+    timestamp: float = field(default_factory=time.time)
+
+
+def journal_agent(agent: Agent) -> JournalMark:
+    """Start journaling the agent's changes; returns the savepoint.
+    ``agent.end_journal()`` and ``agent.message_log.release(mark.log_position)``
+    release it."""
+    agent.expire_facts()  # as snapshot_agent: expire before the savepoint
+    return JournalMark(
+        agent_id=agent.agent_id,
+        position=agent.begin_journal(),
+        log_position=agent.message_log.mark(),
+    )
+
+
+def undo_agent(agent: Agent, mark: JournalMark):
+    """Roll the agent back to a journal savepoint (same end state as
+    restore_agent, lookup indexes included)."""
+    agent.undo_journal(mark.position)
+    agent.message_log.truncate(mark.log_position)
+
+
+# Transaction strategies: (take savepoint, roll back to it, release it)
+STRATEGIES: dict[str, tuple[Callable, Callable, Callable]] = {
+    "snapshot": (snapshot_agent, restore_agent, Agent.release_state),
+    "undo": (journal_agent, undo_agent, Agent.end_journal),
+}
 
 
 # ════════════════════════════════════════════════════════
@@ -101,14 +165,26 @@ class SutraTransaction:
         with SutraTransaction(agent) as tx:
             # ... execute statements ...
             # auto-commits on success, auto-rolls back on exception
+
+    v0.7: ``strategy`` picks how savepoints work. "snapshot" (default)
+    keeps copy-on-write version pointers. "undo" records inverse
+    operations in a journal and replays them backwards on rollback, so a
+    rollback costs what the transaction changed. Savepoints are journal
+    positions.
     """
 
-    def __init__(self, agent: Agent, timeout_s: float = 30.0):
+    def __init__(self, agent: Agent, timeout_s: float = 30.0, strategy: str = "snapshot"):
+        if strategy not in STRATEGIES:
+            raise ValueError(f"Unknown transaction strategy {strategy!r} "
+                             f"(expected one of: {', '.join(STRATEGIES)})")
         self.agent = agent
         self.timeout_s = timeout_s
-        self._snapshots: list[AgentSnapshot] = []
+        self.strategy = strategy
+        self._save, self._restore, self._release = STRATEGIES[strategy]
+        self._snapshots: list[AgentSnapshot | JournalMark] = []
         self._active = False
         self._start_time: float = 0
+        self._prepared = False
         self._on_commit: list[Callable] = []
         self._on_rollback: list[Callable] = []
 
@@ -126,13 +202,29 @@ class SutraTransaction:
         if self._active and not self._snapshots:
             raise TransactionError("Transaction already active with no snapshot")
 
-        snap = snapshot_agent(self.agent)
+        snap = self._save(self.agent)
         self._snapshots.append(snap)
 
         if not self._active:
             self._active = True
             self._start_time = time.monotonic()
 
+    def prepare(self):
+        """Phase one of a two-phase commit (v0.7).
+
+        Raises TransactionError if commit() would fail, leaving the
+        transaction open so the coordinator can roll it back. Once
+        prepared, commit() no longer checks the timeout and cannot fail.
+        """
+        if not self._active:
+            raise TransactionError("No active transaction to prepare")
+        elapsed = time.monotonic() - self._start_time
+        if elapsed > self.timeout_s:
+            raise TransactionError(
+                f"Transaction timed out: {elapsed:.1f}s > {self.timeout_s}s"
+            )
+        self._prepared = True
+
     def commit(self):
         """Commit the current transaction (or release savepoint)."""
         if not self._active:
@@ -140,16 +232,19 @@ class SutraTransaction:
 
         # Check timeout
         elapsed = time.monotonic() - self._start_time
-        if elapsed > self.timeout_s:
+        if elapsed > self.timeout_s and not self._prepared:
             self.rollback()
             raise TransactionError(
                 f"Transaction timed out: {elapsed:.1f}s > {self.timeout_s}s"
             )
 
-        self._snapshots.pop()  # discard snapshot (changes are kept)
+        snap = self._snapshots.pop()  # discard snapshot (changes are kept)
+        self._release(self.agent)
+        self.agent.message_log.release(snap.log_position)
 
         if not self._snapshots:
             self._active = False
+            self._prepared = False
             for hook in self._on_commit:
                 hook(self.agent)
 
@@ -159,10 +254,13 @@ class SutraTransaction:
             raise TransactionError("No active transaction to rollback")
 
         snap = self._snapshots.pop()
-        restore_agent(self.agent, snap)
+        self._restore(self.agent, snap)
+        self._release(self.agent)
+        self.agent.message_log.release(snap.log_position)
 
         if not self._snapshots:
             self._active = False
+            self._prepared = False
             for hook in self._on_rollback:
                 hook(self.agent)
 
@@ -171,9 +269,13 @@ class SutraTransaction:
         if not self._snapshots:
             return
         first = self._snapshots[0]
+        self._restore(self.agent, first)
+        for snap in self._snapshots:
+            self._release(self.agent)
+            self.agent.message_log.release(snap.log_position)
         self._snapshots.clear()
-        restore_agent(self.agent, first)
         self._active = False
+        self._prepared = False
         for hook in self._on_rollback:
             hook(self.agent)
 
@@ -199,37 +301,311 @@ class SutraTransaction:
         return False  # don't suppress exceptions
 
 
+# ════════════════════════════════════════════════════════
+#  MULTI-AGENT TRANSACTION (v0.7) — two-phase commit
+# ════════════════════════════════════════════════════════
+
+class MultiAgentTransaction:
+    """One transaction spanning several agents.
+
+    Each participant gets its own SutraTransaction savepoint. commit()
+    runs a two-phase protocol: every participant is prepared first, and
+    only if all of them vote yes are the savepoints committed. A failed
+    prepare, or an exception inside the ``with`` block, rolls every
+    participant back, so no agent keeps half of a multi-agent change.
+
+    ``locks`` maps an agent id to a re-entrant lock. The participants'
+    locks are taken in agent-id order on begin() and released when the
+    transaction ends: transactions on disjoint agents run in parallel,
+    and the fixed order keeps overlapping ones from deadlocking.
+
+    Usage:
+        with MultiAgentTransaction([buyer, seller]) as mtx:
+            Interpreter(seller).execute(program)
+            Interpreter(buyer).execute(reply)
+    """
+
+    def __init__(self, agents: list[Agent],
+                 locks: Callable[[str], threading.RLock] | None = None,
+                 timeout_s: float = 30.0, strategy: str = "snapshot"):
+        self.participants: dict[str, SutraTransaction] = {}
+        for agent in agents:
+            if agent.agent_id not in self.participants:
+                self.participants[agent.agent_id] = SutraTransaction(
+                    agent, timeout_s=timeout_s, strategy=strategy)
+        self._locks = [locks(aid) for aid in sorted(self.participants)] if locks else []
+        self._held = 0
+        self.state = "idle"  # idle → active → prepared → committed | rolled_back
+
+    @property
+    def is_active(self) -> bool:
+        return self.state in ("active", "prepared")
+
+    def begin(self):
+        """Lock the participants and open a savepoint on each."""
+        if self.is_active:
+            raise TransactionError("Multi-agent transaction already active")
+        for lock in self._locks:
+            lock.acquire()
+            self._held += 1
+        try:
+            for tx in self.participants.values():
+                tx.begin()
+        except Exception:
+            self._abort()
+            raise
+        self.state = "active"
+
+    def prepare(self):
+        """Phase one: ask every participant whether it can commit.
+        Any "no" rolls the whole transaction back and raises."""
+        if self.state != "active":
+            raise TransactionError(f"Cannot prepare a {self.state} transaction")
+        for agent_id, tx in self.participants.items():
+            try:
+                tx.prepare()
+            except TransactionError as e:
+                self._abort()
+                raise TransactionError(f"Prepare failed on '{agent_id}': {e}") from e
+        self.state = "prepared"
+
+    def commit(self):
+        """Phase two: commit every participant (prepares first if needed)."""
+        if self.state == "active":
+            self.prepare()
+        if self.state != "prepared":
+            raise TransactionError(f"Cannot commit a {self.state} transaction")
+        try:
+            for tx in self.participants.values():
+                tx.commit()  # prepared: cannot fail
+        finally:
+            self._unlock()
+        self.state = "committed"
+
+    def rollback(self):
+        """Roll every participant back to its savepoint."""
+        if not self.is_active:
+            raise TransactionError("No active multi-agent transaction to rollback")
+        self._abort()
+
+    def _abort(self):
+        try:
+            for tx in self.participants.values():
+                if tx.is_active:
+                    tx.rollback()
+        finally:
+            self._unlock()
+        self.state = "rolled_back"
+
+    def _unlock(self):
+        while self._held:
+            self._held -= 1
+            self._locks[self._held].release()
+
+    # ── Context manager ─────────────────────────────────
+
+    def __enter__(self):
+        self.begin()
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        if exc_type is not None:
+            if self.is_active:
+                self.rollback()
+        else:
+            self.commit()
+        return False
+
+
 # ════════════════════════════════════════════════════════
 #  SAFE EXECUTE — All-or-nothing execution
 # ════════════════════════════════════════════════════════
 
-def safe_execute(agent: Agent, source: str, timeout_s: float = 30.0) -> tuple[list[str], bool]:
+def safe_execute(agent: Agent, source: str, timeout_s: float = 30.0,
+                 responses: bool = True, strategy: str = "snapshot") -> tuple[list[str], bool]:
     """Execute SUTRA source with transaction safety.
 
     If ANY statement fails, ALL changes are rolled back.
-    Returns (responses, success).
+    Returns (responses, success). Batch jobs that ignore the output can
+    pass ``responses=False`` to skip recording it. ``strategy`` is the
+    SutraTransaction strategy.
+
+    Under load, GroupCommit.execute() does the same for many messages in
+    one transaction and durability flush.
 
     Usage:
         responses, ok = safe_execute(agent, 'FACT a(x=1); COMMIT bad();')
         if not ok:
             print("Execution failed, state unchanged")
     """
-    from .lexer import Lexer
-    from .parser import Parser
+    from .cache import PROGRAM_CACHE
     from .interpreter import Interpreter
 
-    tx = SutraTransaction(agent, timeout_s=timeout_s)
+    tx = SutraTransaction(agent, timeout_s=timeout_s, strategy=strategy)
     tx.begin()
 
     try:
-        lexer = Lexer(source)
-        tokens = lexer.tokenize()
-        parser = Parser(tokens)
-        program = parser.parse()
-        interp = Interpreter(agent)
-        responses = interp.execute(program)
+        program = PROGRAM_CACHE.parse(source)
+        interp = Interpreter(agent, responses=responses)
+        output = interp.execute(program)
         tx.commit()
-        return responses, True
+        return output, True
     except Exception as e:
         tx.rollback()
         return [f"[TX ROLLBACK] {e}"], False
+
+
+# ════════════════════════════════════════════════════════
+#  GROUP COMMIT (v0.7) — many messages, one transaction
+# ════════════════════════════════════════════════════════
+
+class _Pending:
+    """A message waiting in a GroupCommit batch."""
+
+    __slots__ = ("work", "responses", "output", "error", "done")
+
+    def __init__(self, work, responses: bool):
+        self.work = work
+        self.responses = responses
+        self.output: list = []
+        self.error: Exception | None = None
+        self.done = False
+
+
+class GroupCommit:
+    """Batches independent messages for one agent into a shared transaction.
+
+    safe_execute() pays a begin/commit per message, plus a durability
+    flush if one is hooked to commit. Here, messages submitted from any
+    number of threads gather for up to ``max_delay_s``, or until
+    ``max_batch`` are waiting. They then run in one SutraTransaction, each
+    in its own savepoint. A failing message is rolled back alone and gets
+    its own error. The batch is then prepared, flushed and committed:
+    ``on_flush(agent)`` (e.g. StateStore.save) runs once per batch, after
+    prepare() and before commit(), which can then no longer fail. If
+    prepare() fails (the batch ran past ``timeout_s``) or the flush fails,
+    the whole batch is rolled back and every message in it fails; nothing
+    that was flushed is rolled back.
+
+    The first caller to find no batch running collects and runs the next
+    one; the others wait for their results. ``lock``, if given, is held
+    while a batch runs.
+
+    Usage:
+        group = GroupCommit(agent, max_batch=64, max_delay_s=0.002,
+                            on_flush=StateStore().save)
+        responses, ok = group.execute('FACT a(x=1);')   # any thread
+    """
+
+    def __init__(self, agent: Agent, max_batch: int = 64, max_delay_s: float = 0.002,
+                 on_flush: Callable[[Agent], Any] | None = None, timeout_s: float = 30.0,
+                 strategy: str = "undo", lock: threading.RLock | None = None):
+        if max_batch < 1:
+            raise ValueError(f"max_batch must be positive, got {max_batch!r}")
+        self.agent = agent
+        self.max_batch = max_batch
+        self.max_delay_s = max_delay_s
+        self.on_flush = on_flush
+        self.timeout_s = timeout_s
+        self.strategy = strategy
+        self._lock = lock
+        self._cond = threading.Condition()
+        self._pending: list[_Pending] = []
+        self._running = False
+        self._stats = {"batches": 0, "messages": 0, "rolled_back": 0, "failed_batches": 0, "largest_batch": 0}
+
+    def stats(self) -> dict[str, int]:
+        with self._cond:
+            return dict(self._stats)
+
+    def execute(self, source, responses: bool = True) -> tuple[list[str], bool]:
+        """safe_execute() through the batch: returns (responses, success)."""
+        try:
+            return self.submit(source, responses), True
+        except Exception as e:
+            return [f"[TX ROLLBACK] {e}"], False
+
+    def submit(self, work, responses: bool = True) -> list[str]:
+        """Run SUTRA source or a Program in the next batch. Returns its
+        response lines, or raises the error that rolled it back."""
+        item = _Pending(work, responses)
+        cond = self._cond
+        with cond:
+            self._pending.append(item)
+            cond.notify_all()
+            while not item.done:
+                if self._running:
+                    cond.wait()
+                    continue
+                self._running = True
+                batch = self._collect()
+                cond.release()
+                try:
+                    self._run(batch)
+                finally:
+                    cond.acquire()
+                    self._running = False
+                    cond.notify_all()
+        if item.error is not None:
+            raise item.error
+        return item.output
+
+    def _collect(self) -> list[_Pending]:
+        # Called holding _cond: wait for the batch to fill or the delay to pass
+        deadline = time.monotonic() + self.max_delay_s
+        while len(self._pending) < self.max_batch:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                break
+            self._cond.wait(remaining)
+        batch = self._pending[:self.max_batch]
+        del self._pending[:self.max_batch]
+        return batch
+
+    def _run(self, batch: list[_Pending]):
+        from .cache import PROGRAM_CACHE
+        from .interpreter import Interpreter
+
+        agent = self.agent
+        rolled_back = 0
+        if self._lock is not None:
+            self._lock.acquire()
+        try:
+            tx = SutraTransaction(agent, timeout_s=self.timeout_s, strategy=self.strategy)
+            tx.begin()
+            try:
+                for item in batch:
+                    tx.begin()  # savepoint: a failure undoes this message only
+                    try:
+                        program = PROGRAM_CACHE.parse(item.work) if isinstance(item.work, str) else item.work
+                        item.output = Interpreter(agent, responses=item.responses).execute(program)
+                        tx.commit()
+                    except Exception as e:
+                        if tx.depth > 1:  # a timed-out commit has rolled back already
+                            tx.rollback()
+                        item.error = e
+                        rolled_back += 1
+                tx.prepare()  # a timeout fails here, before anything is flushed
+                if self.on_flush is not None:
+                    self.on_flush(agent)
+                tx.commit()
+            except Exception as e:
+                tx.rollback_all()
+                for item in batch:
+                    if item.error is None:
+                        item.output = []
+                        item.error = TransactionError(f"Group commit failed: {e}")
+                        rolled_back += 1
+                with self._cond:
+                    self._stats["failed_batches"] += 1
+        finally:
+            if self._lock is not None:
+                self._lock.release()
+            for item in batch:
+                item.done = True
+            with self._cond:
+                stats = self._stats
+                stats["batches"] += 1
+                stats["messages"] += len(batch)
+                stats["rolled_back"] += rolled_back
+                stats["largest_batch"] = max(stats["largest_batch"], len(batch))
@@ -0,0 +1,181 @@
+"""SUTRA v0.7 — Bytecode Compiler & VM
+
+The tree-walking Interpreter re-derives everything per statement: it
+dispatches on the node type, resolves value nodes, then formats the
+response line and the log text from the resulting args. Every SUTRA value
+is a literal, so all of that is known as soon as the Program is parsed.
+
+compile_bytecode() lowers a Program into a flat list of fixed-width
+instructions with args pre-resolved and response/log text precomputed.
+VM.execute() runs them in one loop against pre-bound agent operations.
+Each instruction carries a factory for its args: a plain dict copy, or
+for args holding lists or maps a copy that rebuilds those too, so no two
+runs share a mutable value. Statements with nothing to precompute
+(QUERY, ACCEPT, REJECT, COUNTER), and anything that needs signing, run
+through the Interpreter's own handlers.
+
+The Interpreter remains the reference implementation: for any Program the
+VM leaves the agent in the same state and returns the same responses.
+
+Usage:
+    code = compile_bytecode(program)     # once
+    responses = VM(agent).execute(code)  # many times, on any agent
+"""
+
+from __future__ import annotations
+
+from .agent import Agent
+from .ast_nodes import (
+    Program, IntentStmt, FactStmt, OfferStmt, CommitStmt, ActStmt, Predicate,
+)
+from .interpreter import (
+    Interpreter, _MAX_PREDICATE_LEN, _MAX_PREDICATE_ARGS, _fmt_args, _parse_expires,
+)
+
+
+# Instructions are 5-tuples: (opcode, a, b, c, d); args and fields are
+# _copier()s of the pooled values, called for a fresh dict per run
+OP_FACT = 0      # name, args, log detail, response
+OP_INTENT = 1    # name, args, log detail, response
+OP_ACT = 2       # name, args, log detail, response
+OP_COMMIT = 3    # stmt, args, log detail, response — signed via handler
+OP_OFFER = 4     # stmt, fields, log detail, response — signed via handler
+OP_STMT = 5      # handler, stmt, -, - — reference path
+
+_PRED_OPS = {FactStmt: (OP_FACT, "FACT"), IntentStmt: (OP_INTENT, "INTENT"), ActStmt: (OP_ACT, "ACT")}
+
+
+class Bytecode:
+    """A lowered Program: header metadata plus a flat instruction list."""
+
+    __slots__ = ("meta", "instructions")
+
+    def __init__(self, meta: dict[str, str], instructions: list[tuple]):
+        self.meta = meta
+        self.instructions = instructions
+
+    def __len__(self) -> int:
+        return len(self.instructions)
+
+
+def _copier(value):
+    """Compile a callable returning a new copy of the resolved literal
+    ``value``, lists and maps rebuilt at every depth; None for a scalar."""
+    t = type(value)
+    if t is dict:
+        nested = [(k, f) for k, f in ((k, _copier(v)) for k, v in value.items()) if f is not None]
+        if not nested:
+            return value.copy
+
+        def copy_map() -> dict:
+            copy = value.copy()
+            for k, f in nested:
+                copy[k] = f()
+            return copy
+        return copy_map
+    if t is list:
+        items = [(v, _copier(v)) for v in value]
+        if all(f is None for _, f in items):
+            return value.copy
+        return lambda: [v if f is None else f() for v, f in items]
+    return None
+
+
+def _lowerable(pred: Predicate) -> bool:
+    # Over-limit predicates go through the handler so they raise exactly
+    # where the tree-walker would
+    return len(pred.name) <= _MAX_PREDICATE_LEN and len(pred.args) <= _MAX_PREDICATE_ARGS
+
+
+def compile_bytecode(program: Program) -> Bytecode:
+    """Lower a Program into Bytecode."""
+    dispatch = Interpreter._DISPATCH
+    code: list[tuple] = []
+    emit = code.append
+
+    for stmt in program.statements:
+        t = type(stmt)
+        # Unknown types raise from _exec_statement when reached, as in execute()
+        handler = dispatch.get(t, Interpreter._exec_statement)
+
+        pred_op = _PRED_OPS.get(t)
+        if pred_op is not None and _lowerable(stmt.predicate):
+            op, keyword = pred_op
+            name = stmt.predicate.name
+            args = Interpreter._pred_args(stmt.predicate)
+            text = f"{name}({_fmt_args(args)})"
+            emit((op, name, _copier(args), f"{keyword} {text}", f"[{keyword}] {text}"))
+        elif t is CommitStmt and _lowerable(stmt.predicate):
+            args = Interpreter._pred_args(stmt.predicate)
+            text = f"{stmt.predicate.name}({_fmt_args(args)})"
+            dl = f" BY {stmt.deadline}" if stmt.deadline else ""
+            emit((OP_COMMIT, stmt, _copier(args), f"COMMIT {text}{dl}", f"[COMMIT] {text}{dl}"))
+        elif t is OfferStmt:
+            exp_info = f" expires={stmt.expires}" if stmt.expires else ""
+            # str(Offer) of a new offer, unless it shows time-dependent expiry
+            detail = None if stmt.expires else f"OFFER id={stmt.offer_id!r} [open] → {stmt.to_agent}"
+            emit((OP_OFFER, stmt, _copier(Interpreter._offer_fields(stmt)), detail,
+                  f"[OFFER] id={stmt.offer_id!r} → {stmt.to_agent}{exp_info}"))
+        else:
+            emit((OP_STMT, handler, stmt, None, None))
+
+    return Bytecode({h.key: h.value for h in program.headers}, code)
+
+
+def _discard(_line: str):
+    pass
+
+
+class VM:
+    """Executes Bytecode against an Agent (see module docstring)."""
+
+    def __init__(self, agent: Agent, responses: bool = True):
+        self.agent = agent
+        self.record_responses = responses
+        self.responses: list = []
+
+    def execute(self, code: Bytecode | Program) -> list[str]:
+        """Run Bytecode (a Program is compiled first). Returns response lines."""
+        if not isinstance(code, Bytecode):
+            code = compile_bytecode(code)
+        agent = self.agent
+        interp = Interpreter(agent, responses=self.record_responses)
+        self.responses = interp.responses
+        # Precomputed lines are plain str; skipping them is a no-op append
+        respond = interp.responses.append if self.record_responses else _discard
+        meta = code.meta
+
+        add_fact = agent.add_fact
+        add_intent = agent.add_intent
+        add_action = agent.add_action
+
+        for op, a, b, c, d in code.instructions:
+            if op == OP_FACT:
+                add_fact(a, b(), c)
+                respond(d)
+            elif op == OP_INTENT:
+                add_intent(a, b(), c)
+                respond(d)
+            elif op == OP_ACT:
+                add_action(a, b(), c)
+                respond(d)
+            elif op == OP_STMT:
+                a(interp, b, meta)
+            elif agent.keypair is not None:
+                # Signing needs the runtime agent key: use the handler
+                Interpreter._DISPATCH[type(a)](interp, a, meta)
+            elif op == OP_COMMIT:
+                agent.add_commit(a.predicate.name, b(), a.deadline, None, c)
+                respond(d)
+            else:  # OP_OFFER
+                agent.add_offer(
+                    offer_id=a.offer_id,
+                    from_agent=meta.get("from", agent.agent_id),
+                    to_agent=a.to_agent,
+                    fields=b(),
+                    expires_at=_parse_expires(a.expires) if a.expires else None,
+                    detail=c,
+                )
+                respond(d)
+
+        return [str(r) for r in self.responses]
@@ -0,0 +1,96 @@
+"""Differential tests: every scanning path against Lexer.tokenize_reference."""
+
+import io
+import os
+import random
+import tempfile
+import unittest
+
+from sutra.lexer import Lexer, LexerError, map_source
+
+EXAMPLES = os.path.join(os.path.dirname(__file__), os.pardir, "examples")
+
+# Fragments weighted towards real token shapes, plus the characters that
+# send the master regex down its slow and error paths
+_FRAGMENTS = [
+    "FACT", "QUERY", "OFFER", "id", "TO", "FROM", "ORDER", "BY", "LIMIT", "true", "null",
+    "price", "_x1", "Ünï", "名前", "?", "?slot", "(", ")", "{", "}", "[", "]", ",", ":", ";",
+    "=", "#", "<", ">", "<=", ">=", "!=", "!", "-", "-5", "42", "3.", "3.14", "-0.5", "7x",
+    '"', '"ok"', '"a\\"b"', '"tab\\t"', '"multi\nline"', '"\\', "\\", "//", "// note\n",
+    " ", "  ", "\t", "\r", "\n", "\n\n", "é", "€", "@", "$", "/", ".", "1٣",
+]
+
+
+def _scan(lexer_factory, reference: bool = False):
+    lexer = lexer_factory()
+    try:
+        tokens = lexer.tokenize_reference() if reference else lexer.tokenize()
+    except LexerError as e:
+        return ("error", str(e), e.line, e.col)
+    return [(t.type, t.value, t.line, t.col) for t in tokens]
+
+
+class LexerDifferential(unittest.TestCase):
+
+    def assert_paths_agree(self, source: str):
+        expected = _scan(lambda: Lexer(source), reference=True)
+        paths = {
+            "string": lambda: Lexer(source),
+            "file": lambda: Lexer(io.StringIO(source)),
+            "file, 3-char chunks": lambda: Lexer(io.StringIO(source), chunk_size=3),
+        }
+        for name, factory in paths.items():
+            self.assertEqual(_scan(factory), expected, f"{name} path, source {source!r}")
+
+        # Buffers are read like a text-mode file: universal newlines
+        translated = source.replace("\r\n", "\n").replace("\r", "\n")
+        expected = _scan(lambda: Lexer(translated), reference=True)
+        paths = {
+            "bytes": lambda: Lexer(source.encode()),
+            "bytes, 5-byte chunks": lambda: Lexer(source.encode(), chunk_size=5),
+        }
+        for name, factory in paths.items():
+            self.assertEqual(_scan(factory), expected, f"{name} path, source {source!r}")
+
+    def test_examples(self):
+        for name in sorted(os.listdir(EXAMPLES)):
+            if name.endswith(".sutra"):
+                with open(os.path.join(EXAMPLES, name), encoding="utf-8") as f:
+                    self.assert_paths_agree(f.read())
+
+    def test_edge_cases(self):
+        for source in [
+            "", "\n", "FACT", "FACT a(x=1);", "-", "-x", "1.2.3", "a<=b>=c!=d", "!",
+            '"unterminated', '"ends in escape\\', "x // comment", "// only",
+            'FACT note(text="line one\nline two");\nFACT b();', "Ünïcode_name(ä=1)", "1٣",
+            "price=-", "?", "?name(", '"\\q"',
+        ]:
+            self.assert_paths_agree(source)
+
+    def test_random_sources(self):
+        rng = random.Random(1234)
+        for _ in range(2000):
+            self.assert_paths_agree("".join(rng.choice(_FRAGMENTS) for _ in range(rng.randint(1, 40))))
+
+
+class SourceNewlines(unittest.TestCase):
+
+    def test_crlf_file_matches_text_mode_string(self):
+        source = ('#sutra "v0.1"\r\nFACT note(text="two\r\nlines", n=1);\r\n'
+                  '// comment\r\nFACT old_mac(x=2);\rFACT tail(y="\r");\r\n')
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "crlf.sutra")
+            with open(path, "wb") as f:
+                f.write(source.encode())
+            with open(path, encoding="utf-8") as f:
+                text = f.read()
+            expected = _scan(lambda: Lexer(text))
+            self.assertNotIn("\r", "".join(str(t[1]) for t in expected))
+            # Every chunk size, so some "\r\n" pairs straddle two chunks
+            for chunk_size in (1, 2, 3, 7, Lexer.CHUNK_SIZE):
+                with map_source(path) as buf:
+                    self.assertEqual(_scan(lambda: Lexer(buf, chunk_size=chunk_size)), expected)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,69 @@
+"""Concurrent readers and writers through one OptimisticExecutor."""
+
+import threading
+import unittest
+
+from sutra.agent import Agent
+from sutra.cache import PROGRAM_CACHE
+from sutra.optimistic import OptimisticExecutor
+
+
+def _run_threads(target, count: int):
+    errors = []
+
+    def run(k):
+        try:
+            target(k)
+        except Exception as e:  # surfaced by the assertion below
+            errors.append(e)
+
+    threads = [threading.Thread(target=run, args=(k,)) for k in range(count)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    return errors
+
+
+class ConcurrentReaders(unittest.TestCase):
+
+    def test_range_queries_leave_index_intact(self):
+        query = PROGRAM_CACHE.parse('QUERY item(price<1000) FROM "a";')
+        for _ in range(50):
+            agent = Agent("a")
+            agent.index_range("item", "price")
+            for i in range(200):
+                agent.add_fact("item", {"n": i, "price": i * 10})  # pending in the index
+            executor = OptimisticExecutor(agent)
+
+            errors = _run_threads(lambda k: [executor.execute(query) for _ in range(5)], 8)
+
+            self.assertEqual(errors, [])
+            idx = agent._range_index["item"]["price"]
+            self.assertEqual(idx.keys, [i * 10 for i in range(200)])
+            self.assertEqual([f.args["n"] for f in idx.facts], list(range(200)))
+            self.assertEqual(len(agent.query_facts("item", {}, [("price", "<", 1000)])), 100)
+
+    def test_readers_with_writers(self):
+        agent = Agent("a")
+        agent.index_range("item", "price")
+        executor = OptimisticExecutor(agent)
+        query = PROGRAM_CACHE.parse('QUERY item(price<500) FROM "a";')
+
+        def work(k):
+            for i in range(50):
+                if k % 2:
+                    executor.execute(PROGRAM_CACHE.parse(f'FACT item(k={k}, price={i * 20});'))
+                else:
+                    executor.execute(query)
+
+        self.assertEqual(_run_threads(work, 8), [])
+        idx = agent._range_index["item"]["price"]
+        agent.settle_indexes("item")
+        self.assertEqual(len(idx.facts), 200)
+        self.assertEqual(idx.keys, sorted(idx.keys))
+        self.assertEqual(len(agent.query_facts("item", {}, [("price", "<", 500)])), 100)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,69 @@
+"""Paging a QUERY to the end through server continuation tokens."""
+
+import re
+import socket
+import unittest
+
+from sutra.agent import Agent
+from sutra.client import SutraClient
+from sutra.server import SutraServer
+
+_RESULT = re.compile(r"\[QUERY RESULT\] FACT item\(n=([0-9.]+), score=([0-9.]+)\)")
+
+
+def _free_port() -> int:
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+class ContinuationPaging(unittest.TestCase):
+
+    FACTS = 23
+    LIMIT = 5
+
+    def page_through(self, threaded: bool, order: str) -> list[tuple[float, float]]:
+        agent = Agent("shop")
+        for n in range(self.FACTS):
+            agent.add_fact("item", {"n": float(n), "score": float(n * 7 % 4)})  # tied scores
+        server = SutraServer(agent, port=_free_port(), threaded=threaded)
+        server.start()
+        try:
+            client = SutraClient()
+            reply = client.send(server.url, "buyer",
+                                f'QUERY item() FROM "shop" ORDER BY score {order} LIMIT {self.LIMIT};')
+            rows, pages = [], 0
+            while True:
+                pages += 1
+                page = [m.groups() for m in map(_RESULT.match, reply.responses) if m]
+                self.assertLessEqual(len(page), self.LIMIT)
+                rows += [(float(n), float(score)) for n, score in page]
+                if not reply.continuations:
+                    break
+                self.assertEqual(len(page), self.LIMIT)
+                self.assertEqual(len(reply.continuations), 1)
+                reply = client.next_page(server.url, "buyer", reply.continuations[0])
+        finally:
+            server.stop()
+        self.assertEqual(pages, -(-self.FACTS // self.LIMIT))
+        return rows
+
+    def assert_complete(self, rows: list[tuple[float, float]], descending: bool):
+        numbers = [n for n, _ in rows]
+        self.assertEqual(len(numbers), len(set(numbers)), "duplicate rows across pages")
+        self.assertEqual(sorted(numbers), [float(n) for n in range(self.FACTS)], "rows missing")
+        scores = [score for _, score in rows]
+        self.assertEqual(scores, sorted(scores, reverse=descending))
+
+    def test_ascending(self):
+        self.assert_complete(self.page_through(threaded=False, order="ASC"), descending=False)
+
+    def test_descending(self):
+        self.assert_complete(self.page_through(threaded=False, order="DESC"), descending=True)
+
+    def test_threaded_server(self):
+        self.assert_complete(self.page_through(threaded=True, order="ASC"), descending=False)
+
+
+if __name__ == "__main__":
+    unittest.main()
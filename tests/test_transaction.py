@@ -0,0 +1,128 @@
+"""Nested savepoint rollback under both transaction strategies."""
+
+import time
+import unittest
+
+from sutra.agent import Agent
+from sutra.transaction import SutraTransaction
+
+LATER = 3600.0  # seconds past every TTL used below
+
+
+def _state(agent: Agent) -> dict:
+    """What a rollback must give back: the facts, what the indexes answer, offers."""
+    def rows(facts):
+        return [(f.predicate, dict(f.args), f.seq, f.expires_at) for f in facts]
+
+    return {
+        "facts": rows(agent.belief_base),
+        "by_predicate": {p: rows(facts) for p, facts in agent._fact_index.items() if facts},
+        "by_sku": {sku: rows(agent.query_facts("stock", {"sku": sku}, read_only=True))
+                   for sku in "abcz"},
+        "low_stock": rows(agent.query_facts("stock", {}, [("qty", "<", 10)], read_only=True)),
+        "top_stock": rows(agent.query_facts("stock", {}, order_by="qty", descending=True,
+                                            limit=3, read_only=True)),
+        "keys": {p: {k: f.seq for k, f in keyed.items()} for p, keyed in agent._key_index.items()},
+        "offers": {oid: (o.status, o.conditions) for oid, o in agent.offer_ledger.items()},
+        "goals": len(agent.goal_set),
+        "commits": len(agent.commit_ledger),
+        "actions": len(agent.action_queue),
+    }
+
+
+class NestedRollback:
+
+    STRATEGY = ""
+
+    def setUp(self):
+        agent = Agent("shop")
+        agent.index_args("stock", "sku")
+        agent.index_range("stock", "qty")
+        agent.declare_key("stock", "sku")
+        agent.set_fact_dedupe()
+        agent.set_fact_ttl("quote", 60)
+        for sku, qty in (("a", 5), ("b", 12), ("c", 3)):
+            agent.add_fact("stock", {"sku": sku, "qty": qty})
+        agent.add_fact("tag", {"name": "sale"})
+        agent.add_fact("quote", {"sku": "a", "price": 9.5})
+        agent.add_fact("quote", {"sku": "b", "price": 4.0}, ttl=30)
+        for oid in ("o1", "o2", "o3"):
+            agent.add_offer(oid, "buyer", "shop", {"sku": "a"})
+        self.agent = agent
+
+    def test_nested_rollback_restores_each_savepoint(self):
+        agent = self.agent
+        tx = SutraTransaction(agent, strategy=self.STRATEGY)
+        base = _state(agent)
+
+        tx.begin()
+        agent.add_fact("stock", {"sku": "a", "qty": 40})  # upsert
+        self.assertEqual(agent.expire_facts(now=time.time() + LATER), 2)
+        agent.accept_offer("o1")
+        agent.add_intent("restock", {"sku": "c"})
+        middle = _state(agent)
+
+        tx.begin()
+        agent.add_fact("stock", {"sku": "b", "qty": 1})  # upsert
+        agent.add_fact("stock", {"sku": "z", "qty": 7})
+        agent.add_fact("stock", {"sku": "a", "qty": 2})  # upsert of an upsert
+        agent.add_fact("tag", {"name": "sale"})  # duplicate
+        agent.add_fact("tag", {"name": "new"})
+        agent.add_fact("quote", {"sku": "z", "price": 1.0})
+        agent.reject_offer("o2")
+        agent.add_offer("o4", "shop", "buyer", {"sku": "a"}, counter_to="o3")
+        agent.add_commit("ship", {"sku": "z"})
+        agent.add_action("notify", {"sku": "z"})
+        self.assertNotEqual(_state(agent), middle)
+
+        tx.rollback()
+        self.assertEqual(_state(agent), middle)
+        tx.rollback()
+        self.assertEqual(_state(agent), base)
+        self.assertFalse(tx.is_active)
+
+    def test_indexes_keep_working_after_rollback(self):
+        agent = self.agent
+        tx = SutraTransaction(agent, strategy=self.STRATEGY)
+        tx.begin()
+        agent.add_fact("stock", {"sku": "a", "qty": 40})
+        agent.expire_facts(now=time.time() + LATER)
+        tx.begin()
+        agent.add_fact("stock", {"sku": "a", "qty": 41})
+        agent.add_fact("tag", {"name": "extra"})
+        tx.rollback()
+        tx.rollback()
+
+        # Upsert keys and dedupe still find the restored facts
+        agent.add_fact("stock", {"sku": "c", "qty": 4})
+        agent.add_fact("tag", {"name": "sale"})
+        self.assertEqual([f.args["qty"] for f in agent.query_facts("stock", {"sku": "c"})], [4])
+        self.assertEqual(len(agent.query_facts("tag", {})), 1)
+        # The restored quotes are still scheduled to expire
+        self.assertEqual(agent.expire_facts(now=time.time() + LATER), 2)
+        self.assertEqual(agent.query_facts("quote", {}), [])
+
+    def test_rollback_all_restores_the_first_savepoint(self):
+        agent = self.agent
+        tx = SutraTransaction(agent, strategy=self.STRATEGY)
+        base = _state(agent)
+        tx.begin()
+        agent.add_fact("stock", {"sku": "b", "qty": 0})
+        agent.accept_offer("o2")
+        tx.begin()
+        agent.expire_facts(now=time.time() + LATER)
+        agent.add_offer("o5", "shop", "buyer", {"sku": "b"}, counter_to="o3")
+        tx.rollback_all()
+        self.assertEqual(_state(agent), base)
+
+
+class SnapshotStrategy(NestedRollback, unittest.TestCase):
+    STRATEGY = "snapshot"
+
+
+class UndoStrategy(NestedRollback, unittest.TestCase):
+    STRATEGY = "undo"
+
+
+if __name__ == "__main__":
+    unittest.main()